@@ -0,0 +1,320 @@
+"""
+Location Gazetteer - compiled, memory-mapped list of known place names
+Holds provinces, districts, wards, streets, venues, office rooms... (100k+ names)
+that cannot live in regex source. The file is a sorted string table opened with
+mmap (read-only), so loading takes milliseconds and every process using the same
+file shares one copy in the OS page cache.
+
+Build:
+    python -m core_nlp.gazetteer build provinces.tsv streets.txt -o models/locations.gaz
+    (one name per line, optionally "name<TAB>kind"; '#' lines are comments)
+Query:
+    python -m core_nlp.gazetteer lookup models/locations.gaz "họp ở phố Hàng Bài"
+    python -m core_nlp.gazetteer info models/locations.gaz
+
+File layout (little-endian):
+    header      magic, version, count, max_words, kinds_len, build_id
+    kinds       JSON list of kind names (padded to 4 bytes)
+    key_offs    (count + 1) x uint32  absolute offsets of the folded keys
+    name_offs   (count + 1) x uint32  absolute offsets of the display names
+    kind_codes  count x uint8 (padded to 4 bytes)
+    keys        UTF-8 folded keys, sorted bytewise
+    names       UTF-8 display names (same order)
+
+Keys are the words of a name, folded (lowercase, no diacritics, đ -> d) and
+joined by single spaces, so "ha noi" finds "Hà Nội" and "ba ria vung tau" finds
+"Bà Rịa - Vũng Tàu"; input typed with diacritics must also match them exactly.
+"""
+from __future__ import annotations
+import argparse
+import bisect
+import json
+import mmap
+import os
+import re
+import struct
+import sys
+import unicodedata
+import zlib
+from functools import lru_cache
+from typing import Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+MAGIC = b'PSAGAZ\x00\x01'
+FORMAT_VERSION = 1
+DEFAULT_GAZETTEER_PATH = os.path.join('.', 'models', 'locations.gaz')
+DEFAULT_KIND = 'place'
+
+_HEADER = struct.Struct('<8sIIIII')  # magic, version, count, max_words, kinds_len, build_id
+_U32_PAIR = struct.Struct('<II')
+_WORD_RE = re.compile(r'\w+(?:[.\-/]\w+)*')
+
+
+def fold(text: str) -> str:
+    """Lowercase and strip Vietnamese diacritics (đ -> d)."""
+    decomposed = unicodedata.normalize('NFD', text.lower()).replace('đ', 'd')
+    return ''.join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+def _words(text: str) -> List[str]:
+    return _WORD_RE.findall(unicodedata.normalize('NFC', text.lower()))
+
+
+def make_key(text: str) -> str:
+    """Lookup key of a name: its folded words joined by single spaces."""
+    return ' '.join(fold(w) for w in _words(text))
+
+
+def _exact(text: str) -> str:
+    """Words of a name with diacritics kept."""
+    return ' '.join(_words(text))
+
+
+def _pad4(n: int) -> int:
+    return (4 - n % 4) % 4
+
+
+class GazetteerMatch(NamedTuple):
+    start: int
+    end: int
+    name: str   # display name from the gazetteer
+    kind: str   # e.g. 'province', 'district', 'ward', 'street', 'room'
+
+
+class _KeyView(Sequence):
+    """Read-only sequence of the folded keys (bytes) for bisect."""
+
+    def __init__(self, gaz: 'Gazetteer'):
+        self._gaz = gaz
+
+    def __len__(self) -> int:
+        return self._gaz.count
+
+    def __getitem__(self, i):
+        return self._gaz._key(i)
+
+
+class Gazetteer:
+    """Memory-mapped gazetteer written by build_gazetteer()."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, count, max_words, kinds_len, build_id = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f"Not a gazetteer file: {path}")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported gazetteer version {version}: {path}")
+        self.count = count
+        self.max_words = max_words
+        self.build_id = build_id
+        pos = _HEADER.size
+        self.kinds: List[str] = json.loads(self._mm[pos:pos + kinds_len].decode('utf-8'))
+        pos += kinds_len + _pad4(kinds_len)
+        self._key_offs = pos
+        self._name_offs = pos + 4 * (count + 1)
+        self._kind_codes = self._name_offs + 4 * (count + 1)
+        self._keys = _KeyView(self)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def close(self) -> None:
+        self._mm.close()
+
+    def _key(self, i: int) -> bytes:
+        start, end = _U32_PAIR.unpack_from(self._mm, self._key_offs + 4 * i)
+        return self._mm[start:end]
+
+    def _entry(self, i: int) -> Tuple[str, str]:
+        start, end = _U32_PAIR.unpack_from(self._mm, self._name_offs + 4 * i)
+        return self._mm[start:end].decode('utf-8'), self.kinds[self._mm[self._kind_codes + i]]
+
+    def _entries(self, pos: int, key: bytes, exact: str) -> List[Tuple[str, str]]:
+        """Entries with key starting at index pos, filtered by diacritics if exact has any."""
+        entries = []
+        check = exact != key.decode('utf-8')
+        while pos < self.count and self._key(pos) == key:
+            name, kind = self._entry(pos)
+            if not check or _exact(name) == exact:
+                entries.append((name, kind))
+            pos += 1
+        return entries
+
+    def lookup(self, phrase: str) -> List[Tuple[str, str]]:
+        """
+        Exact lookup of a phrase.
+
+        Returns:
+            List of (display name, kind). A phrase typed with diacritics only
+            matches names with the same diacritics.
+        """
+        key = make_key(phrase).encode('utf-8')
+        if not key:
+            return []
+        return self._entries(bisect.bisect_left(self._keys, key), key, _exact(phrase))
+
+    def find(self, text: str, min_words: int = 1) -> List[GazetteerMatch]:
+        """
+        Longest-leftmost, non-overlapping gazetteer names in text.
+
+        Args:
+            text: Free text
+            min_words: Ignore names shorter than this many words
+
+        Returns:
+            GazetteerMatch list in text order (spans index into text)
+        """
+        spans = [(m.start(), m.end()) for m in _WORD_RE.finditer(text)]
+        exact_words = [unicodedata.normalize('NFC', text[a:b].lower()) for a, b in spans]
+        folded_words = [fold(w).encode('utf-8') for w in exact_words]
+        matches: List[GazetteerMatch] = []
+        i = 0
+        while i < len(spans):
+            best = None
+            key = b''
+            lo = 0
+            for j in range(i, min(len(spans), i + self.max_words)):
+                # Names never span punctuation other than a dash ("Bà Rịa - Vũng Tàu")
+                if j > i and text[spans[j - 1][1]:spans[j][0]].strip(' \t-'):
+                    break
+                key = key + b' ' + folded_words[j] if j > i else folded_words[j]
+                # Longer keys sort after their prefix, so each bisect starts where the last one ended
+                lo = bisect.bisect_left(self._keys, key, lo)
+                if lo >= self.count:
+                    break
+                k = self._key(lo)
+                if k != key:
+                    if k.startswith(key + b' '):
+                        continue
+                    break
+                if j - i + 1 >= min_words:
+                    found = self._entries(lo, key, ' '.join(exact_words[i:j + 1]))
+                    if found:
+                        best = GazetteerMatch(spans[i][0], spans[j][1], found[0][0], found[0][1])
+            if best is not None:
+                matches.append(best)
+                while i < len(spans) and spans[i][0] < best.end:
+                    i += 1
+            else:
+                i += 1
+        return matches
+
+
+@lru_cache(maxsize=None)
+def open_gazetteer(path: str = DEFAULT_GAZETTEER_PATH) -> Optional[Gazetteer]:
+    """Shared Gazetteer for path (one mmap per process), or None if the file does not exist."""
+    if not os.path.exists(path):
+        return None
+    try:
+        return Gazetteer(path)
+    except (OSError, ValueError) as e:
+        print(f"⚠️ Cannot load gazetteer {path}: {e}")
+        return None
+
+
+def build_gazetteer(entries: Iterable[Tuple[str, str]], out_path: str) -> int:
+    """
+    Write a gazetteer file.
+
+    Args:
+        entries: (display name, kind) pairs; duplicates are dropped
+        out_path: Output file (written to out_path + '.tmp' then renamed)
+
+    Returns:
+        Number of entries written
+    """
+    kinds: List[str] = []
+    kind_index = {}
+    records = set()
+    for name, kind in entries:
+        name = ' '.join(unicodedata.normalize('NFC', name).split())
+        key = make_key(name)
+        if not key:
+            continue
+        if kind not in kind_index:
+            if len(kinds) == 256:
+                raise ValueError("At most 256 kinds are supported")
+            kind_index[kind] = len(kinds)
+            kinds.append(kind)
+        records.add((key.encode('utf-8'), name.encode('utf-8'), kind_index[kind]))
+    rows = sorted(records)
+    count = len(rows)
+    max_words = max((key.count(b' ') + 1 for key, _, _ in rows), default=0)
+
+    kinds_blob = json.dumps(kinds, ensure_ascii=False).encode('utf-8')
+    keys_blob = b''.join(key for key, _, _ in rows)
+    names_blob = b''.join(name for _, name, _ in rows)
+    build_id = zlib.crc32(names_blob, zlib.crc32(keys_blob))
+
+    pos = _HEADER.size + len(kinds_blob) + _pad4(len(kinds_blob))
+    pos += 8 * (count + 1) + count + _pad4(count)
+    keys_start = pos
+    names_start = keys_start + len(keys_blob)
+    if names_start + len(names_blob) > 0xFFFFFFFF:
+        raise ValueError("Gazetteer larger than 4 GB")
+
+    tmp_path = out_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(_HEADER.pack(MAGIC, FORMAT_VERSION, count, max_words, len(kinds_blob), build_id))
+        f.write(kinds_blob + b'\0' * _pad4(len(kinds_blob)))
+        for start, blob_rows in ((keys_start, (k for k, _, _ in rows)), (names_start, (n for _, n, _ in rows))):
+            offsets = [start]
+            for item in blob_rows:
+                offsets.append(offsets[-1] + len(item))
+            f.write(struct.pack(f'<{count + 1}I', *offsets))
+        f.write(bytes(code for _, _, code in rows) + b'\0' * _pad4(count))
+        f.write(keys_blob)
+        f.write(names_blob)
+    os.replace(tmp_path, out_path)
+    return count
+
+
+def _read_entries(paths: Sequence[str], default_kind: str) -> Iterable[Tuple[str, str]]:
+    """Lines 'name' or 'name<TAB>kind' (UTF-8, '#' starts a comment line)."""
+    for path in paths:
+        with open(path, encoding='utf-8-sig') as f:
+            for line in f:
+                line = line.rstrip('\n')
+                if not line.strip() or line.lstrip().startswith('#'):
+                    continue
+                name, _, kind = line.partition('\t')
+                yield name.strip(), (kind.strip() or default_kind)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m core_nlp.gazetteer', description="Location gazetteer tools")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p_build = sub.add_parser('build', help="Compile name lists into a gazetteer file")
+    p_build.add_argument('inputs', nargs='+', help="Text/TSV files: name[<TAB>kind] per line")
+    p_build.add_argument('-o', '--output', default=DEFAULT_GAZETTEER_PATH)
+    p_build.add_argument('--kind', default=DEFAULT_KIND, help="Kind for lines without one")
+
+    p_lookup = sub.add_parser('lookup', help="Find gazetteer names in a text")
+    p_lookup.add_argument('gazetteer')
+    p_lookup.add_argument('text')
+    p_lookup.add_argument('--min-words', type=int, default=1)
+
+    p_info = sub.add_parser('info', help="Show gazetteer statistics")
+    p_info.add_argument('gazetteer')
+
+    args = parser.parse_args(argv)
+    if args.command == 'build':
+        out_dir = os.path.dirname(os.path.abspath(args.output))
+        os.makedirs(out_dir, exist_ok=True)
+        count = build_gazetteer(_read_entries(args.inputs, args.kind), args.output)
+        print(f"✅ Wrote {count} names to {args.output} ({os.path.getsize(args.output) // 1024} KB)")
+    elif args.command == 'lookup':
+        gaz = Gazetteer(args.gazetteer)
+        for m in gaz.find(args.text, min_words=args.min_words):
+            print(f"{args.text[m.start:m.end]!r} -> {m.name} ({m.kind}) [{m.start}:{m.end}]")
+    else:
+        gaz = Gazetteer(args.gazetteer)
+        print(f"📊 {gaz.count} names, up to {gaz.max_words} words, kinds: {', '.join(gaz.kinds)}, "
+              f"build {gaz.build_id:08x}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,344 @@
+"""
+Heuristic Patterns - compiled pattern bank for the PhoBERTEventExtractor heuristics
+The rule-based extractors of phobert_model (time, location, reminder, event name)
+used to build their pattern lists inside the method body and re.search them one
+string at a time on every call. The lists live here, compiled once per process
+(HeuristicPatterns.default()):
+
+    - word lists removed one re.sub at a time become one alternation, when the
+      removal order cannot change the result (see _word_alternation)
+    - priority lists ("first pattern that matches anywhere wins") and the
+      longest-match time list stay lists of compiled patterns: a combined
+      regex with one named group per pattern (or one lookahead per pattern)
+      measured slower than the separate searches, which keep the prefix scan
+      of each pattern
+
+Matching behaviour is unchanged (scripts/benchmark_phobert_heuristics.py checks
+it against the per-call regex lists).
+"""
+from __future__ import annotations
+import re
+from functools import lru_cache
+from typing import List, Sequence
+
+# Time patterns (comprehensive Vietnamese time expressions), longest match wins
+# Order matters: more specific patterns first
+# NOTE: These patterns match against NORMALIZED text (no diacritics: ô→o, ư→u, đ→d, etc.)
+TIME_HEURISTIC_PATTERNS = [
+    # PRIORITY 0: Time ranges (MUST be FIRST to capture full range)
+    # "từ 9h đến 11h sáng mai", "9h-11h", "9h đến 11h"
+    # Allow period (sang/chieu/toi) and relative (mai/hom nay/etc) AFTER range
+    # FIXED: Use (?:\d{2})? instead of \d{0,2} to avoid catastrophic backtracking
+    r'(?:tu\s+)?\d{1,2}\s*(?:h|gio|:)(?:\d{2})?\s*(?:den|-|–)\s*\d{1,2}\s*(?:h|gio|:)(?:\d{2})?\s*(?:sang|trua|chieu|toi|dem)?\s*(?:mai|hom\s+nay|ngay\s+mai|ngay\s+kia)?',
+
+    # PRIORITY 1: Number words + period + weekday (REVERSED ORDER)
+    # "muoi gio sang chu nhat" → Must come FIRST
+    r'(?:mot|hai|ba|bon|tu|nam|sau|bay|tam|chin|muoi|mươi)\s+gio\s*(?:sang|trua|chieu|toi|dem)?\s*(?:chu\s+nhat|cn)',
+    r'(?:mot|hai|ba|bon|tu|nam|sau|bay|tam|chin|muoi|mươi)\s+gio\s*(?:sang|trua|chieu|toi|dem)?\s*(?:thu[s]?|t)\s*(?:\d+|hai|ba|tu|nam|sau|bay)',
+
+    # PRIORITY 2: Weekday + number words + period
+    # "chu nhat sauh gio chieu"
+    r'(?:chu\s+nhat|cn)\s+(?:mot|hai|ba|bon|tu|nam|sau|bay|tam|chin|muoi)\s+gio\s*(?:sang|trua|chieu|toi|dem)',
+    r'(?:thu[s]?|t)\s*(?:\d+|hai|ba|tu|nam|sau|bay)\s+(?:mot|hai|ba|bon|tu|nam|sau|bay|tam|chin|muoi)\s+gio\s*(?:sang|trua|chieu|toi|dem)',
+
+    # PRIORITY 3: Weekday + period + hour (REVERSED ORDER)
+    # "thứ 5 chiều 3h"
+    r'(?:chu\s+nhat|cn)\s+(?:sang|trua|chieu|toi|dem)\s+\d{1,2}\s*(?:h|gio)',
+    r'(?:thu[s]?|t)\s*(?:\d+|hai|ba|tu|nam|sau|bay)\s+(?:sang|trua|chieu|toi|dem)\s+\d{1,2}\s*(?:h|gio)',
+
+    # PRIORITY 4: Weekday + time + period
+    # "t5 8h sang", "thứ 3 10h sáng", "cn 6h chiều"
+    r'(?:chu\s+nhat|cn)\s+\d{1,2}\s*(?:h|gio|:)\s*\d{0,2}\s*(?:sang|trua|chieu|toi|dem)',
+    r'(?:thu[s]?|t)\s*(?:\d+|hai|ba|tu|nam|sau|bay)\s+\d{1,2}\s*(?:h|gio|:)\s*\d{0,2}\s*(?:sang|trua|chieu|toi|dem)',
+    # Weekday + time (without period)
+    r'(?:chu\s+nhat|cn)\s+\d{1,2}\s*(?:h|gio|:)',
+    r'(?:thu[s]?|t)\s*(?:\d+|hai|ba|tu|nam|sau|bay)\s+\d{1,2}\s*(?:h|gio|:)',
+    # Date + time + period: hôm nay 6h chiều, mai 10h sáng, ngày kia 8h tối
+    # MUST come before simple "date + time" to capture period
+    r'(?:hom\s+nay|ngay\s+mai|mai|ngay\s+kia)\s+\d{1,2}\s*(?:h|gio)\s*(?:\d{1,2}\s*(?:phut))?\s*(?:sang|trua|chieu|toi|dem)',
+    # Period + date combo: tối mai, sáng mai, chiều mai, đêm nay, tối nay
+    # BUT NOT "toi" alone (which could be "tôi" = I/me)
+    r'(?:toi|sang|chieu|trua|dem)\s+(?:mai|hom\s+nay|nay|ngay\s+kia)',
+    # Time with typo period: 7h sang, 6h toi (without diacritics)
+    # Use word boundary to avoid matching "toi co" (tôi có = I have)
+    r'\d{1,2}\s*h\s+(?:sang|chieu|trua|dem)\b',
+    r'\d{1,2}\s*h\s+toi(?:\s+nay|\s+mai)?\b',  # "6h tối" or "6h tối nay" but not "6h tôi"
+    # Time + date format DD.MM.YYYY or DD/MM/YYYY or DD-MM-YYYY
+    # Handles: "9h ngày 20.10", "9h vào 20.10", "9h tới ngày 20.10"
+    r'\d{1,2}\s*(?:h|gio|:|)\s*\d{0,2}\s*(?:vao|toi|den)?\s*(?:ngay\s+)?\d{1,2}[\.\-/]\d{1,2}(?:[\.\-/]\d{4})?',
+    # "lúc" + time: lúc 12 giờ, lúc 10h sáng
+    r'luc\s+\d{1,2}\s*(?:h|gio)\s*(?:\d{1,2}\s*(?:phut))?\s*(?:sang|trua|chieu|toi|dem)?',
+    # Time + weekday + week: 9:00 cn tuần sau, 10h t2 tuần sau
+    r'\d{1,2}\s*(?::|h|gio)\s*\d{0,2}\s*(?:cn|thu|t)\s*\d*\s*(?:tuan\s+sau)?',
+    # Time + date complex: 14h ngày 6 tháng 12
+    r'\d{1,2}\s*(?:h|gio)\s+ngay\s+\d{1,2}\s+thang\s+\d{1,2}',
+    # Combined: time + period + date
+    r'\d{1,2}(?:h\d{2}|:\d{2}|h)\s*(?:sang|trua|chieu|toi|dem)?\s*(?:hom\s+nay|ngay\s+mai|mai|ngay\s+kia|thu\s+\d|cn)',
+    # Time with date: 8:30 ngày mai, 10h ngày mai, 12 giờ hôm nay, 17h30 hôm nay
+    r'\d{1,2}\s*(?:h\d{2}|gio|:\d{2})\s+(?:hom\s+nay|ngay\s+mai|mai|ngay\s+kia)',
+    # Number words: hai giờ chiều, một giờ trưa
+    r'(?:mot|hai|ba|bon|nam|sau|bay|tam|chin|muoi|muoi\s+mot|muoi\s+hai)\s+gio\s*(?:sang|trua|chieu|toi|dem)?',
+    # Time with period: 10h sáng, 2h chiều, 12 giờ hôm nay
+    r'\d{1,2}\s*(?:h|gio)\s*(?:\d{1,2}\s*(?:phut))?\s*(?:sang|trua|chieu|toi|dem)',
+    # Time with weekday: 10h thứ 2, 14h CN
+    r'\d{1,2}\s*(?:h|gio)\s*(?:thu|t)?\s*\d|CN',
+    # Simple time: 10h, 10:30, 10 giờ 30, 12 giờ
+    r'\d{1,2}\s*(?:h|:\d{2}|gio(?:\s*\d{1,2}\s*(?:phut)?)?)',
+    # Rưỡi: 10h rưỡi
+    r'\d{1,2}\s*(?:h|gio)\s*ruoi',
+    # Kém: 10h kém 15
+    r'\d{1,2}\s*(?:h|gio)\s*kem\s*\d{1,2}',
+    # Time range: 10h-12h
+    r'\d{1,2}(?:h|:\d{2})?\s*[-–]\s*\d{1,2}(?:h|:\d{2})?',
+    # Duration: trong X tuần/ngày/tháng
+    r'trong\s+\d+\s+(?:ngay|tuan|thang)',
+    # Special relative: cuối tuần
+    r'cuoi\s+tuan',
+    # Date relative: ngày mai, hôm nay, tuần sau
+    # Also capture with time: "hôm nay 10h", "10h hôm nay"
+    r'(?:hom\s+nay|ngay\s+mai|mai|ngay\s+kia|tuan\s+sau|tuan\s+toi|thang\s+sau)(?:\s+\d{1,2}\s*(?:h|gio))?',
+    r'\d{1,2}\s*(?:h|gio)\s+(?:hom\s+nay|ngay\s+mai|mai)',
+    # Weekdays: thứ 2, thứ hai, t2, CN
+    r'(?:thu|t)\s*\d+(?:\s+tuan\s+sau)?|cn(?:\s+tuan\s+sau)?',
+    # Date: ngày 15 tháng 12, ngày 6 tháng 12
+    r'ngay\s+\d{1,2}\s+thang\s+\d{1,2}',
+]
+
+# Time patterns of the semantic (PhoBERT) path, every match is collected
+# IMPORTANT: Order matters - ranges MUST come first!
+# NOTE: Patterns match against NORMALIZED text (no typos, no diacritics)
+TIME_SEMANTIC_PATTERNS = [
+    # PRIORITY 0: Time ranges (MUST be first to capture as single unit)
+    # "từ 9h đến 11h sáng mai", "9h-11h", "9h đến 11h"
+    r'(?:tu\s+)?\d{1,2}(?:h|:\d{2}|(?:\s*gio(?:\s*\d{1,2}(?:\s*phut)?)?))\s*(?:den|den|-|–)\s*\d{1,2}(?:h|:\d{2}|(?:\s*gio(?:\s*\d{1,2}(?:\s*phut)?)?))',
+    # Number words + gio + period + weekday (e.g., "chu nhat sau gio chieu")
+    r'(?:chu\s+nhat|cn|thu|t\s*\d)\s+(?:mot|hai|ba|bon|tu|nam|sau|bay|tam|chin|muoi)\s+(?:gio)\s*(?:sang|trua|chieu|toi|dem)?',
+    r'(?:mot|hai|ba|bon|tu|nam|sau|bay|tam|chin|muoi)\s+(?:gio)\s*(?:sang|trua|chieu|toi|dem)?\s*(?:chu\s+nhat|cn|thu|t\s*\d)',
+    # Explicit time: 10h, 10:30, 10 giờ 30
+    r'\d{1,2}(?:h|:\d{2}|(?:\s*gio(?:\s*\d{1,2}(?:\s*phut)?)?))(?:\s*(?:sang|trua|chieu|toi|dem))?',
+    # Relative: ngày mai, hôm nay, tuần sau
+    r'(?:hom\s+nay|ngay\s+mai|mai|ngay\s+kia|tuan\s+sau|tuan\s+toi|thang\s+sau)',
+    # Weekdays: thứ 2, thứ hai, t2, CN
+    r'(?:thu|t)\s*\d|CN|chu\s+nhat',
+    # Date: ngày 15 tháng 12
+    r'ngay\s+\d{1,2}\s+thang\s+\d{1,2}',
+    # Period: sáng, chiều, tối
+    r'\b(?:sang|trua|chieu|toi|dem|khuya)\b',
+]
+
+# Enhanced pattern: ở|o / tại|tai followed by location (stops at punctuation or time connectors)
+# This matches the improved regex from pipeline.py (lines 56-62)
+# Pattern: "o truong ham tu" -> "truong ham tu" (handles no-diacritics)
+LOCATION_MARKER_PATTERN = (
+    r"\b(?:ở|o|tại|tai)\s+"                        # location marker (with/without diacritics)
+    r"([^\n,.;:!?]+?)\s*"                          # location content (non-greedy)
+    r"(?=$|[，,.;:!?]|\b(?:vào|vao|lúc|luc|khoảng|khoang|đến|den|tới|toi|cho\s+đến|cho\s+den|nhắc|nhac|trước|truoc))"
+)
+
+# Fallback: specific location types (phòng, tầng, building names)
+# PRIORITY ORDER: Compound locations (company + building) FIRST, then single patterns
+LOCATION_FALLBACK_PATTERNS = [
+    # PRIORITY 1: Company/organization + building (e.g., "công ty ABC phòng 401")
+    # Captures full compound location: organization name + room/floor
+    r'(?:công ty|cong ty|văn phòng|van phong|trường|truong|bệnh viện|benh vien)\s+[A-Z\w]+(?:\s+(?:phòng|phong|tầng|tang|toà|toa|lầu|lau)\s+[\w\d]+)?',
+
+    # PRIORITY 2: Named places with names (e.g., "nhà hàng Sài Gòn", "quán cafe Trung Nguyên")
+    r'(?:nhà hàng|nha hang|quán|quan|cafe|café|siêu thị|sieu thi|chợ|cho)\s+[\w\s]{2,30}',
+
+    # PRIORITY 3: Building-only (e.g., "phòng 302", "tầng 5") - MUST BE LAST
+    # Only matches if no compound location found above
+    r'(?:phòng|phong|tầng|tang|toà|toa|lầu|lau)\s+[\w\d]+',
+]
+
+# Location markers of the semantic (PhoBERT) path
+# PRIORITY ORDER: Compound locations FIRST (company + building), then single patterns
+LOCATION_SEMANTIC_PATTERNS = [
+    r'(?:ở|tại|đến|về)\s+([^,\.\d]{3,50})',
+    # Company/org + building: "công ty ABC phòng 401"
+    r'(?:trường|công ty|văn phòng|bệnh viện|nhà hàng|quán)\s+[A-Z\w]+(?:\s+(?:phòng|tầng|toà|tòa)\s+[\w\d]+)?',
+    # Building-only (MUST BE LAST)
+    r'(?:phòng|tầng|toà|tòa)\s+[\w\s\d]{1,30}',
+]
+
+# Reminder patterns - order matters (most specific first): (pattern, minutes per unit)
+REMINDER_PATTERNS = [
+    # "nhắc sớm hơn 1 giờ" / "nhac som hon 1 gio"
+    (r'nhắc\s+(?:tôi\s+)?(?:sớm\s+hơn|som\s+hon)\s+(\d{1,2})\s*(?:giờ|h|gio)', 60),
+    # "nhắc sớm hơn 30 phút" / "nhac som hon 30 phut"
+    (r'nhắc\s+(?:tôi\s+)?(?:sớm\s+hơn|som\s+hon)\s+(\d{1,3})\s*(?:phút|phut|p)', 1),
+    # "nhắc trước 10 phút"
+    (r'nhắc\s+(?:tôi\s+)?(?:trước|truoc)\s+(\d{1,3})\s*(?:phút|phut|p)', 1),
+    # "nhắc trước 1 giờ"
+    (r'nhắc\s+(?:tôi\s+)?(?:trước|truoc)\s+(\d{1,2})\s*(?:giờ|gio|h)', 60),
+    # "nhắc 1 giờ trước"
+    (r'nhắc\s+(?:tôi\s+)?(\d{1,2})\s*(?:giờ|gio|h)\s*(?:trước|truoc)?', 60),
+    # "nhắc 30 phút"
+    (r'nhắc\s+(?:tôi\s+)?(\d{1,3})\s*(?:phút|phut|p)', 1),
+    # "10 phút trước nhắc"
+    (r'(\d{1,3})\s*(?:phút|phut|p)\s*(?:trước|truoc)\s*nhắc', 1),
+    # "1 giờ trước nhắc"
+    (r'(\d{1,2})\s*(?:giờ|gio|h)\s*(?:trước|truoc)\s*nhắc', 60),
+]
+
+# Reminder keyword without time (default: 15 minutes)
+REMINDER_KEYWORD_PATTERN = r'\b(?:nhắc|nhac|remind)\b'
+
+# --- Event name cleaning (applied in this order) ---
+
+# Remove weekday patterns (t2, t3, t5, cn, chu nhat, thu 2, thứ 3, etc.)
+EVENT_WEEKDAY_PATTERNS = [
+    r'\b(?:thứ|thu)\s*(?:hai|ba|tư|tu|năm|nam|sáu|sau|bảy|bay|chủ\s*nhật)\b',
+    # Typo variants with 'h' suffix
+    r'\b(?:thứ|thu)\s*(?:haih|bah|tuh|namh|sauh|bayh)\b',
+    r'\b(?:thứ|thu)\s*\d\b',
+    r'\bt\s*\d\b',
+    r'\bcn\b',
+    r'\bchủ\s*nhật\b',
+    r'\bchu\s*nhat\b',
+]
+
+# Remove time patterns (explicit times: 10h, 8:30, etc.)
+EVENT_TIME_PATTERNS = [
+    r'\b\d{1,2}\s*[hH:]\s*\d{0,2}\b',  # 10h, 8:30
+    r'\b\d{1,2}\s*giờ(?:\s*\d{1,2}\s*phút)?\b',  # 10 giờ, 10 giờ 30 phút
+    # Number words + giờ (mười giờ, hai giờ, etc.)
+    r'\b(?:một|mot|hai|ba|bốn|bon|năm|nam|sáu|sau|bảy|bay|tám|tam|chín|chin|mười|muoi|muoi\s+mot|muoi\s+hai)\s+giờ\b',
+]
+
+# Remove location marker + location (ở/o/tại + location) - ENHANCED
+# This removes the ENTIRE phrase "ở truong ham tu" not just marker
+EVENT_LOCATION_MARKER_PATTERN = r'\b(?:ở|o|tại|tai)\s+[^\s,\.!?\d]+'
+
+# Location words are kept when they belong to a compound verb/event phrase
+EVENT_COMPOUND_PHRASES = [
+    r'\bkhám\s+bệnh\b', r'\bkham\s+benh\b',  # medical checkup
+    r'\băn\s+tối\b', r'\ban\s+toi\b',  # dinner
+    r'\băn\s+sáng\b', r'\ban\s+sang\b',  # breakfast
+    r'\băn\s+trưa\b', r'\ban\s+trua\b',  # lunch
+    r'\bđi\s+cafe\b', r'\bdi\s+cafe\b',  # go to cafe (event, not just location)
+    r'\bđi\s+chợ\b', r'\bdi\s+cho\b',  # go to market (event, not just location)
+    r'\bra\s+chợ\b', r'\bra\s+cho\b',  # go out to market
+]
+
+# Remove reminder phrases
+EVENT_REMINDER_PATTERNS = [
+    r'nhắc\s+(?:tôi\s+)?(?:trước|sớm\s+hơn)?\s*\d{1,3}\s*(?:phút|p|giờ|h|gio)(?:\s+trước)?',
+    r'nhac\s+(?:toi\s+)?(?:truoc|som\s+hon)?\s*\d{1,3}\s*(?:phut|p|gio|h)(?:\s+truoc)?',
+    r'\d{1,3}\s*(?:phút|phut|p|giờ|gio|h)\s*(?:trước|truoc\s+)?(?:nhắc|nhac|nhở|nho)',
+    r'nhắc\s+(?:tôi\s+)?(?:trước|nhở|som\s+hon)?',
+    r'nhac\s+(?:toi\s+)?(?:truoc|nho|som\s+hon)?',
+    # Remove standalone reminder modifiers that might remain
+    r'\b(?:sớm\s+hơn|som\s+hon|trước|truoc)\b',
+]
+
+# Remove relative time words
+EVENT_RELATIVE_WORDS = [
+    'hôm nay', 'hom nay', 'ngày mai', 'ngay mai', 'mai',
+    'ngày kia', 'ngay kia', 'ngày mốt', 'ngay mot', 'mốt', 'mot',
+    'hôm qua', 'hom qua', 'qua', 'nay',
+    'tuần sau', 'tuan sau', 'tuần trước', 'tuan truoc',
+]
+
+# Remove "tối" only if NOT preceded by "ăn" (preserve "ăn tối")
+EVENT_TOI_PATTERN = r'(?<!ăn\s)(?<!an\s)\b(?:tối|toi)\b'
+
+# Remove other period words (sáng, chiều, đêm) normally
+EVENT_PERIOD_WORDS = ['sáng', 'sang', 'trưa', 'trua', 'chiều', 'chieu', 'đêm', 'dem', 'khuya']
+
+# Remove time/location connectors
+EVENT_CONNECTORS = ['vào', 'vao', 'lúc', 'luc', 'vào lúc', 'vao luc', 'khoảng', 'khoang', 'từ', 'tu', 'đến', 'den', 'tới', 'cho đến', 'cho den']
+
+# Remove location-related fragments (common fragments that leak into events)
+EVENT_LOCATION_FRAGMENTS = [
+    # Building/place words
+    r'\b(?:phòng|phong|tầng|tang|toà|toa|lầu|lau)\b',
+    # Partial words from compound location names
+    r'\b(?:ham|tu|gần|gan|viện|vien|hàng|hang|công|cong|ty|quan)\b',
+]
+
+# Remove cafe/market words ONLY if NOT part of motion event (preserve "đi chợ", "đi cafe")
+EVENT_CAFE_PATTERN = r'(?<!đi\s)(?<!di\s)(?<!ra\s)(?<!vào\s)(?<!vao\s)\b(?:cafe|café)\b'
+EVENT_MARKET_PATTERN = r'(?<!đi\s)(?<!di\s)(?<!ra\s)(?<!vào\s)(?<!vao\s)\b(?:chợ|cho)\b'
+# Market-related words are removed normally (these are rarely events)
+EVENT_MARKET_WORDS_PATTERN = r'\b(?:siêu|sieu|thị|thi|truong|trường)\b'
+
+# Remove standalone numbers (including typo number words)
+EVENT_NUMBER_PATTERN = r'\b\d{1,4}\b'
+EVENT_TYPO_NUMBER_PATTERN = r'\b(?:sauh|namh|tamh|muoih|bayh|bah|bonh|tuh|haih|moth|chinh)\b'
+
+# Main action verbs, used when nothing else is left of the event name
+EVENT_ACTION_VERBS = ['họp', 'hop', 'đi', 'di', 'làm', 'lam', 'gặp', 'gap', 'học', 'hoc', 'ăn', 'an', 'chạy', 'chay', 'tập', 'tap']
+
+# Short last words that are leftovers of a location, not part of the event
+EVENT_TRAILING_FRAGMENTS = frozenset(['ham', 'tu', 'ty', 'abc', 'gan', 'nha', 'o', 'a', 'b', 'c', 'mai', 'bai', 'sai', 'gon'])
+
+
+def _word_alternation(words: Sequence[str]) -> str:
+    r"""
+    One \b(?:w1|w2|...)\b regex removing the same text as re.sub(r'\bw\b', ' ', ...)
+    for each word in turn.
+
+    Replacing a whole word by a space creates no new word boundary and no new
+    single-space phrase, so the only order effect is a phrase containing an
+    earlier word ("cho đến" after "đến"): the loop never sees it, and it is left
+    out here. Otherwise the words must not overlap a later word that starts
+    first (true for the event-name lists).
+    """
+    kept: List[str] = []
+    for word in words:
+        if any(re.search(r'\b' + re.escape(w) + r'\b', word, re.IGNORECASE) for w in kept):
+            continue
+        kept.append(word)
+    return r'\b(?:' + '|'.join(re.escape(w) for w in kept) + r')\b'
+
+
+class HeuristicPatterns:
+    """Compiled patterns of the PhoBERTEventExtractor heuristics (shared, read-only)."""
+
+    def __init__(self):
+        ic = re.IGNORECASE
+        # Time (longest match wins, searched one by one)
+        self.time_heuristic = [re.compile(p) for p in TIME_HEURISTIC_PATTERNS]
+        self.time_semantic = [re.compile(p, ic) for p in TIME_SEMANTIC_PATTERNS]
+
+        # Location
+        self.location_marker = re.compile(LOCATION_MARKER_PATTERN, ic)
+        self.location_fallback = [re.compile(p, ic) for p in LOCATION_FALLBACK_PATTERNS]
+        self.location_semantic = [re.compile(p, ic) for p in LOCATION_SEMANTIC_PATTERNS]
+        self.location_prefix = re.compile(r'^(?:ở|o|tại|tai|đến|den|về|ve)\s+', ic)
+        self.location_semantic_prefix = re.compile(r'^(?:ở|tại|đến|về)\s+', ic)
+        # Stop at time expressions or reminder keywords
+        self.location_stop = re.compile(r'\s+(?:\d{1,2}(?:h|:|giờ|gio)|nhắc|nhac|remind)')
+
+        # Reminder
+        self.reminder = [(re.compile(p, ic), multiplier) for p, multiplier in REMINDER_PATTERNS]
+        self.reminder_keyword = re.compile(REMINDER_KEYWORD_PATTERN, ic)
+
+        # Event name
+        self.event_weekday = [re.compile(p, ic) for p in EVENT_WEEKDAY_PATTERNS]
+        self.event_time = [re.compile(p, ic) for p in EVENT_TIME_PATTERNS]
+        self.event_location_marker = re.compile(EVENT_LOCATION_MARKER_PATTERN, ic)
+        self.event_compound_phrases = [re.compile(p, ic) for p in EVENT_COMPOUND_PHRASES]
+        self.event_reminder = [re.compile(p, ic) for p in EVENT_REMINDER_PATTERNS]
+        self.event_relative = re.compile(_word_alternation(EVENT_RELATIVE_WORDS), ic)
+        self.event_toi = re.compile(EVENT_TOI_PATTERN, ic)
+        self.event_period = re.compile(_word_alternation(EVENT_PERIOD_WORDS), ic)
+        self.event_connectors = re.compile(_word_alternation(EVENT_CONNECTORS), ic)
+        # Both fragment groups are whole single words: one alternation
+        self.event_location_fragments = re.compile(
+            '|'.join(f'(?:{p})' for p in EVENT_LOCATION_FRAGMENTS), ic)
+        # Neither lookbehind can see a cafe word, so both are removed in one pass
+        self.event_cafe_market = re.compile(f'(?:{EVENT_CAFE_PATTERN})|(?:{EVENT_MARKET_PATTERN})', ic)
+        self.event_market_words = re.compile(EVENT_MARKET_WORDS_PATTERN, ic)
+        self.event_numbers = re.compile(EVENT_NUMBER_PATTERN)
+        self.event_typo_numbers = re.compile(EVENT_TYPO_NUMBER_PATTERN, ic)
+        self.event_action_verbs = [
+            re.compile(r'\b' + re.escape(verb) + r'\b(?:\s+\w+){0,2}', ic) for verb in EVENT_ACTION_VERBS
+        ]
+        self.whitespace = re.compile(r'\s+')
+
+    @classmethod
+    @lru_cache(maxsize=None)
+    def default(cls) -> 'HeuristicPatterns':
+        """Shared pattern bank (compiled on first use, once per process)."""
+        return cls()
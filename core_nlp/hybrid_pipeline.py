@@ -4,12 +4,18 @@ Uses ensemble voting and confidence scoring for best accuracy
 """
 
 from __future__ import annotations
+import json
 import os
-from typing import Optional, Dict, Any
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Optional, Dict, Any, Iterable, List, Tuple
 from datetime import datetime
 import re
 
 from .pipeline import NLPPipeline
+from .process_memory import current_rss_mb
 try:
     from .phobert_model import PhoBERTNLPPipeline
     PHOBERT_AVAILABLE = True
@@ -23,21 +29,100 @@ class HybridNLPPipeline:
     Hybrid pipeline combining Rule-based and PhoBERT models
     
     Strategy:
-    1. Run both models in parallel
+    1. Run both models (in parallel with a latency budget, see below)
     2. Compare results with confidence scoring
     3. Use voting/merging to select best result
     4. Fallback to rule-based if PhoBERT unavailable
+    
+    Merging only ever takes the event name from PhoBERT (when the rule-based
+    one is empty), so PhoBERT is gated (phobert_gate):
+    - 'complete': skip it when the rule-based event name is present; the
+      merged answer is then the rule-based one anyway (default)
+    - 'score': skip it when the completeness score of the rule result
+      (_completeness) reaches gate_threshold, trading the PhoBERT event name
+      of rule results without one for rule-based latency
+    - 'always': run it on every input
+    
+    With phobert_budget_ms set, PhoBERT runs on a dedicated inference thread
+    and the answer waits for it at most that long after process() started.
+    With phobert_gate='always' it starts right away, in parallel with the
+    rules on the caller's thread; otherwise once the gate asked for it. A
+    missed deadline returns the rule-based answer; the late PhoBERT result is
+    kept (late_results(), and phobert_late_log as JSON lines) for offline
+    comparison. While the thread is still busy with late work, new inputs
+    don't queue behind it and get the rule-based answer straight away.
+    
+    With phobert_idle_minutes set, a watchdog thread unloads the PhoBERT
+    model after that long without use; the next input that needs it loads it
+    again (memory_stats() shows RSS and the load/unload counts).
     """
     
-    def __init__(self, model_path: Optional[str] = None, *, relative_base: Optional[datetime] = None):
+    GATE_MODES = ('complete', 'score', 'always')
+    
+    # Completeness score weights of the rule-based fields (sum = 1.0).
+    # The event name weighs most: it is the only field PhoBERT can supply.
+    COMPLETENESS_WEIGHTS = {
+        'event_name': 0.6,
+        'start_time': 0.25,
+        'location': 0.1,
+        'reminder_minutes': 0.05,
+    }
+    
+    def __init__(self, model_path: Optional[str] = None, *, relative_base: Optional[datetime] = None,
+                 phobert_gate: str = 'complete', gate_threshold: float = 0.6,
+                 phobert_budget_ms: Optional[float] = None, phobert_late_log: Optional[str] = None,
+                 late_results_size: int = 100, quantize: Optional[str] = None,
+                 phobert_backend: str = 'torch', phobert_idle_minutes: Optional[float] = None,
+                 phobert_max_batch: int = 1, phobert_max_wait_ms: float = 5.0):
         """
         Initialize hybrid pipeline
         
         Args:
             model_path: Path to fine-tuned PhoBERT model (optional)
             relative_base: Base datetime for relative time parsing
+            phobert_gate: When to skip PhoBERT: 'complete', 'score' or 'always' (never skip)
+            gate_threshold: Completeness score (0.0-1.0) at which 'score' mode skips PhoBERT
+            phobert_budget_ms: Latency budget of the PhoBERT branch, e.g. 150 (None = run inline, no limit)
+            phobert_late_log: JSON lines file the late PhoBERT results are appended to (optional)
+            late_results_size: Late PhoBERT results kept in memory for late_results()
+            quantize: 'int8' for dynamic INT8 PhoBERT inference on CPU (None = fp32)
+            phobert_backend: 'torch', or 'onnx' = onnxruntime on model_path/model.onnx
+            phobert_idle_minutes: Unload PhoBERT after this many minutes without use, reload on
+                demand (None = keep it loaded)
+            phobert_max_batch: > 1 = concurrent phobert.extract_entities() calls share forward
+                passes of up to this many sentences (process() uses the heuristics)
+            phobert_max_wait_ms: Longest time a sentence waits for others to join its batch
+        
+        quantize, phobert_backend and the batching options never change process()
+        output: PhoBERT's answer there comes from its heuristics
+        (PhoBERTEventExtractor.process). They set how self.phobert runs the model
+        for extract_entities() / extract_entities_batch() (speed, memory, head
+        predictions of a fine-tuned model_path).
         """
+        if phobert_gate not in self.GATE_MODES:
+            raise ValueError(f"phobert_gate must be one of {self.GATE_MODES}, got {phobert_gate!r}")
+        if phobert_backend != 'torch' and not (model_path and os.path.exists(model_path)):
+            raise ValueError(f"phobert_backend={phobert_backend!r} needs the model_path of an exported "
+                             f"fine-tuned model, got {model_path!r}")
         self.relative_base = relative_base
+        self.phobert_gate = phobert_gate
+        self.gate_threshold = gate_threshold
+        self._gate_lock = threading.Lock()
+        self._gate_counts = {'runs': 0, 'skipped': 0}
+        
+        # Inference thread (created on first use) + latency budget counters
+        self.phobert_budget_ms = phobert_budget_ms
+        self.phobert_late_log = phobert_late_log
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._inflight = 0
+        self._budget_counts = {'in_budget': 0, 'timeouts': 0, 'busy': 0, 'late_done': 0}
+        self._late_results = deque(maxlen=late_results_size)
+        
+        # Idle unloading (watchdog started once PhoBERT is loaded)
+        self.phobert_idle_minutes = phobert_idle_minutes
+        self._phobert_last_used = time.monotonic()
+        self._idle_stop = threading.Event()
+        self._idle_thread: Optional[threading.Thread] = None
         
         # Always initialize rule-based (fast, reliable)
         print("⚡ Initializing Rule-based NLP...")
@@ -50,17 +135,25 @@ class HybridNLPPipeline:
             try:
                 if model_path and os.path.exists(model_path):
                     print(f"🤖 Loading fine-tuned PhoBERT from {model_path}...")
-                    self.phobert = PhoBERTNLPPipeline(model_path=model_path)
+                    self.phobert = PhoBERTNLPPipeline(model_path=model_path, quantize=quantize,
+                                                      backend=phobert_backend,
+                                                      max_batch=phobert_max_batch,
+                                                      max_wait_ms=phobert_max_wait_ms)
                     print("✅ PhoBERT fine-tuned loaded")
                 else:
                     print("🤖 Loading base PhoBERT...")
-                    self.phobert = PhoBERTNLPPipeline()
+                    self.phobert = PhoBERTNLPPipeline(quantize=quantize, max_batch=phobert_max_batch,
+                                                      max_wait_ms=phobert_max_wait_ms)
                     print("✅ PhoBERT base loaded")
             except Exception as e:
                 print(f"⚠️ PhoBERT failed to load: {e}")
                 print("📋 Using rule-based only")
                 self.phobert = None
         
+        if self.phobert and phobert_idle_minutes is not None:
+            self._idle_thread = threading.Thread(target=self._idle_watch, name='phobert-idle', daemon=True)
+            self._idle_thread.start()
+        
         # Set mode
         if self.phobert:
             print("🔥 HYBRID MODE: Rule-based + PhoBERT")
@@ -208,24 +301,169 @@ class HybridNLPPipeline:
             Dict with: event, start_time, end_time, location, reminder_minutes
         """
         if not text or not text.strip():
-            return {
-                'event_name': None,
-                'start_time': None,
-                'end_time': None,
-                'location': None,
-                'reminder_minutes': 0
-            }
+            return self._empty_result()
         
         base = relative_base or self.relative_base
         
+        # Start PhoBERT first when it is never gated: it runs while the rules do
+        pending = None
+        if self.phobert and self.phobert_budget_ms is not None and self.phobert_gate == 'always':
+            pending = self._submit_phobert(text)
+        
         # Always run rule-based (fast, reliable)
         rule_result = self.rule_based.process(text)
+        return self._combine(text, rule_result, pending)
+    
+    def process_batch(self, texts: Iterable[str], relative_base: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """
+        Process many texts; the rule-based stage runs as one NLPPipeline.process_batch call
+        
+        Args:
+            texts: Input Vietnamese texts
+            relative_base: Base datetime for relative time parsing
+            
+        Returns:
+            One result dict per input, in order (same as process())
+        """
+        texts = list(texts)
+        active = [t for t in texts if t and t.strip()]
+        rule_results = iter(self.rule_based.process_batch(active, relative_base=relative_base))
+        return [
+            self._combine(t, next(rule_results)) if t and t.strip() else self._empty_result()
+            for t in texts
+        ]
+    
+    @staticmethod
+    def _empty_result() -> Dict[str, Any]:
+        return {
+            'event_name': None,
+            'start_time': None,
+            'end_time': None,
+            'location': None,
+            'reminder_minutes': 0
+        }
+    
+    def _completeness(self, rule_result: Dict[str, Any]) -> float:
+        """Weighted share of the rule-based fields that are filled (0.0 to 1.0)"""
+        return sum(weight for field, weight in self.COMPLETENESS_WEIGHTS.items() if rule_result.get(field))
+    
+    def _should_skip_phobert(self, rule_result: Dict[str, Any]) -> bool:
+        """True if the gate lets the rule-based result through without PhoBERT"""
+        if self.phobert_gate == 'complete':
+            return bool(rule_result.get('event_name'))
+        if self.phobert_gate == 'score':
+            return self._completeness(rule_result) >= self.gate_threshold
+        return False
+    
+    @staticmethod
+    def _rule_only(rule_result: Dict[str, Any], models_used: str) -> Dict[str, Any]:
+        """Same fields the merge would have produced, without the PhoBERT debug info"""
+        return {
+            'event_name': rule_result.get('event_name'),
+            'start_time': rule_result.get('start_time'),
+            'end_time': rule_result.get('end_time'),
+            'location': rule_result.get('location'),
+            'reminder_minutes': rule_result.get('reminder_minutes', 0),
+            '_models_used': models_used,
+            '_rule_based': rule_result,
+        }
+    
+    def _submit_phobert(self, text: str) -> Tuple[Optional[Future], float]:
+        """
+        Start PhoBERT on the inference thread
+        
+        Returns:
+            (future, start time); future is None if the thread is still busy with late work
+        """
+        started = time.perf_counter()
+        with self._gate_lock:
+            if self._inflight:
+                return None, started
+            self._inflight += 1
+            self._phobert_last_used = time.monotonic()
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='phobert-inference')
+        future = self._executor.submit(self.phobert.process, text)
+        future.add_done_callback(self._phobert_done)
+        return future, started
+    
+    def _phobert_done(self, future: Future) -> None:
+        with self._gate_lock:
+            self._inflight -= 1
+    
+    def _phobert_within_budget(self, text: str, rule_result: Dict[str, Any],
+                               pending: Optional[Tuple[Optional[Future], float]]) -> Optional[Dict[str, Any]]:
+        """PhoBERT result if it is ready within the latency budget, else None (late result gets logged)"""
+        future, started = pending if pending is not None else self._submit_phobert(text)
+        if future is None:
+            with self._gate_lock:
+                self._budget_counts['busy'] += 1
+            return None
+        remaining = self.phobert_budget_ms / 1000 - (time.perf_counter() - started)
+        try:
+            phobert_result = future.result(timeout=max(0.0, remaining))
+        except FutureTimeoutError:
+            with self._gate_lock:
+                self._budget_counts['timeouts'] += 1
+            future.add_done_callback(lambda f: self._log_late(text, rule_result, f, started))
+            return None
+        with self._gate_lock:
+            self._budget_counts['in_budget'] += 1
+        return phobert_result
+    
+    def _idle_watch(self) -> None:
+        """Watchdog thread: unload PhoBERT once it has been idle for phobert_idle_minutes"""
+        idle_limit = self.phobert_idle_minutes * 60
+        while not self._idle_stop.wait(min(60.0, max(1.0, idle_limit / 4))):
+            with self._gate_lock:
+                idle = time.monotonic() - self._phobert_last_used
+                busy = self._inflight  # queued budget calls; unload() itself skips a model in use
+            if idle >= idle_limit and not busy and self.phobert.is_loaded:
+                self.phobert.unload()
+    
+    def _log_late(self, text: str, rule_result: Dict[str, Any], future: Future, started: float) -> None:
+        """Keep a PhoBERT result that missed the deadline (inference thread)"""
+        if future.cancelled() or future.exception() is not None:
+            return
+        entry = {
+            'text': text,
+            'elapsed_ms': round((time.perf_counter() - started) * 1000, 1),
+            'budget_ms': self.phobert_budget_ms,
+            'rule_based': {field: rule_result.get(field) for field in self._empty_result()},
+            'phobert': future.result(),
+        }
+        with self._gate_lock:
+            self._budget_counts['late_done'] += 1
+            self._late_results.append(entry)
+            if self.phobert_late_log:
+                try:
+                    with open(self.phobert_late_log, 'a', encoding='utf-8') as f:
+                        f.write(json.dumps(entry, ensure_ascii=False, default=str) + '\n')
+                except OSError as e:
+                    print(f"⚠️ Could not write late PhoBERT result: {e}")
+    
+    def _combine(self, text: str, rule_result: Dict[str, Any],
+                 pending: Optional[Tuple[Optional[Future], float]] = None) -> Dict[str, Any]:
+        """Merge the rule-based result with PhoBERT (if available and not gated off)"""
+        if self.phobert and self._should_skip_phobert(rule_result):
+            with self._gate_lock:
+                self._gate_counts['skipped'] += 1
+            return self._rule_only(rule_result, 'rule-based-gated')
         
         # If PhoBERT available, run both and merge
         if self.phobert:
+            with self._gate_lock:
+                self._gate_counts['runs'] += 1
+                self._phobert_last_used = time.monotonic()
             try:
-                # PhoBERT.process() doesn't accept relative_base parameter
-                phobert_result = self.phobert.process(text)
+                if self.phobert_budget_ms is None:
+                    # PhoBERT.process() doesn't accept relative_base parameter
+                    phobert_result = self.phobert.process(text)
+                else:
+                    phobert_result = self._phobert_within_budget(text, rule_result, pending)
+                    if phobert_result is None:
+                        # Deadline missed (or inference thread busy): answer at rule-based latency
+                        return self._rule_only(rule_result, 'rule-based-timeout')
                 
                 # Merge results using voting
                 result = self._merge_results(rule_result, phobert_result)
@@ -245,13 +483,69 @@ class HybridNLPPipeline:
             result['_models_used'] = 'rule-based-only'
             return result
     
+    def cache_stats(self) -> Dict[str, Any]:
+        """Parse cache hit/miss counters per model"""
+        return {
+            'rule_based': self.rule_based.cache_stats(),
+            'phobert': self.phobert.cache_stats() if self.phobert else {},
+        }
+    
+    def gate_stats(self) -> Dict[str, Any]:
+        """How often the PhoBERT gate ran or skipped the model"""
+        with self._gate_lock:
+            runs = self._gate_counts['runs']
+            skipped = self._gate_counts['skipped']
+        total = runs + skipped
+        return {
+            'mode': self.phobert_gate,
+            'runs': runs,
+            'skipped': skipped,
+            'skip_rate': skipped / total if total else 0.0,
+        }
+    
+    def latency_stats(self) -> Dict[str, Any]:
+        """PhoBERT latency budget counters (in budget, timed out, skipped while busy, late results logged)"""
+        with self._gate_lock:
+            counts = dict(self._budget_counts)
+        counts['budget_ms'] = self.phobert_budget_ms
+        return counts
+    
+    def late_results(self) -> List[Dict[str, Any]]:
+        """Most recent PhoBERT results that missed the deadline, oldest first"""
+        with self._gate_lock:
+            return list(self._late_results)
+    
+    def memory_stats(self) -> Dict[str, Any]:
+        """
+        Resident memory of the process and the PhoBERT idle-unload counters
+        
+        Returns:
+            {'rss_mb', 'idle_unload_minutes', 'loaded', 'loads', 'unloads',
+             'last_load_seconds', 'idle_s'} (PhoBERT keys only when it is available)
+        """
+        stats = {'rss_mb': current_rss_mb(), 'idle_unload_minutes': self.phobert_idle_minutes}
+        if self.phobert:
+            stats.update(self.phobert.load_stats())
+            with self._gate_lock:
+                stats['idle_s'] = time.monotonic() - self._phobert_last_used
+        return stats
+    
+    def close(self) -> None:
+        """Stop the inference and idle threads (pending PhoBERT work is dropped)"""
+        self._idle_stop.set()
+        with self._gate_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+    
     def get_model_info(self) -> Dict[str, Any]:
         """Get information about loaded models"""
         return {
             'rule_based': 'active',
             'phobert': 'active' if self.phobert else 'unavailable',
             'mode': 'hybrid' if self.phobert else 'rule-based-only',
-            'phobert_available': PHOBERT_AVAILABLE
+            'phobert_available': PHOBERT_AVAILABLE,
+            'phobert_gate': self.phobert_gate,
         }
 
 
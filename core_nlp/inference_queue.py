@@ -0,0 +1,141 @@
+"""
+Inference Queue - micro-batching for the PhoBERT forward pass
+A transformer forward pass costs about the same for 1 sentence as for a dozen
+short ones, so running one sentence per pass wastes most of it when several
+threads (or a bulk import) submit work at the same time.
+
+InferenceQueue collects submitted items on a worker thread: the first item
+opens a batch, which closes after max_wait_ms (counted from that item's
+submit time) or at max_batch items. The batch goes to run_batch in one call
+(PhoBERTEventExtractor.extract_entities_batch pads it to the longest
+sentence) and each result is handed back to the Future of its request.
+
+stats() exposes the batch-size histogram and the queue-wait histogram (time
+from submit to the start of its batch), to tune max_batch / max_wait_ms.
+"""
+from __future__ import annotations
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Upper bounds (ms) of the queue-wait histogram buckets; the last bucket is open
+WAIT_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100)
+
+
+class InferenceQueue:
+    """Micro-batches submitted items for one run_batch call (thread-safe)."""
+
+    def __init__(self, run_batch: Callable[[List[Any]], List[Any]], max_batch: int = 16,
+                 max_wait_ms: float = 5.0, name: str = 'inference-queue'):
+        """
+        Args:
+            run_batch: Called with a list of items, returns one result per item (same order)
+            max_batch: Most items per batch
+            max_wait_ms: Longest time the first item of a batch waits for more
+            name: Worker thread name
+        """
+        if max_batch < 1:
+            raise ValueError(f"max_batch must be >= 1, got {max_batch}")
+        self.run_batch = run_batch
+        self.max_batch = max_batch
+        self.max_wait_ms = max_wait_ms
+        self._queue: queue.Queue[Optional[Tuple[Any, Future, float]]] = queue.Queue()
+        self._lock = threading.Lock()
+        self._closed = False
+        self.reset_stats()
+        self._thread = threading.Thread(target=self._worker, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, item: Any) -> Future:
+        """Queue one item; the Future gets its result (or the batch's exception)."""
+        future: Future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("InferenceQueue is closed")
+            self._queue.put((item, future, time.perf_counter()))
+        return future
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Run the items already queued, then stop the worker."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)
+        self._thread.join(timeout)
+
+    def _worker(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch = [first]
+            deadline = first[2] + self.max_wait_ms / 1000
+            stop = False
+            while len(batch) < self.max_batch:
+                try:
+                    entry = self._queue.get(timeout=max(0.0, deadline - time.perf_counter()))
+                except queue.Empty:
+                    break
+                if entry is None:
+                    stop = True
+                    break
+                batch.append(entry)
+            self._run(batch)
+            if stop:
+                return
+
+    def _run(self, batch: List[Tuple[Any, Future, float]]) -> None:
+        started = time.perf_counter()
+        # Cancelled requests drop out of the batch
+        batch = [entry for entry in batch if entry[1].set_running_or_notify_cancel()]
+        if not batch:
+            return
+        self._record(len(batch), [(started - submitted) * 1000 for _, _, submitted in batch])
+        try:
+            results = self.run_batch([item for item, _, _ in batch])
+            if len(results) != len(batch):
+                raise RuntimeError(f"run_batch returned {len(results)} results for {len(batch)} items")
+        except Exception as e:
+            for _, future, _ in batch:
+                future.set_exception(e)
+            return
+        for (_, future, _), result in zip(batch, results):
+            future.set_result(result)
+
+    def _record(self, size: int, waits_ms: List[float]) -> None:
+        with self._lock:
+            self._batch_sizes[size] = self._batch_sizes.get(size, 0) + 1
+            for wait in waits_ms:
+                bucket = next((i for i, bound in enumerate(WAIT_BUCKETS_MS) if wait <= bound), len(WAIT_BUCKETS_MS))
+                self._wait_counts[bucket] += 1
+                self._max_wait_ms = max(self._max_wait_ms, wait)
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._batch_sizes: Dict[int, int] = {}
+            self._wait_counts = [0] * (len(WAIT_BUCKETS_MS) + 1)
+            self._max_wait_ms = 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Batching counters.
+
+        Returns:
+            {'batches', 'items', 'avg_batch_size', 'batch_sizes': {size: count},
+             'queue_wait_ms': {'<=1': count, ..., '>100': count}, 'max_wait_ms'}
+        """
+        with self._lock:
+            batches = sum(self._batch_sizes.values())
+            items = sum(size * count for size, count in self._batch_sizes.items())
+            labels = [f'<={bound}' for bound in WAIT_BUCKETS_MS] + [f'>{WAIT_BUCKETS_MS[-1]}']
+            return {
+                'batches': batches,
+                'items': items,
+                'avg_batch_size': items / batches if batches else 0.0,
+                'batch_sizes': dict(sorted(self._batch_sizes.items())),
+                'queue_wait_ms': dict(zip(labels, self._wait_counts)),
+                'max_wait_ms': self._max_wait_ms,
+            }
@@ -1,12 +1,30 @@
 """
 Lazy Loading NLP Pipeline Wrapper
 Defers model initialization until first use to speed up startup time
+
+start_preload() loads the hybrid pipeline on a background thread right at app
+launch. Until it is ready, calls are answered by the rule-based NLPPipeline
+(serve_while_loading=True) or wait for it; the switch to the hybrid pipeline is
+a single reference swap, so a call uses either one or the other, never a half
+initialized pipeline.
 """
 
 from __future__ import annotations
-from typing import Optional, Any, Dict
+from typing import Optional, Any, Callable, Dict
 from datetime import datetime
 import threading
+import time
+
+from .process_memory import current_rss_mb
+
+# Progress stages reported by the background load: (stage, fraction done)
+LOAD_STAGES = {
+    'pending': 0.0,
+    'importing': 0.1,
+    'loading_models': 0.3,
+    'ready': 1.0,
+    'failed': 1.0,
+}
 
 
 class LazyLoadPipeline:
@@ -16,54 +34,146 @@ class LazyLoadPipeline:
     This allows the UI to appear immediately while models load in background
     """
     
-    def __init__(self, model_path: Optional[str] = None, *, relative_base: Optional[datetime] = None):
+    def __init__(self, model_path: Optional[str] = None, *, relative_base: Optional[datetime] = None,
+                 serve_while_loading: bool = True,
+                 progress_callback: Optional[Callable[[str, float], None]] = None,
+                 idle_unload_minutes: Optional[float] = None):
         """
         Initialize lazy pipeline wrapper
         
         Args:
             model_path: Path to fine-tuned PhoBERT model
             relative_base: Base datetime for relative time parsing
+            serve_while_loading: True = answer with the rule-based pipeline until the hybrid
+                one is ready; False = calls wait for it
+            progress_callback: Called as (stage, fraction) at each LOAD_STAGES step, from the
+                loader thread (UI code must hand it over to its own thread, e.g. Tk after())
+            idle_unload_minutes: Release the PhoBERT model after this many minutes without
+                use and reload it on demand (HybridNLPPipeline phobert_idle_minutes)
         """
         self.model_path = model_path
         self.relative_base = relative_base
+        self.serve_while_loading = serve_while_loading
+        self.progress_callback = progress_callback
+        self.idle_unload_minutes = idle_unload_minutes
         self._pipeline = None
+        self._fallback = None
         self._lock = threading.Lock()
-        self._loading = False
+        self._ready = threading.Event()
+        self._loader: Optional[threading.Thread] = None
+        self._stage = 'pending'
+        self._started_at: Optional[float] = None
+        self._load_seconds: Optional[float] = None
+        self._error: Optional[str] = None
         print("⚡ NLP Pipeline: Lazy loading enabled (will load on first use)")
     
-    def _ensure_loaded(self):
-        """Ensure pipeline is loaded, load if needed"""
-        if self._pipeline is not None:
-            return  # Already loaded
-        
+    def start_preload(self) -> threading.Thread:
+        """Start loading the hybrid pipeline in the background (once; later calls return the same thread)"""
         with self._lock:
-            if self._pipeline is not None:
-                return  # Another thread just loaded it
-            
-            if self._loading:
-                return  # Another thread is loading, wait for it to finish
-            
-            self._loading = True
-        
+            if self._loader is None:
+                self._started_at = time.perf_counter()
+                self._loader = threading.Thread(target=self._load, name='nlp-preload', daemon=True)
+                self._loader.start()
+            return self._loader
+    
+    def _report(self, stage: str) -> None:
+        self._stage = stage
+        if self.progress_callback is not None:
+            try:
+                self.progress_callback(stage, LOAD_STAGES[stage])
+            except Exception as e:
+                print(f"⚠️ NLP preload progress callback failed: {e}")
+    
+    def _load(self) -> None:
+        """Loader thread: build the hybrid pipeline, publish it, then set the ready event"""
         try:
             print("🔄 Loading NLP Pipeline in background...")
+            self._report('importing')
             from .hybrid_pipeline import HybridNLPPipeline
-            self._pipeline = HybridNLPPipeline(
+            self._report('loading_models')
+            pipeline = HybridNLPPipeline(
                 model_path=self.model_path,
-                relative_base=self.relative_base
+                relative_base=self.relative_base,
+                phobert_idle_minutes=self.idle_unload_minutes,
             )
+            stage = 'ready'
             print("✅ NLP Pipeline loaded successfully")
         except Exception as e:
             print(f"❌ Failed to load pipeline: {e}")
+            self._error = str(e)
             # Fallback to rule-based
-            from .pipeline import NLPPipeline
-            self._pipeline = NLPPipeline(relative_base=self.relative_base)
+            pipeline = self._rule_based()
+            stage = 'failed'
             print("⚠️ Using rule-based pipeline as fallback")
+        # Atomic switch: a call uses either the rule-based fallback or the finished pipeline
+        with self._lock:
+            self._pipeline = pipeline
+            self._fallback = None
+        self._load_seconds = time.perf_counter() - self._started_at
+        self._ready.set()
+        self._report(stage)
+    
+    def _rule_based(self):
+        """Rule-based pipeline answering while the hybrid one loads (created once)"""
+        fallback = self._fallback
+        if fallback is None:
+            with self._lock:
+                if self._pipeline is not None:
+                    return self._pipeline  # switched over meanwhile
+                if self._fallback is None:
+                    from .pipeline import NLPPipeline
+                    self._fallback = NLPPipeline(relative_base=self.relative_base)
+                fallback = self._fallback
+        return fallback
+    
+    def _ensure_loaded(self, timeout: Optional[float] = None) -> bool:
+        """Start the load if needed and wait until the pipeline is ready (True if it is)"""
+        if self._ready.is_set():
+            return True
+        self.start_preload()
+        return self._ready.wait(timeout)
+    
+    def _active(self):
+        """Pipeline answering this call: the loaded one, else rule-based or wait (serve_while_loading)"""
+        pipeline = self._pipeline
+        if pipeline is not None:
+            return pipeline
+        if self.serve_while_loading:
+            self.start_preload()
+            pipeline = self._pipeline
+            return pipeline if pipeline is not None else self._rule_based()
+        self._ensure_loaded()
+        return self._pipeline
+    
+    @property
+    def is_ready(self) -> bool:
+        """True once the background load has finished (hybrid, or rule-based after a failure)"""
+        return self._ready.is_set()
+    
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """Block until the pipeline is loaded (starts the load if needed); False on timeout"""
+        return self._ensure_loaded(timeout)
+    
+    def progress(self) -> Dict[str, Any]:
+        """
+        Load progress, for polling from the UI
+        
+        Returns:
+            {'stage', 'fraction', 'ready', 'elapsed_s', 'load_seconds', 'error'}
+        """
+        started = self._started_at
+        return {
+            'stage': self._stage,
+            'fraction': LOAD_STAGES[self._stage],
+            'ready': self._ready.is_set(),
+            'elapsed_s': time.perf_counter() - started if started is not None else 0.0,
+            'load_seconds': self._load_seconds,
+            'error': self._error,
+        }
     
     def process(self, text: str):
         """Process text (triggers load if needed)"""
-        self._ensure_loaded()
-        return self._pipeline.process(text)
+        return self._active().process(text)
     
     def extract(self, text: str):
         """Alias for process() for compatibility"""
@@ -71,33 +181,46 @@ class LazyLoadPipeline:
     
     def extract_event_with_time(self, text: str):
         """Extract event with time information"""
-        self._ensure_loaded()
-        if hasattr(self._pipeline, 'extract_event_with_time'):
-            return self._pipeline.extract_event_with_time(text)
-        return self.process(text)
+        pipeline = self._active()
+        if hasattr(pipeline, 'extract_event_with_time'):
+            return pipeline.extract_event_with_time(text)
+        return pipeline.process(text)
     
     def extract_location(self, text: str):
         """Extract location information"""
-        self._ensure_loaded()
-        if hasattr(self._pipeline, 'extract_location'):
-            return self._pipeline.extract_location(text)
-        return self.process(text).get('location')
+        pipeline = self._active()
+        if hasattr(pipeline, 'extract_location'):
+            return pipeline.extract_location(text)
+        return pipeline.process(text).get('location')
     
     def extract_reminder(self, text: str):
         """Extract reminder information"""
-        self._ensure_loaded()
-        if hasattr(self._pipeline, 'extract_reminder'):
-            return self._pipeline.extract_reminder(text)
-        return self.process(text).get('reminder_minutes')
+        pipeline = self._active()
+        if hasattr(pipeline, 'extract_reminder'):
+            return pipeline.extract_reminder(text)
+        return pipeline.process(text).get('reminder_minutes')
     
     def get_model_info(self) -> Dict[str, Any]:
-        """Get model information (triggers load if needed)"""
-        self._ensure_loaded()
-        if hasattr(self._pipeline, 'get_model_info'):
-            return self._pipeline.get_model_info()
+        """Get model information (does not wait for the load)"""
+        pipeline = self._pipeline
+        if pipeline is None:
+            self.start_preload()
+            return {'mode': 'Rule-based (hybrid loading)', 'loading': self.progress()}
+        if hasattr(pipeline, 'get_model_info'):
+            return pipeline.get_model_info()
         return {'mode': 'Rule-based (lazy loaded)'}
     
+    def memory_stats(self) -> Dict[str, Any]:
+        """RSS and PhoBERT load/unload counters (does not wait for the load)"""
+        pipeline = self._pipeline
+        if hasattr(pipeline, 'memory_stats'):
+            return pipeline.memory_stats()
+        return {'rss_mb': current_rss_mb(), 'idle_unload_minutes': self.idle_unload_minutes,
+                'loading': not self._ready.is_set()}
+    
     def __getattr__(self, name):
-        """Forward any other attribute access to the underlying pipeline"""
+        """Forward any other attribute access to the underlying pipeline (waits for the load)"""
+        if name.startswith('_'):
+            raise AttributeError(name)
         self._ensure_loaded()
         return getattr(self._pipeline, name)
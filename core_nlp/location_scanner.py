@@ -0,0 +1,241 @@
+"""
+Location Scanner - single-pass matcher for the known-location gazetteer
+Compiles KNOWN_LOCATION_PATTERNS once into a character trie and finds every
+candidate (span + priority) with one scan over the word starts of the text,
+instead of re.search-ing each pattern in turn.
+
+Matches exactly what re.search(pattern, text, re.IGNORECASE) returns on the
+lowercased text. Supported pattern syntax (all the gazetteer uses):
+    \b(?:alt|alt|...)\b   one group of alternatives per priority
+    \s*  \d+  [a-z]  \.    whitespace run, digit run, one letter, literal dot
+    x?                      optional character (greedy)
+"""
+from __future__ import annotations
+import re
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+# Common Vietnamese location names (cities, districts, venues), highest priority first
+# v1.0.7: Extracted from training_100k_comprehensive.json top locations
+# ENHANCED: Added many more location keywords to improve 24.8% detection rate
+KNOWN_LOCATION_PATTERNS = [
+    # Cities (highest priority - most specific)
+    r'\b(?:hà\s*nội|ha\s*noi|sài\s*gòn|sai\s*gon|đà\s*nẵng|da\s*nang|hải\s*phòng|hai\s*phong|cần\s*thơ|can\s*tho|hồ\s*chí\s*minh|ho\s*chi\s*minh)\b',
+    # Branded venues (specific names)
+    r'\b(?:30\s*shines|highlands?\s*coffee|starbucks?|kfc|lotteria|phúc\s*long|phuc\s*long|trung\s*nguyên|trung\s*nguyen|café|cafe)\b',
+    # Building components (specific)
+    r'\b(?:tầng\s*\d+|tang\s*\d+|toà\s*[a-z]|toa\s*[a-z]|khu\s*[a-z]|phòng\s*\d+|phong\s*\d+|lầu\s*\d+|lau\s*\d+)\b',
+    r'\b(?:quận\s*\d+|quan\s*\d+|phường\s*\d+|phuong\s*\d+|huyện\s*\d+|huyen\s*\d+)\b',
+    r'\b(?:ngõ\s*\d+|ngo\s*\d+|hẻm\s*\d+|hem\s*\d+|đường\s*\d+|duong\s*\d+)\b',
+    # Generic venues (lower priority - more ambiguous)
+    r'\b(?:rạp\s*chiếu\s*phim|rap\s*chieu\s*phim|cinema|lotte|cgv|galaxy)\b',
+    r'\b(?:trung\s*tâm\s*thương\s*mại|trung\s*tam\s*thuong\s*mai|mall|plaza|center|centre)\b',
+    r'\b(?:sân\s*bay|san\s*bay|ga\s*tàu|ga\s*tau|bến\s*xe|ben\s*xe|trạm\s*xe\s*buýt|tram\s*xe\s*buyt)\b',
+    r'\b(?:bệnh\s*viện|benh\s*vien|phòng\s*khám|phong\s*kham|nha\s*khoa|nha\s*khoa)\b',
+    r'\b(?:trường\s*học|truong\s*hoc|đại\s*học|dai\s*hoc|học\s*viện|hoc\s*vien|trường\s*đại\s*học|truong\s*dai\s*hoc)\b',
+    r'\b(?:thư\s*viện|thu\s*vien|thư\s*viện\s*tỉnh|thu\s*vien\s*tinh)\b',
+    r'\b(?:nhà\s*hàng|nha\s*hang|quán\s*ăn|quan\s*an|quán\s*cà\s*phê|quan\s*ca\s*phe|cafe|restaurant)\b',
+    r'\b(?:khách\s*sạn|khach\s*san|hotel|resort|homestay|nhà\s*nghỉ|nha\s*nghi)\b',
+    r'\b(?:công\s*viên|cong\s*vien|park|công\s*viên\s*thống\s*nhất|cong\s*vien\s*thong\s*nhat)\b',
+    r'\b(?:văn\s*phòng|van\s*phong|office|công\s*ty|cong\s*ty|company)\b',
+    r'\b(?:phòng\s*họp|phong\s*hop|meeting\s*room|conference\s*room)\b',
+    r'\b(?:giảng\s*đường|giang\s*duong|lecture\s*hall|lớp\s*học|lop\s*hoc|classroom)\b',
+    r'\b(?:siêu\s*thị|sieu\s*thi|market|vinmart|co\.op|coop)\b',
+    r'\b(?:bể\s*bơi|be\s*boi|pool|gym|hồ\s*bơi|ho\s*boi|fitness\s*center)\b',
+    r'\b(?:spa|salon|làm\s*đẹp|lam\s*dep|beauty\s*salon)\b',
+    r'\b(?:chợ|cho|market|traditional\s*market)\b',
+    r'\b(?:công\s*viên\s*thống\s*nhất|cong\s*vien\s*thong\s*nhat|thống\s*nhất|thong\s*nhat)\b',
+    r'\b(?:sông\s*hàn|song\s*han|cafe\s*sông\s*hàn|cafe\s*song\s*han)\b',
+    r'\b(?:hương\s*sen|huong\s*sen|café\s*hương\s*sen|cafe\s*huong\s*sen)\b',
+    r'\b(?:đà\s*nẵng|da\s*nang|lotte\s*cinema|lotte\s*cinema\s*đà\s*nẵng)\b',
+    # Additional common locations from training data
+    r'\b(?:villa|căn\s*hộ|can\s*ho|apartment|chung\s*cư|chung\s*cu)\b',
+    r'\b(?:trạm\s*xe\s*buýt|tram\s*xe\s*buyt|bus\s*station)\b',
+    r'\b(?:ga\s*tàu\s*xe\s*lửa|ga\s*tau\s*xe\s*lua|train\s*station)\b',
+    r'\b(?:cảng|cang|port|harbor)\b',
+    r'\b(?:sân\s*tennis|san\s*tennis|court)\b',
+    r'\b(?:sân\s*bóng|san\s*bong|stadium|field)\b',
+    r'\b(?:sân\s*bay\s*tân\s*sơn\s*nhất|san\s*bay\s*tan\s*son\s*nhat)\b',
+    r'\b(?:bệnh\s*viện\s*việt\s*đức|benh\s*vien\s*viet\s*duc)\b',
+    r'\b(?:trường\s*đại\s*học\s*bách\s*khoa|truong\s*dai\s*hoc\s*bach\s*khoa)\b',
+]
+
+# Verbs that turn a following venue into part of the event ("đi chợ", "ăn buffet", "khám bệnh viện")
+COMPOUND_EVENT_VERBS = (
+    'đi', 'di', 'ra', 'den', 'đến', 'toi', 'tới',
+    'ăn', 'an', 'uống', 'uong', 'mua', 'ban',
+    'xem', 'choi', 'chơi', 'tap', 'hoc', 'học',
+    'gap', 'gặp', 'tham', 'thăm', 'kham', 'khám',
+)
+_COMPOUND_PREFIX = r'\b(?:' + '|'.join(COMPOUND_EVENT_VERBS) + r')\s+'
+
+# Characters re.IGNORECASE treats as equal to an ASCII letter in lowercased text
+_IGNORECASE_FOLD = {'\u0131': 'i', '\u017f': 's'}  # dotless i, long s
+
+# Trie edge kinds besides literal characters
+_SPACE, _DIGITS, _ALPHA = r'\s*', r'\d+', '[a-z]'
+
+
+def _is_word(ch: str) -> bool:
+    """Same definition as \\w / \\b in Unicode re patterns."""
+    return ch.isalnum() or ch == '_'
+
+
+def _is_word_token(token: str) -> bool:
+    return token in (_DIGITS, _ALPHA) or (len(token) == 1 and _is_word(token))
+
+
+class LocationMatch(NamedTuple):
+    start: int
+    end: int
+    priority: int      # index in the pattern list (0 = highest)
+    alternative: int   # index of the alternative inside the pattern
+
+
+class _Node:
+    __slots__ = ('chars', 'space', 'digits', 'alpha', 'terms')
+
+    def __init__(self):
+        self.chars: Dict[str, '_Node'] = {}
+        self.space: Optional['_Node'] = None
+        self.digits: Optional['_Node'] = None
+        self.alpha: Optional['_Node'] = None
+        self.terms: List[Tuple[int, int]] = []  # (priority, alternative) ending here
+
+
+def _tokenize(alternative: str) -> List[List[str]]:
+    """Split one alternative into tokens; 'x?' expands to two variants (with x first)."""
+    variants: List[List[str]] = [[]]
+    i = 0
+    while i < len(alternative):
+        for special in (_SPACE, _DIGITS, _ALPHA, r'\.'):
+            if alternative.startswith(special, i):
+                token = '.' if special == r'\.' else special
+                i += len(special)
+                break
+        else:
+            token = alternative[i]
+            if token in '\\()[]|*+{}^$?':
+                raise ValueError(f"Unsupported pattern syntax at {alternative[i:]!r}")
+            i += 1
+        if i < len(alternative) and alternative[i] == '?':
+            i += 1
+            variants = [v + [token] for v in variants] + [list(v) for v in variants]
+        else:
+            for v in variants:
+                v.append(token)
+    return variants
+
+
+class LocationScanner:
+    """Trie over all gazetteer alternatives; scan() reports candidates in one pass."""
+
+    def __init__(self, patterns: Sequence[str] = KNOWN_LOCATION_PATTERNS):
+        self.patterns = list(patterns)
+        self._root = _Node()
+        for priority, pattern in enumerate(self.patterns):
+            if not (pattern.startswith(r'\b(?:') and pattern.endswith(r')\b')):
+                raise ValueError(f"Pattern must look like \\b(?:...)\\b: {pattern!r}")
+            for alt_index, alternative in enumerate(pattern[len(r'\b(?:'):-len(r')\b')].split('|')):
+                for tokens in _tokenize(alternative):
+                    self._insert(tokens, (priority, alt_index))
+
+    def _insert(self, tokens: List[str], term: Tuple[int, int]) -> None:
+        # Both \b anchors then only depend on the neighbouring characters
+        if not (tokens and _is_word_token(tokens[0]) and _is_word_token(tokens[-1])):
+            raise ValueError(f"Alternative must start and end with a word character: {tokens!r}")
+        node = self._root
+        for token in tokens:
+            if token == _SPACE:
+                node.space = node.space or _Node()
+                node = node.space
+            elif token == _DIGITS:
+                node.digits = node.digits or _Node()
+                node = node.digits
+            elif token == _ALPHA:
+                node.alpha = node.alpha or _Node()
+                node = node.alpha
+            else:
+                node = node.chars.setdefault(token, _Node())
+        node.terms.append(term)
+
+    @classmethod
+    @lru_cache(maxsize=None)
+    def default(cls) -> 'LocationScanner':
+        """Shared scanner for KNOWN_LOCATION_PATTERNS (built once per process)."""
+        return cls()
+
+    def scan(self, text: str) -> List[LocationMatch]:
+        """
+        All matches of every pattern alternative, ordered by start position.
+
+        Args:
+            text: Lowercased text
+
+        Returns:
+            LocationMatch list (at most one per alternative and start position)
+        """
+        matches: List[LocationMatch] = []
+        n = len(text)
+        folded = [_IGNORECASE_FOLD.get(ch, ch) for ch in text]
+        root_chars = self._root.chars
+        prev_word = False
+        for start in range(n):
+            is_word = _is_word(text[start])
+            if is_word and not prev_word and folded[start] in root_chars:
+                self._match_at(text, folded, start, matches)
+            prev_word = is_word
+        return matches
+
+    def _match_at(self, text: str, folded: List[str], start: int, out: List[LocationMatch]) -> None:
+        n = len(text)
+        found: Dict[Tuple[int, int], int] = {}
+        stack = [(self._root, start)]
+        while stack:
+            node, i = stack.pop()
+            if node.terms and (i == n or not _is_word(text[i])):
+                for term in node.terms:
+                    # Optional chars are greedy: keep the longest variant
+                    if found.get(term, -1) < i:
+                        found[term] = i
+            if i < n:
+                child = node.chars.get(folded[i])
+                if child is not None:
+                    stack.append((child, i + 1))
+                if node.alpha is not None and 'a' <= folded[i] <= 'z':
+                    stack.append((node.alpha, i + 1))
+                if node.digits is not None and text[i].isdecimal():
+                    j = i + 1
+                    while j < n and text[j].isdecimal():
+                        j += 1
+                    stack.append((node.digits, j))
+            if node.space is not None:
+                # Greedy \s*: the next token never matches whitespace, so backtracking never helps
+                j = i
+                while j < n and text[j].isspace():
+                    j += 1
+                stack.append((node.space, j))
+        for (priority, alternative), end in sorted(found.items()):
+            out.append(LocationMatch(start, end, priority, alternative))
+
+    def first_matches(self, text: str) -> List[LocationMatch]:
+        """
+        What re.search would return for each pattern: its leftmost match
+        (first alternative on ties), ordered by priority.
+        """
+        best: Dict[int, LocationMatch] = {}
+        for m in self.scan(text):
+            current = best.get(m.priority)
+            if current is None or (m.start == current.start and m.alternative < current.alternative):
+                best[m.priority] = m
+        return [best[p] for p in sorted(best)]
+
+
+@lru_cache(maxsize=1024)
+def _compound_event_regex(candidate: str) -> 're.Pattern[str]':
+    return re.compile(_COMPOUND_PREFIX + re.escape(candidate) + r'\b', re.IGNORECASE)
+
+
+def is_compound_event(text: str, candidate: str) -> bool:
+    """True if candidate follows a motion/activity verb in text ("đi chợ", "ăn buffet")."""
+    return _compound_event_regex(candidate).search(text) is not None
@@ -0,0 +1,147 @@
+"""
+Normalized Text - memoized normalization of NLP input strings
+Stages used to lowercase / strip diacritics / fix typo numbers on their own
+copy of the same string (pipeline, time parser, PhoBERT heuristics). A
+NormalizedText carries all forms at once:
+
+    raw      "Họp Sauh giờ chiều"   original input
+    lowered  "họp sauh giờ chiều"   raw.lower()            (same offsets as raw)
+    folded   "hop sau gio chieu"    lowercase, no diacritics, đ->d, typo numbers fixed
+
+plus an offset map from folded positions back to raw positions, so a span
+matched on the folded form is cut from the original text without
+re-normalizing (typo fixes and decomposed diacritics change the length).
+
+vn_fold() and NormalizedText.of() are memoized, so a string normalized by
+several stages is folded once. Only the PhoBERT heuristics pass one instance
+between their steps and map spans back through the offsets; the rule
+pipeline works on .lowered strings and normalizes the extracted time string
+separately (a cache hit when the time parser sees it again).
+"""
+from __future__ import annotations
+import unicodedata
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+# Typo number words: "sauh" -> "sau", "namh" -> "nam" (applied in this order)
+TYPO_NUMBER_MAP = {
+    'moth': 'mot', 'haih': 'hai', 'bah': 'ba', 'bonh': 'bon',
+    'tuh': 'tu', 'namh': 'nam', 'sauh': 'sau', 'bayh': 'bay',
+    'tamh': 'tam', 'chinh': 'chin', 'muoih': 'muoi'
+}
+
+
+@lru_cache(maxsize=4096)
+def vn_fold(s: str) -> str:
+    """Lowercase and remove Vietnamese diacritics for matching; map đ->d, fix typo numbers."""
+    if not s:
+        return ''
+    s = s.lower()
+    s = s.replace('đ', 'd').replace('Đ', 'D')
+    for typo, correct in TYPO_NUMBER_MAP.items():
+        s = s.replace(typo, correct)
+    nfkd = unicodedata.normalize('NFKD', s)
+    return ''.join(c for c in nfkd if not unicodedata.combining(c))
+
+
+class NormalizedText:
+    """Raw, lowercased and folded forms of one input, with a folded->raw offset map."""
+
+    __slots__ = ('raw', 'lowered', 'folded', '_offsets')
+
+    def __init__(self, raw: Optional[str]):
+        self.raw = raw or ''
+        self.lowered = self.raw.lower()
+        self.folded = vn_fold(self.raw)
+        # Offset map (starts, ends) is only needed for span mapping, built on first use.
+        # Instances are shared across threads (memoized), so both lists are published
+        # together as one tuple.
+        self._offsets: Optional[Tuple[List[int], List[int]]] = None
+
+    @classmethod
+    def of(cls, text) -> 'NormalizedText':
+        """NormalizedText for text (memoized); a NormalizedText is returned as is."""
+        if isinstance(text, cls):
+            return text
+        return _normalized(text or '')
+
+    def to_raw_span(self, start: int, end: int) -> Tuple[int, int]:
+        """
+        Map a [start, end) span of folded to the matching span of raw.
+
+        Returns:
+            (raw_start, raw_end); the end covers combining marks of the last character
+        """
+        offsets = self._offsets
+        if offsets is None:
+            offsets = self._build_offsets()
+        starts, ends = offsets
+        n = len(starts)
+        start = min(max(start, 0), n)
+        end = min(max(end, start), n)
+        raw_start = starts[start] if start < n else len(self.raw)
+        if end == start:
+            return raw_start, raw_start
+        return raw_start, ends[end - 1]
+
+    def raw_span(self, start: int, end: int) -> str:
+        """Substring of raw for a [start, end) span of folded"""
+        raw_start, raw_end = self.to_raw_span(start, end)
+        return self.raw[raw_start:raw_end]
+
+    def _build_offsets(self) -> Tuple[List[int], List[int]]:
+        """Replay vn_fold character by character, remembering where each char came from."""
+        raw = self.raw
+        if len(self.lowered) == len(raw):
+            chars = list(self.lowered)
+            sources = list(range(len(raw)))
+        else:
+            # Rare length-changing lowercase ("İ" -> "i̇"): every piece maps to its source char
+            chars, sources = [], []
+            for i, c in enumerate(raw):
+                for lc in c.lower():
+                    chars.append(lc)
+                    sources.append(i)
+        chars = ['d' if c == 'đ' else c for c in chars]
+
+        # Typo fixes only drop characters: replay str.replace per typo, in order
+        for typo, correct in TYPO_NUMBER_MAP.items():
+            s = ''.join(chars)
+            pos = s.find(typo)
+            if pos < 0:
+                continue
+            keep = [True] * len(chars)
+            while pos >= 0:
+                for k in range(pos + len(correct), pos + len(typo)):
+                    keep[k] = False
+                pos = s.find(typo, pos + len(typo))
+            chars = [c for c, k in zip(chars, keep) if k]
+            sources = [i for i, k in zip(sources, keep) if k]
+
+        # Canonical reordering only moves combining marks, which are dropped anyway,
+        # so decomposing per character gives the same folded text as the whole string
+        starts: List[int] = []
+        ends: List[int] = []
+        for c, i in zip(chars, sources):
+            emitted = False
+            for d in unicodedata.normalize('NFKD', c):
+                if not unicodedata.combining(d):
+                    starts.append(i)
+                    ends.append(i + 1)
+                    emitted = True
+            if not emitted and ends and ends[-1] == i:
+                # Standalone combining mark (decomposed input) belongs to the previous char
+                ends[-1] = i + 1
+        self._offsets = (starts, ends)
+        return self._offsets
+
+    def __bool__(self) -> bool:
+        return bool(self.raw)
+
+    def __repr__(self) -> str:
+        return f"NormalizedText({self.raw!r})"
+
+
+@lru_cache(maxsize=4096)
+def _normalized(text: str) -> NormalizedText:
+    return NormalizedText(text)
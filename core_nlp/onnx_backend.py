@@ -0,0 +1,140 @@
+"""
+ONNX Backend - onnxruntime inference for the fine-tuned PhoBERT classifier
+export_onnx() converts PhoBERTEventClassifier (encoder + event/time/location/
+reminder heads) to model.onnx next to its weights, with dynamic batch and
+sequence axes:
+
+    python scripts/export_onnx.py --model-path ./models/phobert_finetuned
+
+OnnxPhoBERTBackend runs that graph with onnxruntime on CPU (full graph
+optimizations, configurable intra-op threads) and gives the same head
+predictions as the torch classifier. It only needs onnxruntime, numpy and the
+transformers tokenizer, not torch. Select it with
+PhoBERTNLPPipeline(model_path=..., backend='onnx'); it serves
+extract_entities() / extract_entities_batch(), process() stays on the
+heuristics.
+"""
+from __future__ import annotations
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+try:
+    import numpy as np
+    import onnxruntime as ort
+    from transformers import AutoTokenizer
+    ONNX_AVAILABLE = True
+except ImportError:
+    ONNX_AVAILABLE = False
+
+from .phobert_model import CLASSIFIER_HEADS, PhoBERTEventExtractor
+
+ONNX_FILE = "model.onnx"
+
+# Tokenizer settings shared with the torch path (PhoBERTEventExtractor.extract_entities_batch)
+MAX_LENGTH = 256
+
+_OPTIMIZATION_LEVELS = ('disable', 'basic', 'extended', 'all')
+
+
+class OnnxPhoBERTBackend:
+    """PhoBERTEventClassifier head predictions from an exported ONNX graph (onnxruntime, CPU)."""
+
+    def __init__(self, model_path: str, onnx_file: Optional[str] = None, intra_op_threads: int = 0,
+                 optimization: str = 'all'):
+        """
+        Args:
+            model_path: Fine-tuned model directory (tokenizer files, model.onnx)
+            onnx_file: ONNX graph to run (default: model_path/model.onnx)
+            intra_op_threads: Threads per operator (0 = onnxruntime default, one per core)
+            optimization: Graph optimization level: 'disable', 'basic', 'extended' or 'all'
+        """
+        if not ONNX_AVAILABLE:
+            raise ImportError("onnxruntime required. Install: pip install onnxruntime")
+        if optimization not in _OPTIMIZATION_LEVELS:
+            raise ValueError(f"optimization must be one of {_OPTIMIZATION_LEVELS}, got {optimization!r}")
+        onnx_path = Path(onnx_file) if onnx_file else Path(model_path) / ONNX_FILE
+        if not onnx_path.exists():
+            raise FileNotFoundError(
+                f"{onnx_path} not found, export it first: python scripts/export_onnx.py --model-path {model_path}")
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = {
+            'disable': ort.GraphOptimizationLevel.ORT_DISABLE_ALL,
+            'basic': ort.GraphOptimizationLevel.ORT_ENABLE_BASIC,
+            'extended': ort.GraphOptimizationLevel.ORT_ENABLE_EXTENDED,
+            'all': ort.GraphOptimizationLevel.ORT_ENABLE_ALL,
+        }[optimization]
+        options.intra_op_num_threads = intra_op_threads
+        self.session = ort.InferenceSession(str(onnx_path), sess_options=options,
+                                            providers=['CPUExecutionProvider'])
+        self.tokenizer = AutoTokenizer.from_pretrained(model_path)
+        self.onnx_path = onnx_path
+
+    def logits(self, texts: Sequence[str]) -> Dict[str, Any]:
+        """Logits per head, numpy arrays of shape [len(texts), 2] (one padded batch)"""
+        encoded = self.tokenizer(list(texts), return_tensors='np', padding=True, truncation=True,
+                                 max_length=MAX_LENGTH)
+        outputs = self.session.run(list(CLASSIFIER_HEADS), {
+            'input_ids': encoded['input_ids'].astype(np.int64),
+            'attention_mask': encoded['attention_mask'].astype(np.int64),
+        })
+        return dict(zip(CLASSIFIER_HEADS, outputs))
+
+    def predict(self, texts: Sequence[str]) -> Dict[str, List[bool]]:
+        """has_<head> per text, same as argmax == 1 of the torch classifier"""
+        return {head: (values.argmax(axis=1) == 1).tolist() for head, values in self.logits(texts).items()}
+
+
+def export_onnx(model_path: str, output: Optional[str] = None, opset: int = 14) -> Path:
+    """
+    Export the fine-tuned classifier of model_path to ONNX
+
+    Args:
+        model_path: Fine-tuned model directory (weights + tokenizer)
+        output: Target file (default: model_path/model.onnx)
+        opset: ONNX opset version
+
+    Returns:
+        Path of the exported graph
+    """
+    import torch
+
+    extractor = PhoBERTEventExtractor(model_path=model_path, device='cpu', cache_size=0)
+    if extractor.classifier is None:
+        raise FileNotFoundError(f"No fine-tuned classifier (encoder/ + heads.safetensors, or model.pt) in {model_path}")
+
+    class _HeadsAsTuple(torch.nn.Module):
+        """ONNX outputs are positional: the classifier's dict as a tuple in CLASSIFIER_HEADS order"""
+
+        def __init__(self, classifier):
+            super().__init__()
+            self.classifier = classifier
+
+        def forward(self, input_ids, attention_mask):
+            outputs = self.classifier(input_ids, attention_mask)
+            return tuple(outputs[head] for head in CLASSIFIER_HEADS)
+
+    # Two sentences of different length, so neither axis is traced as a constant
+    sample = extractor.tokenizer(["họp nhóm lúc 10h sáng mai ở phòng 302", "đi chợ"], return_tensors='pt',
+                                 padding=True, truncation=True, max_length=MAX_LENGTH)
+    output_path = Path(output) if output else Path(model_path) / ONNX_FILE
+    dynamic_axes = {
+        'input_ids': {0: 'batch', 1: 'sequence'},
+        'attention_mask': {0: 'batch', 1: 'sequence'},
+    }
+    dynamic_axes.update({head: {0: 'batch'} for head in CLASSIFIER_HEADS})
+
+    print(f"📦 Exporting PhoBERT classifier to {output_path} (opset {opset})...")
+    with torch.no_grad():
+        torch.onnx.export(
+            _HeadsAsTuple(extractor.classifier).eval(),
+            (sample['input_ids'], sample['attention_mask']),
+            str(output_path),
+            input_names=['input_ids', 'attention_mask'],
+            output_names=list(CLASSIFIER_HEADS),
+            dynamic_axes=dynamic_axes,
+            opset_version=opset,
+            do_constant_folding=True,
+        )
+    print(f"✅ Exported: {output_path} ({output_path.stat().st_size / 2**20:.1f} MB)")
+    return output_path
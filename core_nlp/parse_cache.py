@@ -0,0 +1,126 @@
+"""
+Parse Cache - bounded LRU cache for NLP extraction results
+Memory tier: OrderedDict LRU (thread-safe) with hit/miss counters.
+Optional second tier: SQLite file, so repeated commands stay cheap across restarts.
+
+Only base-independent extraction results (event name, time string, location,
+reminder) are cached. Resolving the time string against the relative base is
+re-done on every call: results like "9h" (rolls over to tomorrow once 9:00 has
+passed) or "mai" (keeps the base clock) depend on the base down to the minute,
+so a key on the base day/hour would return stale times. (The time parser memoizes
+its own text analysis per base day and resolves it against the exact base on
+every call, see time_parser._plan.)
+"""
+from __future__ import annotations
+import json
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+# Bump when extraction rules change so persisted entries are ignored
+CACHE_VERSION = 2
+
+
+class ParseCache:
+    """Bounded LRU cache with an optional persistent SQLite tier."""
+
+    def __init__(self, maxsize: int = 1024, db_path: Optional[str] = None, namespace: str = 'rule'):
+        """
+        Args:
+            maxsize: Max entries kept in memory (least recently used are evicted)
+            db_path: SQLite file for the persistent tier (None = memory only)
+            namespace: Separates pipelines sharing one db_path (values differ per pipeline)
+        """
+        self.maxsize = maxsize
+        self.namespace = namespace
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self._data: 'OrderedDict[str, Any]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False, timeout=5.0)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS parse_cache ("
+                "namespace TEXT NOT NULL, key TEXT NOT NULL, version INTEGER NOT NULL, "
+                "value TEXT NOT NULL, PRIMARY KEY (namespace, key))"
+            )
+            self._db.commit()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Cached value for key, or None. Values must be treated as read-only."""
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return value
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT value FROM parse_cache WHERE namespace=? AND key=? AND version=?",
+                    (self.namespace, key, CACHE_VERSION)
+                ).fetchone()
+                if row is not None:
+                    value = json.loads(row[0])
+                    self._store(key, value)
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return value
+            self.misses += 1
+            return None
+
+    def put(self, key: str, value: Any) -> None:
+        """Store a JSON-serializable value."""
+        with self._lock:
+            self._store(key, value)
+            if self._db is not None:
+                try:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO parse_cache (namespace, key, version, value) VALUES (?, ?, ?, ?)",
+                        (self.namespace, key, CACHE_VERSION, json.dumps(value, ensure_ascii=False))
+                    )
+                    self._db.commit()
+                except sqlite3.Error as e:
+                    print(f"⚠️ Parse cache write failed: {e}")
+
+    def _store(self, key: str, value: Any) -> None:
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self, persistent: bool = False) -> None:
+        """Drop memory entries (and the persisted ones of this namespace if persistent=True)."""
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = self.disk_hits = 0
+            if persistent and self._db is not None:
+                self._db.execute("DELETE FROM parse_cache WHERE namespace=?", (self.namespace,))
+                self._db.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current size."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'disk_hits': self.disk_hits,
+                'hit_rate': self.hits / total if total else 0.0,
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'persistent': self._db is not None,
+            }
+
+    def __len__(self) -> int:
+        return len(self._data)
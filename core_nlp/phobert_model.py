@@ -4,8 +4,12 @@ Replaces rule-based regex system with transformer-based approach
 """
 from __future__ import annotations
 import json
+import os
 import re
-from typing import Dict, Any, Optional, List, Tuple
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator, Optional, List, Tuple
 from datetime import datetime
 from pathlib import Path
 
@@ -19,6 +23,38 @@ except ImportError as e:
     pass
 
 from .time_parser import parse_vietnamese_time_range
+from .parse_cache import ParseCache
+from .normalized_text import NormalizedText
+from .heuristic_patterns import HeuristicPatterns, EVENT_TRAILING_FRAGMENTS
+from .inference_queue import InferenceQueue
+from .process_memory import release_memory
+
+# quantize= options of PhoBERTEventExtractor (None = fp32)
+QUANTIZE_MODES = (None, 'int8')
+
+# backend= options: 'torch' or 'onnx' (model.onnx via onnxruntime, see onnx_backend)
+BACKENDS = ('torch', 'onnx')
+
+# Output heads of PhoBERTEventClassifier (phobert_trainer), in ONNX output order
+CLASSIFIER_HEADS = ('event', 'time', 'location', 'reminder')
+
+# Dynamically quantized module cached next to the weights it was made from
+QUANTIZED_FILE = "model.int8.pt"
+BASE_QUANTIZED_PATH = Path("./models/phobert_base.int8.pt")
+
+
+def _source_fingerprint(*sources: str | Path) -> str:
+    """Identity of the fp32 weights (file sizes + mtimes, or the hub name) and the torch version"""
+    parts = []
+    for source in sources:
+        path = Path(source)
+        if path.exists():
+            files = sorted(path.iterdir()) if path.is_dir() else [path]
+            parts += [f"{f.name}:{f.stat().st_size}:{f.stat().st_mtime_ns}" for f in files
+                      if f.is_file() and f.name != QUANTIZED_FILE]
+        else:
+            parts.append(str(source))
+    return f"torch {torch.__version__}|" + "|".join(parts)
 
 
 class PhoBERTEventExtractor:
@@ -27,7 +63,9 @@ class PhoBERTEventExtractor:
     Extracts: event name, time, location, reminder
     """
     
-    def __init__(self, model_path: Optional[str] = None, device: str = 'cpu', fallback_mode: bool = False):
+    def __init__(self, model_path: Optional[str] = None, device: str = 'cpu', fallback_mode: bool = False,
+                 cache_size: int = 1024, max_batch: int = 1, max_wait_ms: float = 5.0,
+                 quantize: Optional[str] = None, backend: str = 'torch', onnx_threads: int = 0):
         """
         Initialize PhoBERT model
         
@@ -35,7 +73,43 @@ class PhoBERTEventExtractor:
             model_path: Path to fine-tuned model (if None, uses base PhoBERT)
             device: 'cpu' or 'cuda'
             fallback_mode: If True, allow initialization without transformers (rule-based only)
+            cache_size: Extraction results kept in the LRU parse cache (0 = disabled)
+            max_batch: > 1 = extract_entities() calls from concurrent threads share forward
+                passes of up to max_batch sentences (InferenceQueue)
+            max_wait_ms: Longest time a sentence waits for others to join its batch
+            quantize: 'int8' = dynamic INT8 quantization of the Linear layers (encoder and
+                heads) for CPU inference, cached on disk (model.int8.pt); None = fp32
+            backend: 'torch', or 'onnx' = run the exported model_path/model.onnx with
+                onnxruntime on CPU (OnnxPhoBERTBackend, torch not needed)
+            onnx_threads: Intra-op threads of the onnxruntime session (0 = one per core)
         """
+        if quantize not in QUANTIZE_MODES:
+            raise ValueError(f"quantize must be one of {QUANTIZE_MODES}, got {quantize!r}")
+        if backend not in BACKENDS:
+            raise ValueError(f"backend must be one of {BACKENDS}, got {backend!r}")
+        self._cache = ParseCache(cache_size, namespace='phobert') if cache_size > 0 else None
+        self.max_batch = max_batch
+        self.max_wait_ms = max_wait_ms
+        self._queue: Optional[InferenceQueue] = None
+        self._queue_lock = threading.Lock()
+        self._closed = False
+        self.onnx = None
+        
+        if backend == 'onnx' and not fallback_mode:
+            if not model_path:
+                raise ValueError("backend='onnx' needs the model_path of an exported fine-tuned model")
+            from .onnx_backend import OnnxPhoBERTBackend
+            print(f"🔄 Loading ONNX PhoBERT from {model_path}...")
+            self.onnx = OnnxPhoBERTBackend(model_path, intra_op_threads=onnx_threads)
+            self.tokenizer = self.onnx.tokenizer
+            self.model = None
+            self.classifier = None
+            self.device = 'cpu'
+            self.model_path = model_path
+            self.quantize = None
+            print(f"✅ Loaded ONNX PhoBERT model ({self.onnx.onnx_path.name}, onnxruntime)")
+            return
+        
         if not TRANSFORMERS_AVAILABLE and not fallback_mode:
             raise ImportError("transformers library required. Install: pip install transformers torch")
         
@@ -50,26 +124,48 @@ class PhoBERTEventExtractor:
         
         self.device = device
         self.model_path = model_path
+        self.quantize = quantize
+        if quantize and device != 'cpu':
+            print(f"⚠️ Dynamic {quantize} quantization is CPU-only, using fp32 on {device}")
+            self.quantize = None
         
-        # Check if this is a fine-tuned model with .pt file
+        # Check if this is a fine-tuned model (self-contained directory, or legacy .pt file)
         if model_path and Path(model_path).exists():
+            # Load from phobert_trainer format
+            from .phobert_trainer import PhoBERTEventClassifier, ENCODER_DIR, HEADS_FILE
             model_pt = Path(model_path) / "model.pt"
-            if model_pt.exists():
+            self_contained = PhoBERTEventClassifier.is_pretrained(model_path)
+            if self_contained or model_pt.exists():
                 print(f"🔄 Loading fine-tuned PhoBERT from {model_path}...")
-                # Load from phobert_trainer format
-                from .phobert_trainer import PhoBERTEventClassifier
                 
-                # Load base model and tokenizer
+                # Load tokenizer (and the quantized classifier if cached)
                 self.tokenizer = AutoTokenizer.from_pretrained(model_path)
-                phobert_base = AutoModel.from_pretrained("vinai/phobert-base")
+                quantized_file = Path(model_path) / QUANTIZED_FILE
+                # Encoder and heads: retraining either one invalidates the int8 cache
+                weights = ([Path(model_path) / ENCODER_DIR, Path(model_path) / HEADS_FILE]
+                           if self_contained else [model_pt])
+                fingerprint = _source_fingerprint(*weights) if self.quantize else None
+                self.classifier = self._load_quantized(quantized_file, fingerprint) if self.quantize else None
                 
-                # Create classifier and load weights
-                self.classifier = PhoBERTEventClassifier(phobert_base)
-                self.classifier.load_state_dict(torch.load(model_pt, map_location=device))
-                self.classifier.to(self.device)
-                self.classifier.eval()
+                if self.classifier is None and self_contained:
+                    # Offline, memory-mapped safetensors, weights read once
+                    self.classifier = PhoBERTEventClassifier.from_pretrained(model_path, device=self.device)
+                    if self.quantize:
+                        self.classifier = self._quantize_int8(self.classifier, quantized_file, fingerprint)
+                elif self.classifier is None:
+                    # Legacy state dict: needs the phobert-base skeleton (Hub cache or network)
+                    print("⚠️ model.pt needs vinai/phobert-base, convert it: python scripts/convert_phobert_model.py")
+                    phobert_base = AutoModel.from_pretrained("vinai/phobert-base")
+                    
+                    # Create classifier and load weights
+                    self.classifier = PhoBERTEventClassifier(phobert_base)
+                    self.classifier.load_state_dict(torch.load(model_pt, map_location=device))
+                    self.classifier.to(self.device)
+                    self.classifier.eval()
+                    if self.quantize:
+                        self.classifier = self._quantize_int8(self.classifier, quantized_file, fingerprint)
                 
-                print("✅ Loaded fine-tuned PhoBERT model")
+                print(f"✅ Loaded fine-tuned PhoBERT model ({self.quantize or 'fp32'})")
                 return
         
         # Fallback to base PhoBERT
@@ -83,17 +179,62 @@ class PhoBERTEventExtractor:
             base_source = "vinai/phobert-base"
 
         self.tokenizer = AutoTokenizer.from_pretrained(base_source)
-        self.model = AutoModel.from_pretrained(base_source)
-        self.model.to(self.device)
-        self.model.eval()
+        fingerprint = _source_fingerprint(base_source) if self.quantize else None
+        self.model = self._load_quantized(BASE_QUANTIZED_PATH, fingerprint) if self.quantize else None
+        if self.model is None:
+            self.model = AutoModel.from_pretrained(base_source)
+            self.model.to(self.device)
+            self.model.eval()
+            if self.quantize:
+                self.model = self._quantize_int8(self.model, BASE_QUANTIZED_PATH, fingerprint)
         self.classifier = None  # No fine-tuned classifier
         
-        print("✅ PhoBERT model loaded successfully")
+        print(f"✅ PhoBERT model loaded successfully ({self.quantize or 'fp32'})")
+    
+    @staticmethod
+    def _quantize_int8(module: Any, cache_file: Path, fingerprint: str) -> Any:
+        """
+        Dynamic INT8 quantization of every Linear layer (weights int8, activations
+        quantized on the fly), saved to cache_file so later starts skip it
+        """
+        print("🔧 Quantizing PhoBERT Linear layers to int8...")
+        quantized = torch.quantization.quantize_dynamic(module, {torch.nn.Linear}, dtype=torch.qint8)
+        quantized.eval()
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = cache_file.with_name(cache_file.name + '.tmp')
+            torch.save({'fingerprint': fingerprint, 'module': quantized}, tmp_file)
+            os.replace(tmp_file, cache_file)
+            print(f"💾 Cached quantized model: {cache_file}")
+        except Exception as e:
+            print(f"⚠️ Could not cache quantized model: {e}")
+        return quantized
+    
+    @staticmethod
+    def _load_quantized(cache_file: Path, fingerprint: str) -> Optional[Any]:
+        """Quantized module from cache_file, or None if missing, unreadable or made from other weights"""
+        if not cache_file.exists():
+            return None
+        try:
+            # Whole pickled module (written by _quantize_int8, same trust as the weights next to it)
+            saved = torch.load(cache_file, map_location='cpu', weights_only=False)
+        except Exception as e:
+            print(f"⚠️ Ignoring quantized model cache {cache_file}: {e}")
+            return None
+        if not isinstance(saved, dict) or saved.get('fingerprint') != fingerprint:
+            return None
+        module = saved['module']
+        module.eval()
+        print(f"⚡ Loaded cached int8 model: {cache_file}")
+        return module
     
     def extract_entities(self, text: str) -> Dict[str, Any]:
         """
         Extract entities from text using PhoBERT
         
+        With max_batch > 1 the sentence joins the forward pass of other
+        concurrent calls (see InferenceQueue); the result is the same.
+        
         Args:
             text: Input Vietnamese text
             
@@ -102,66 +243,123 @@ class PhoBERTEventExtractor:
         """
         if not text:
             return self._empty_result()
+        queue = self._inference_queue() if self.max_batch > 1 else None
+        if queue is not None:
+            return queue.submit(text).result()
+        return self.extract_entities_batch([text])[0]
+    
+    def extract_entities_batch(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """
+        Extract entities from many texts with one forward pass
         
-        # Tokenize input
-        inputs = self.tokenizer(
-            text,
-            return_tensors="pt",
-            padding=True,
-            truncation=True,
-            max_length=256
-        ).to(self.device)
+        The batch is padded to its longest sentence; the attention mask keeps
+        padding out of every sentence's representation.
         
-        # Use fine-tuned classifier if available
-        if hasattr(self, 'classifier') and self.classifier is not None:
-            with torch.no_grad():
-                outputs = self.classifier(inputs['input_ids'], inputs['attention_mask'])
-                
-                # Get predictions
-                has_event = torch.argmax(outputs['event'], dim=1).item() == 1
-                has_time = torch.argmax(outputs['time'], dim=1).item() == 1
-                has_location = torch.argmax(outputs['location'], dim=1).item() == 1
-                has_reminder = torch.argmax(outputs['reminder'], dim=1).item() == 1
-                
-                # Extract based on predictions using time_parser for better accuracy
-                from .time_parser import parse_vietnamese_datetime
-                
-                result = {
-                    'event_name': None,
-                    'time_str': None,
-                    'location': None,
-                    'reminder_minutes': 0
-                }
+        Args:
+            texts: Input Vietnamese texts
+            
+        Returns:
+            One dict per text (same keys as extract_entities), in order
+        """
+        results = [self._empty_result() for _ in texts]
+        active = [i for i, text in enumerate(texts) if text]
+        if not active:
+            return results
+        batch = [texts[i] for i in active]
+        
+        if self.tokenizer is None:
+            # Last resort: pure heuristics
+            for i in active:
+                results[i] = self._extract_with_heuristics(texts[i])
+            return results
+        
+        # Use fine-tuned classifier if available (torch or ONNX)
+        predicted = self._predict_heads(batch)
+        if predicted is not None:
+            for row, i in enumerate(active):
+                text = texts[i]
+                result = self._empty_result()
                 
                 # Extract time using sophisticated time_parser
-                if has_time:
+                if predicted['time'][row]:
                     result['time_str'] = self._extract_time_heuristic(text)
                 
                 # Extract location
-                if has_location:
+                if predicted['location'][row]:
                     result['location'] = self._extract_location_heuristic(text)
                 
                 # Extract reminder
-                if has_reminder:
+                if predicted['reminder'][row]:
                     result['reminder_minutes'] = self._extract_reminder(text)
                 
                 # Extract event name by removing extracted components
-                if has_event:
+                if predicted['event'][row]:
                     result['event_name'] = self._extract_event_name(text, result)
                 
-                return result
+                results[i] = result
+            return results
         
         # Fallback: use base model embeddings
+        if getattr(self, 'model', None) is None:
+            for i in active:
+                results[i] = self._extract_with_heuristics(texts[i])
+            return results
+        inputs = self._tokenize(batch)
         with torch.no_grad():
-            if hasattr(self, 'model'):
-                outputs = self.model(**inputs)
-                embeddings = outputs.last_hidden_state  # [batch, seq_len, hidden_size]
-                entities = self._extract_with_embeddings(text, embeddings)
-            else:
-                # Last resort: pure heuristics
-                entities = self._extract_with_heuristics(text)
-        
-        return entities
+            outputs = self.model(**inputs)
+            embeddings = outputs.last_hidden_state  # [batch, seq_len, hidden_size]
+        for row, i in enumerate(active):
+            results[i] = self._extract_with_embeddings(texts[i], embeddings[row:row + 1])
+        return results
+    
+    def _tokenize(self, batch: List[str]) -> Any:
+        """Torch input tensors for batch, padded to its longest sentence"""
+        return self.tokenizer(
+            batch,
+            return_tensors="pt",
+            padding=True,
+            truncation=True,
+            max_length=256
+        ).to(self.device)
+    
+    def _predict_heads(self, batch: List[str]) -> Optional[Dict[str, List[bool]]]:
+        """
+        Fine-tuned classifier decisions per head (CLASSIFIER_HEADS), one bool per
+        sentence; None when only the base model is loaded
+        """
+        if self.onnx is not None:
+            return self.onnx.predict(batch)
+        if self.classifier is None:
+            return None
+        inputs = self._tokenize(batch)
+        with torch.no_grad():
+            outputs = self.classifier(inputs['input_ids'], inputs['attention_mask'])
+        return {head: (torch.argmax(outputs[head], dim=1) == 1).tolist() for head in CLASSIFIER_HEADS}
+    
+    def _inference_queue(self) -> Optional[InferenceQueue]:
+        """Micro-batching queue of extract_entities (started on first use; None after close())"""
+        if self._queue is None:
+            with self._queue_lock:
+                if self._queue is None and not self._closed:
+                    self._queue = InferenceQueue(
+                        self.extract_entities_batch,
+                        max_batch=self.max_batch,
+                        max_wait_ms=self.max_wait_ms,
+                        name='phobert-batcher',
+                    )
+        return self._queue
+    
+    def batching_stats(self) -> Dict[str, Any]:
+        """Batch-size and queue-wait histograms of the inference queue ({} if batching is off)"""
+        return self._queue.stats() if self._queue is not None else {}
+    
+    def close(self) -> None:
+        """Stop the inference queue (if started), after the sentences already queued; no new queue after this"""
+        with self._queue_lock:
+            self._closed = True
+            queue, self._queue = self._queue, None
+        if queue is not None:
+            queue.close()
     
     def _extract_with_embeddings(self, text: str, embeddings: torch.Tensor) -> Dict[str, Any]:
         """
@@ -193,130 +391,33 @@ class PhoBERTEventExtractor:
         
         return result
     
-    def _extract_time_heuristic(self, text: str) -> Optional[str]:
+    def _extract_time_heuristic(self, text: str | NormalizedText) -> Optional[str]:
         """Simple heuristic time extraction - returns time string"""
         if not text:
             return None
         
-        # Normalize for matching (but return original text)
-        import unicodedata
-        def normalize(s):
-            s = s.lower()
-            s = s.replace('đ', 'd')
-            
-            # Fix typo numbers: "sauh" -> "sau", "namh" -> "nam", etc.
-            typo_map = {
-                'moth': 'mot', 'haih': 'hai', 'bah': 'ba', 'bonh': 'bon', 
-                'tuh': 'tu', 'namh': 'nam', 'sauh': 'sau', 'bayh': 'bay', 
-                'tamh': 'tam', 'chinh': 'chin', 'muoih': 'muoi'
-            }
-            for typo, correct in typo_map.items():
-                s = s.replace(typo, correct)
-            
-            nfkd = unicodedata.normalize('NFKD', s)
-            return ''.join(c for c in nfkd if not unicodedata.combining(c))
-        
-        text_norm = normalize(text)
-        
-        # Time patterns (comprehensive Vietnamese time expressions)
-        # Order matters: more specific patterns first
-        # NOTE: These patterns match against NORMALIZED text (no diacritics: ô→o, ư→u, đ→d, etc.)
-        time_patterns = [
-            # PRIORITY 0: Time ranges (MUST be FIRST to capture full range)
-            # "từ 9h đến 11h sáng mai", "9h-11h", "9h đến 11h"
-            # Allow period (sang/chieu/toi) and relative (mai/hom nay/etc) AFTER range
-            # FIXED: Use (?:\d{2})? instead of \d{0,2} to avoid catastrophic backtracking
-            r'(?:tu\s+)?\d{1,2}\s*(?:h|gio|:)(?:\d{2})?\s*(?:den|-|–)\s*\d{1,2}\s*(?:h|gio|:)(?:\d{2})?\s*(?:sang|trua|chieu|toi|dem)?\s*(?:mai|hom\s+nay|ngay\s+mai|ngay\s+kia)?',
-            
-            # PRIORITY 1: Number words + period + weekday (REVERSED ORDER)
-            # "muoi gio sang chu nhat" → Must come FIRST
-            r'(?:mot|hai|ba|bon|tu|nam|sau|bay|tam|chin|muoi|mươi)\s+gio\s*(?:sang|trua|chieu|toi|dem)?\s*(?:chu\s+nhat|cn)',
-            r'(?:mot|hai|ba|bon|tu|nam|sau|bay|tam|chin|muoi|mươi)\s+gio\s*(?:sang|trua|chieu|toi|dem)?\s*(?:thu[s]?|t)\s*(?:\d+|hai|ba|tu|nam|sau|bay)',
-            
-            # PRIORITY 2: Weekday + number words + period
-            # "chu nhat sauh gio chieu"
-            r'(?:chu\s+nhat|cn)\s+(?:mot|hai|ba|bon|tu|nam|sau|bay|tam|chin|muoi)\s+gio\s*(?:sang|trua|chieu|toi|dem)',
-            r'(?:thu[s]?|t)\s*(?:\d+|hai|ba|tu|nam|sau|bay)\s+(?:mot|hai|ba|bon|tu|nam|sau|bay|tam|chin|muoi)\s+gio\s*(?:sang|trua|chieu|toi|dem)',
-            
-            # PRIORITY 3: Weekday + period + hour (REVERSED ORDER)
-            # "thứ 5 chiều 3h"
-            r'(?:chu\s+nhat|cn)\s+(?:sang|trua|chieu|toi|dem)\s+\d{1,2}\s*(?:h|gio)',
-            r'(?:thu[s]?|t)\s*(?:\d+|hai|ba|tu|nam|sau|bay)\s+(?:sang|trua|chieu|toi|dem)\s+\d{1,2}\s*(?:h|gio)',
-            
-            # PRIORITY 4: Weekday + time + period
-            # "t5 8h sang", "thứ 3 10h sáng", "cn 6h chiều"
-            r'(?:chu\s+nhat|cn)\s+\d{1,2}\s*(?:h|gio|:)\s*\d{0,2}\s*(?:sang|trua|chieu|toi|dem)',
-            r'(?:thu[s]?|t)\s*(?:\d+|hai|ba|tu|nam|sau|bay)\s+\d{1,2}\s*(?:h|gio|:)\s*\d{0,2}\s*(?:sang|trua|chieu|toi|dem)',
-            # Weekday + time (without period)
-            r'(?:chu\s+nhat|cn)\s+\d{1,2}\s*(?:h|gio|:)',
-            r'(?:thu[s]?|t)\s*(?:\d+|hai|ba|tu|nam|sau|bay)\s+\d{1,2}\s*(?:h|gio|:)',
-            # Date + time + period: hôm nay 6h chiều, mai 10h sáng, ngày kia 8h tối
-            # MUST come before simple "date + time" to capture period
-            r'(?:hom\s+nay|ngay\s+mai|mai|ngay\s+kia)\s+\d{1,2}\s*(?:h|gio)\s*(?:\d{1,2}\s*(?:phut))?\s*(?:sang|trua|chieu|toi|dem)',
-            # Period + date combo: tối mai, sáng mai, chiều mai, đêm nay, tối nay
-            # BUT NOT "toi" alone (which could be "tôi" = I/me)
-            r'(?:toi|sang|chieu|trua|dem)\s+(?:mai|hom\s+nay|nay|ngay\s+kia)',
-            # Time with typo period: 7h sang, 6h toi (without diacritics)
-            # Use word boundary to avoid matching "toi co" (tôi có = I have)
-            r'\d{1,2}\s*h\s+(?:sang|chieu|trua|dem)\b',
-            r'\d{1,2}\s*h\s+toi(?:\s+nay|\s+mai)?\b',  # "6h tối" or "6h tối nay" but not "6h tôi"
-            # Time + date format DD.MM.YYYY or DD/MM/YYYY or DD-MM-YYYY
-            # Handles: "9h ngày 20.10", "9h vào 20.10", "9h tới ngày 20.10"
-            r'\d{1,2}\s*(?:h|gio|:|)\s*\d{0,2}\s*(?:vao|toi|den)?\s*(?:ngay\s+)?\d{1,2}[\.\-/]\d{1,2}(?:[\.\-/]\d{4})?',
-            # "lúc" + time: lúc 12 giờ, lúc 10h sáng
-            r'luc\s+\d{1,2}\s*(?:h|gio)\s*(?:\d{1,2}\s*(?:phut))?\s*(?:sang|trua|chieu|toi|dem)?',
-            # Time + weekday + week: 9:00 cn tuần sau, 10h t2 tuần sau
-            r'\d{1,2}\s*(?::|h|gio)\s*\d{0,2}\s*(?:cn|thu|t)\s*\d*\s*(?:tuan\s+sau)?',
-            # Time + date complex: 14h ngày 6 tháng 12
-            r'\d{1,2}\s*(?:h|gio)\s+ngay\s+\d{1,2}\s+thang\s+\d{1,2}',
-            # Combined: time + period + date
-            r'\d{1,2}(?:h\d{2}|:\d{2}|h)\s*(?:sang|trua|chieu|toi|dem)?\s*(?:hom\s+nay|ngay\s+mai|mai|ngay\s+kia|thu\s+\d|cn)',
-            # Time with date: 8:30 ngày mai, 10h ngày mai, 12 giờ hôm nay, 17h30 hôm nay
-            r'\d{1,2}\s*(?:h\d{2}|gio|:\d{2})\s+(?:hom\s+nay|ngay\s+mai|mai|ngay\s+kia)',
-            # Number words: hai giờ chiều, một giờ trưa
-            r'(?:mot|hai|ba|bon|nam|sau|bay|tam|chin|muoi|muoi\s+mot|muoi\s+hai)\s+gio\s*(?:sang|trua|chieu|toi|dem)?',
-            # Time with period: 10h sáng, 2h chiều, 12 giờ hôm nay
-            r'\d{1,2}\s*(?:h|gio)\s*(?:\d{1,2}\s*(?:phut))?\s*(?:sang|trua|chieu|toi|dem)',
-            # Time with weekday: 10h thứ 2, 14h CN
-            r'\d{1,2}\s*(?:h|gio)\s*(?:thu|t)?\s*\d|CN',
-            # Simple time: 10h, 10:30, 10 giờ 30, 12 giờ
-            r'\d{1,2}\s*(?:h|:\d{2}|gio(?:\s*\d{1,2}\s*(?:phut)?)?)',
-            # Rưỡi: 10h rưỡi
-            r'\d{1,2}\s*(?:h|gio)\s*ruoi',
-            # Kém: 10h kém 15
-            r'\d{1,2}\s*(?:h|gio)\s*kem\s*\d{1,2}',
-            # Time range: 10h-12h
-            r'\d{1,2}(?:h|:\d{2})?\s*[-–]\s*\d{1,2}(?:h|:\d{2})?',
-            # Duration: trong X tuần/ngày/tháng
-            r'trong\s+\d+\s+(?:ngay|tuan|thang)',
-            # Special relative: cuối tuần
-            r'cuoi\s+tuan',
-            # Date relative: ngày mai, hôm nay, tuần sau
-            # Also capture with time: "hôm nay 10h", "10h hôm nay"
-            r'(?:hom\s+nay|ngay\s+mai|mai|ngay\s+kia|tuan\s+sau|tuan\s+toi|thang\s+sau)(?:\s+\d{1,2}\s*(?:h|gio))?',
-            r'\d{1,2}\s*(?:h|gio)\s+(?:hom\s+nay|ngay\s+mai|mai)',
-            # Weekdays: thứ 2, thứ hai, t2, CN
-            r'(?:thu|t)\s*\d+(?:\s+tuan\s+sau)?|cn(?:\s+tuan\s+sau)?',
-            # Date: ngày 15 tháng 12, ngày 6 tháng 12
-            r'ngay\s+\d{1,2}\s+thang\s+\d{1,2}',
-        ]
+        # Match on the folded form (no diacritics, typo numbers fixed), cut from the original
+        normalized = NormalizedText.of(text)
+        text = normalized.raw
+        text_norm = normalized.folded
         
         # Match on normalized text for pattern recognition, then extract from original
         best_match = None
         best_length = 0
         best_span = None
         
-        for pattern in time_patterns:
-            match = re.search(pattern, text_norm)
+        for pattern in HeuristicPatterns.default().time_heuristic:
+            match = pattern.search(text_norm)
             if match:
                 matched_text = match.group(0)
                 if len(matched_text) > best_length:
                     best_length = len(matched_text)
                     best_span = match.span()
         
-        # Extract from original text using span, then extend end to capture full words with diacritics
+        # Map the folded span back to the original text (typo fixes change offsets),
+        # then extend end to capture full words
         if best_span:
-            start, end = best_span
+            start, end = normalized.to_raw_span(*best_span)
             # Extend end position while we're still in the same word (handle diacritic chars)
             while end < len(text) and text[end].isalpha():
                 end += 1
@@ -329,51 +430,25 @@ class PhoBERTEventExtractor:
         if not text:
             return None
         
-        # Enhanced pattern: ở|o / tại|tai followed by location (stops at punctuation or time connectors)
-        # This matches the improved regex from pipeline.py (lines 56-62)
-        # Pattern: "o truong ham tu" -> "truong ham tu" (handles no-diacritics)
-        location_pattern = re.compile(
-            r"\b(?:ở|o|tại|tai)\s+"                        # location marker (with/without diacritics)
-            r"([^\n,.;:!?]+?)\s*"                          # location content (non-greedy)
-            r"(?=$|[，,.;:!?]|\b(?:vào|vao|lúc|luc|khoảng|khoang|đến|den|tới|toi|cho\s+đến|cho\s+den|nhắc|nhac|trước|truoc))",
-            re.IGNORECASE
-        )
+        patterns = HeuristicPatterns.default()
         
-        match = location_pattern.search(text)
+        # ở|o / tại|tai followed by location (stops at punctuation or time connectors)
+        match = patterns.location_marker.search(text)
         if match:
             location = match.group(1).strip()
             if len(location) > 2:
                 return location
         
-        # Fallback: specific location types (phòng, tầng, building names)
-        # PRIORITY ORDER: Compound locations (company + building) FIRST, then single patterns
-        fallback_patterns = [
-            # PRIORITY 1: Company/organization + building (e.g., "công ty ABC phòng 401")
-            # Captures full compound location: organization name + room/floor
-            (r'(?:công ty|cong ty|văn phòng|van phong|trường|truong|bệnh viện|benh vien)\s+[A-Z\w]+(?:\s+(?:phòng|phong|tầng|tang|toà|toa|lầu|lau)\s+[\w\d]+)?', False),
-            
-            # PRIORITY 2: Named places with names (e.g., "nhà hàng Sài Gòn", "quán cafe Trung Nguyên")
-            (r'(?:nhà hàng|nha hang|quán|quan|cafe|café|siêu thị|sieu thi|chợ|cho)\s+[\w\s]{2,30}', False),
-            
-            # PRIORITY 3: Building-only (e.g., "phòng 302", "tầng 5") - MUST BE LAST
-            # Only matches if no compound location found above
-            (r'(?:phòng|phong|tầng|tang|toà|toa|lầu|lau)\s+[\w\d]+', False),
-        ]
-        
-        for pattern, has_group in fallback_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        # Fallback: specific location types (phòng, tầng, building names), in priority order
+        for pattern in patterns.location_fallback:
+            match = pattern.search(text)
             if match:
-                if has_group and match.lastindex:
-                    location = match.group(1)
-                else:
-                    location = match.group(0)
-                
                 # Clean up
-                location = re.sub(r'^(?:ở|o|tại|tai|đến|den|về|ve)\s+', '', location, flags=re.IGNORECASE)
+                location = patterns.location_prefix.sub('', match.group(0))
                 location = location.strip(' ,.;')
                 
                 # Stop at time expressions or reminder keywords
-                location = re.split(r'\s+(?:\d{1,2}(?:h|:|giờ|gio)|nhắc|nhac|remind)', location)[0]
+                location = patterns.location_stop.split(location)[0]
                 
                 if len(location) > 2:
                     return location
@@ -393,69 +468,17 @@ class PhoBERTEventExtractor:
     
     def _extract_time_semantic(self, text: str, embeddings: torch.Tensor) -> Optional[str]:
         """Extract time expressions using semantic understanding"""
-        # Build normalization map first
-        import unicodedata
-        
-        # Step 1: Normalize typos character-by-character (preserves length)
-        typo_map = {
-            'moth': 'mot', 'haih': 'hai', 'bah': 'ba', 'bonh': 'bon',
-            'tuh': 'tu', 'namh': 'nam', 'sauh': 'sau', 'bayh': 'bay',
-            'tamh': 'tam', 'chinh': 'chin', 'muoih': 'muoi'
-        }
-        text_typo_fixed = text.lower()
-        for typo, correct in typo_map.items():
-            text_typo_fixed = text_typo_fixed.replace(typo, correct)
-        
-        # Step 2: Remove diacritics (changes length - need mapping!)
-        # Build character mapping: norm_pos -> orig_pos
-        text_norm = ''
-        norm_to_orig = []  # Maps each char in normalized to original position
-        
-        for i, char in enumerate(text_typo_fixed):
-            # Remove diacritics
-            nfd = unicodedata.normalize('NFD', char)
-            no_diacritics = ''.join(c for c in nfd if not unicodedata.combining(c))
-            # Add to normalized text
-            for c in no_diacritics:
-                text_norm += c
-                norm_to_orig.append(i)  # Each normalized char maps to this original position
-        
-        # Time patterns (comprehensive Vietnamese time expressions)
-        # IMPORTANT: Order matters - ranges MUST come first!
-        # NOTE: Patterns match against NORMALIZED text (no typos, no diacritics)
-        time_patterns = [
-            # PRIORITY 0: Time ranges (MUST be first to capture as single unit)
-            # "từ 9h đến 11h sáng mai", "9h-11h", "9h đến 11h"
-            r'(?:tu\s+)?\d{1,2}(?:h|:\d{2}|(?:\s*gio(?:\s*\d{1,2}(?:\s*phut)?)?))\s*(?:den|den|-|–)\s*\d{1,2}(?:h|:\d{2}|(?:\s*gio(?:\s*\d{1,2}(?:\s*phut)?)?))',
-            # Number words + gio + period + weekday (e.g., "chu nhat sau gio chieu")
-            r'(?:chu\s+nhat|cn|thu|t\s*\d)\s+(?:mot|hai|ba|bon|tu|nam|sau|bay|tam|chin|muoi)\s+(?:gio)\s*(?:sang|trua|chieu|toi|dem)?',
-            r'(?:mot|hai|ba|bon|tu|nam|sau|bay|tam|chin|muoi)\s+(?:gio)\s*(?:sang|trua|chieu|toi|dem)?\s*(?:chu\s+nhat|cn|thu|t\s*\d)',
-            # Explicit time: 10h, 10:30, 10 giờ 30
-            r'\d{1,2}(?:h|:\d{2}|(?:\s*gio(?:\s*\d{1,2}(?:\s*phut)?)?))(?:\s*(?:sang|trua|chieu|toi|dem))?',
-            # Relative: ngày mai, hôm nay, tuần sau
-            r'(?:hom\s+nay|ngay\s+mai|mai|ngay\s+kia|tuan\s+sau|tuan\s+toi|thang\s+sau)',
-            # Weekdays: thứ 2, thứ hai, t2, CN
-            r'(?:thu|t)\s*\d|CN|chu\s+nhat',
-            # Date: ngày 15 tháng 12
-            r'ngay\s+\d{1,2}\s+thang\s+\d{1,2}',
-            # Period: sáng, chiều, tối
-            r'\b(?:sang|trua|chieu|toi|dem|khuya)\b',
-        ]
+        # Folded form (no typos, no diacritics) + offset map back to the original text
+        normalized = NormalizedText.of(text)
+        text_norm = normalized.folded
         
         # Find all time-related spans ON NORMALIZED TEXT
         time_spans = []
-        for pattern in time_patterns:
-            for match in re.finditer(pattern, text_norm, re.IGNORECASE):
+        for pattern in HeuristicPatterns.default().time_semantic:
+            for match in pattern.finditer(text_norm):
                 # Map normalized positions back to original text positions
-                norm_start = match.start()
-                norm_end = match.end() - 1  # Last char of match
-                
-                # Get original positions
-                orig_start = norm_to_orig[norm_start] if norm_start < len(norm_to_orig) else norm_start
-                orig_end = norm_to_orig[norm_end] + 1 if norm_end < len(norm_to_orig) else norm_end + 1
-                
-                # Extract from ORIGINAL (typo-fixed) text
-                time_spans.append((orig_start, orig_end, text_typo_fixed[orig_start:orig_end]))
+                orig_start, orig_end = normalized.to_raw_span(*match.span())
+                time_spans.append((orig_start, orig_end, text[orig_start:orig_end]))
         
         if not time_spans:
             return None
@@ -467,11 +490,11 @@ class PhoBERTEventExtractor:
             if merged and start <= merged[-1][1] + 3:
                 # Merge with previous - EXTEND to max end position (don't truncate!)
                 new_end = max(end, merged[-1][1])
-                merged[-1] = (merged[-1][0], new_end, text_typo_fixed[merged[-1][0]:new_end])
+                merged[-1] = (merged[-1][0], new_end, text[merged[-1][0]:new_end])
             else:
                 merged.append((start, end, txt))
         
-        # Return the longest/most complete time expression FROM ORIGINAL TEXT (with typos fixed)
+        # Return the longest/most complete time expression FROM ORIGINAL TEXT
         if merged:
             longest = max(merged, key=lambda x: x[1] - x[0])
             start, end = longest[0], longest[1]
@@ -484,23 +507,15 @@ class PhoBERTEventExtractor:
     
     def _extract_location_semantic(self, text: str, embeddings: torch.Tensor) -> Optional[str]:
         """Extract location using semantic understanding"""
-        # Location markers
-        # PRIORITY ORDER: Compound locations FIRST (company + building), then single patterns
-        location_markers = [
-            r'(?:ở|tại|đến|về)\s+([^,\.\d]{3,50})',
-            # Company/org + building: "công ty ABC phòng 401"
-            r'(?:trường|công ty|văn phòng|bệnh viện|nhà hàng|quán)\s+[A-Z\w]+(?:\s+(?:phòng|tầng|toà|tòa)\s+[\w\d]+)?',
-            # Building-only (MUST BE LAST)
-            r'(?:phòng|tầng|toà|tòa)\s+[\w\s\d]{1,30}',
-        ]
-        
-        for pattern in location_markers:
-            match = re.search(pattern, text, re.IGNORECASE)
+        # Location markers, in priority order (compound locations first)
+        patterns = HeuristicPatterns.default()
+        for pattern in patterns.location_semantic:
+            match = pattern.search(text)
             if match:
                 # Return captured group if exists, else full match
                 location = match.group(1) if match.lastindex else match.group(0)
                 # Clean up
-                location = re.sub(r'^(?:ở|tại|đến|về)\s+', '', location, flags=re.IGNORECASE)
+                location = patterns.location_semantic_prefix.sub('', location)
                 location = location.strip(' ,.;')
                 if len(location) > 2:
                     return location
@@ -510,36 +525,16 @@ class PhoBERTEventExtractor:
     def _extract_reminder(self, text: str) -> int:
         """Extract reminder minutes"""
         # Reminder patterns - order matters (most specific first)
-        patterns = [
-            # "nhắc sớm hơn 1 giờ" / "nhac som hon 1 gio"
-            (r'nhắc\s+(?:tôi\s+)?(?:sớm\s+hơn|som\s+hon)\s+(\d{1,2})\s*(?:giờ|h|gio)', 60),
-            # "nhắc sớm hơn 30 phút" / "nhac som hon 30 phut"
-            (r'nhắc\s+(?:tôi\s+)?(?:sớm\s+hơn|som\s+hon)\s+(\d{1,3})\s*(?:phút|phut|p)', 1),
-            # "nhắc trước 10 phút"
-            (r'nhắc\s+(?:tôi\s+)?(?:trước|truoc)\s+(\d{1,3})\s*(?:phút|phut|p)', 1),
-            # "nhắc trước 1 giờ"
-            (r'nhắc\s+(?:tôi\s+)?(?:trước|truoc)\s+(\d{1,2})\s*(?:giờ|gio|h)', 60),
-            # "nhắc 1 giờ trước"
-            (r'nhắc\s+(?:tôi\s+)?(\d{1,2})\s*(?:giờ|gio|h)\s*(?:trước|truoc)?', 60),
-            # "nhắc 30 phút"
-            (r'nhắc\s+(?:tôi\s+)?(\d{1,3})\s*(?:phút|phut|p)', 1),
-            # "10 phút trước nhắc"
-            (r'(\d{1,3})\s*(?:phút|phut|p)\s*(?:trước|truoc)\s*nhắc', 1),
-            # "1 giờ trước nhắc"
-            (r'(\d{1,2})\s*(?:giờ|gio|h)\s*(?:trước|truoc)\s*nhắc', 60),
-        ]
-        
-        for pattern, multiplier in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                try:
-                    value = int(match.group(1))
-                    return value * multiplier
-                except:
-                    pass
+        # Every numeric form contains "nhắc": skip the searches without it
+        patterns = HeuristicPatterns.default()
+        if 'nhắc' in text.lower():
+            for pattern, multiplier in patterns.reminder:
+                match = pattern.search(text)
+                if match:
+                    return int(match.group(1)) * multiplier
         
         # Check for reminder keyword without time (default: 15 minutes)
-        if re.search(r'\b(?:nhắc|nhac|remind)\b', text, re.IGNORECASE):
+        if patterns.reminder_keyword.search(text):
             return 15
         
         return 0
@@ -549,31 +544,16 @@ class PhoBERTEventExtractor:
         
         IMPROVED: Better fragment removal and location-aware cleaning
         """
+        patterns = HeuristicPatterns.default()
         cleaned = text
         
         # Remove weekday patterns (t2, t3, t5, cn, chu nhat, thu 2, thứ 3, etc.)
-        weekday_patterns = [
-            r'\b(?:thứ|thu)\s*(?:hai|ba|tư|tu|năm|nam|sáu|sau|bảy|bay|chủ\s*nhật)\b',
-            # Typo variants with 'h' suffix
-            r'\b(?:thứ|thu)\s*(?:haih|bah|tuh|namh|sauh|bayh)\b',
-            r'\b(?:thứ|thu)\s*\d\b',
-            r'\bt\s*\d\b',
-            r'\bcn\b',
-            r'\bchủ\s*nhật\b',
-            r'\bchu\s*nhat\b',
-        ]
-        for pattern in weekday_patterns:
-            cleaned = re.sub(pattern, ' ', cleaned, flags=re.IGNORECASE)
+        for pattern in patterns.event_weekday:
+            cleaned = pattern.sub(' ', cleaned)
         
         # Remove time patterns (explicit times: 10h, 8:30, etc.)
-        time_patterns = [
-            r'\b\d{1,2}\s*[hH:]\s*\d{0,2}\b',  # 10h, 8:30
-            r'\b\d{1,2}\s*giờ(?:\s*\d{1,2}\s*phút)?\b',  # 10 giờ, 10 giờ 30 phút
-            # Number words + giờ (mười giờ, hai giờ, etc.)
-            r'\b(?:một|mot|hai|ba|bốn|bon|năm|nam|sáu|sau|bảy|bay|tám|tam|chín|chin|mười|muoi|muoi\s+mot|muoi\s+hai)\s+giờ\b',
-        ]
-        for pattern in time_patterns:
-            cleaned = re.sub(pattern, ' ', cleaned, flags=re.IGNORECASE)
+        for pattern in patterns.event_time:
+            cleaned = pattern.sub(' ', cleaned)
         
         # Remove time expression if extracted
         if extracted.get('time_str'):
@@ -582,8 +562,7 @@ class PhoBERTEventExtractor:
         
         # Remove location marker + location (ở/o/tại + location) - ENHANCED
         # This removes the ENTIRE phrase "ở truong ham tu" not just marker
-        location_marker_pattern = r'\b(?:ở|o|tại|tai)\s+[^\s,\.!?\d]+'
-        cleaned = re.sub(location_marker_pattern, ' ', cleaned, flags=re.IGNORECASE)
+        cleaned = patterns.event_location_marker.sub(' ', cleaned)
         
         # Remove location if extracted (without marker) - WORD BY WORD
         if extracted.get('location'):
@@ -591,92 +570,56 @@ class PhoBERTEventExtractor:
             # Remove full location phrase
             cleaned = cleaned.replace(location, ' ')
             # Also remove individual words from location (handles fragments like "ham", "tu")
-            # BUT preserve compound verb/event phrases
-            compound_phrases = [
-                r'\bkhám\s+bệnh\b', r'\bkham\s+benh\b',  # medical checkup
-                r'\băn\s+tối\b', r'\ban\s+toi\b',  # dinner
-                r'\băn\s+sáng\b', r'\ban\s+sang\b',  # breakfast
-                r'\băn\s+trưa\b', r'\ban\s+trua\b',  # lunch
-                r'\bđi\s+cafe\b', r'\bdi\s+cafe\b',  # go to cafe (event, not just location)
-                r'\bđi\s+chợ\b', r'\bdi\s+cho\b',  # go to market (event, not just location)
-                r'\bra\s+chợ\b', r'\bra\s+cho\b',  # go out to market
-            ]
-            location_words = location.split()
-            for word in location_words:
+            # BUT preserve compound verb/event phrases (first match of each, recomputed when cleaned changes)
+            protected = None
+            for word in location.split():
                 if len(word) > 2:  # Only remove meaningful words
+                    if protected is None:
+                        protected = []
+                        for phrase_pattern in patterns.event_compound_phrases:
+                            match = phrase_pattern.search(cleaned)
+                            if match:
+                                protected.append(match.group().lower())
                     # Check if this word is part of a preserved compound phrase
-                    skip = False
-                    for phrase_pattern in compound_phrases:
-                        if re.search(phrase_pattern, cleaned, re.IGNORECASE):
-                            # Check if word is in this phrase
-                            if word.lower() in re.search(phrase_pattern, cleaned, re.IGNORECASE).group().lower():
-                                skip = True
-                                break
-                    if not skip:
+                    if not any(word.lower() in phrase for phrase in protected):
                         # Use word boundary to avoid removing parts of other words
-                        cleaned = re.sub(r'\b' + re.escape(word) + r'\b', ' ', cleaned, flags=re.IGNORECASE)
+                        removed = re.sub(r'\b' + re.escape(word) + r'\b', ' ', cleaned, flags=re.IGNORECASE)
+                        if removed != cleaned:
+                            cleaned = removed
+                            protected = None
         
         # Remove reminder phrases
-        reminder_patterns = [
-            r'nhắc\s+(?:tôi\s+)?(?:trước|sớm\s+hơn)?\s*\d{1,3}\s*(?:phút|p|giờ|h|gio)(?:\s+trước)?',
-            r'nhac\s+(?:toi\s+)?(?:truoc|som\s+hon)?\s*\d{1,3}\s*(?:phut|p|gio|h)(?:\s+truoc)?',
-            r'\d{1,3}\s*(?:phút|phut|p|giờ|gio|h)\s*(?:trước|truoc\s+)?(?:nhắc|nhac|nhở|nho)',
-            r'nhắc\s+(?:tôi\s+)?(?:trước|nhở|som\s+hon)?',
-            r'nhac\s+(?:toi\s+)?(?:truoc|nho|som\s+hon)?',
-            # Remove standalone reminder modifiers that might remain
-            r'\b(?:sớm\s+hơn|som\s+hon|trước|truoc)\b',
-        ]
-        for pattern in reminder_patterns:
-            cleaned = re.sub(pattern, ' ', cleaned, flags=re.IGNORECASE)
+        for pattern in patterns.event_reminder:
+            cleaned = pattern.sub(' ', cleaned)
         
         # Remove relative time words
-        relative_time = [
-            'hôm nay', 'hom nay', 'ngày mai', 'ngay mai', 'mai', 
-            'ngày kia', 'ngay kia', 'ngày mốt', 'ngay mot', 'mốt', 'mot',
-            'hôm qua', 'hom qua', 'qua', 'nay',
-            'tuần sau', 'tuan sau', 'tuần trước', 'tuan truoc',
-        ]
-        for word in relative_time:
-            cleaned = re.sub(r'\b' + re.escape(word) + r'\b', ' ', cleaned, flags=re.IGNORECASE)
+        cleaned = patterns.event_relative.sub(' ', cleaned)
         
         # Remove period words (sáng, chiều, tối, đêm) but preserve compound phrases
         # E.g., keep "ăn tối", "ăn sáng", "ăn trưa" but remove standalone period words
-        period_words_to_remove = ['sáng', 'sang', 'trưa', 'trua', 'chiều', 'chieu', 'đêm', 'dem', 'khuya']
         # Remove "tối" only if NOT preceded by "ăn" (preserve "ăn tối")
-        cleaned = re.sub(r'(?<!ăn\s)(?<!an\s)\b(?:tối|toi)\b', ' ', cleaned, flags=re.IGNORECASE)
+        cleaned = patterns.event_toi.sub(' ', cleaned)
         # Remove other period words normally
-        for word in period_words_to_remove:
-            cleaned = re.sub(r'\b' + re.escape(word) + r'\b', ' ', cleaned, flags=re.IGNORECASE)
+        cleaned = patterns.event_period.sub(' ', cleaned)
         
         # Remove time/location connectors
-        connectors = ['vào', 'vao', 'lúc', 'luc', 'vào lúc', 'vao luc', 'khoảng', 'khoang', 'từ', 'tu', 'đến', 'den', 'tới', 'cho đến', 'cho den']
-        for word in connectors:
-            cleaned = re.sub(r'\b' + re.escape(word) + r'\b', ' ', cleaned, flags=re.IGNORECASE)
+        cleaned = patterns.event_connectors.sub(' ', cleaned)
         
         # Remove location-related fragments (common fragments that leak into events)
-        # NEW: Target specific problematic fragments with smart preservation
-        location_fragments = [
-            # Building/place words
-            r'\b(?:phòng|phong|tầng|tang|toà|toa|lầu|lau)\b',
-            # Partial words from compound location names
-            r'\b(?:ham|tu|gần|gan|viện|vien|hàng|hang|công|cong|ty|quan)\b',
-        ]
-        for pattern in location_fragments:
-            cleaned = re.sub(pattern, ' ', cleaned, flags=re.IGNORECASE)
+        cleaned = patterns.event_location_fragments.sub(' ', cleaned)
         
         # Remove cafe/market words ONLY if NOT part of motion event (preserve "đi chợ", "đi cafe")
         # Use negative lookbehind to keep verb + location patterns
-        cleaned = re.sub(r'(?<!đi\s)(?<!di\s)(?<!ra\s)(?<!vào\s)(?<!vao\s)\b(?:cafe|café)\b', ' ', cleaned, flags=re.IGNORECASE)
-        cleaned = re.sub(r'(?<!đi\s)(?<!di\s)(?<!ra\s)(?<!vào\s)(?<!vao\s)\b(?:chợ|cho)\b', ' ', cleaned, flags=re.IGNORECASE)
+        cleaned = patterns.event_cafe_market.sub(' ', cleaned)
         # Remove market-related words normally (these are rarely events)
-        cleaned = re.sub(r'\b(?:siêu|sieu|thị|thi|truong|trường)\b', ' ', cleaned, flags=re.IGNORECASE)
+        cleaned = patterns.event_market_words.sub(' ', cleaned)
         
         # Remove standalone numbers (including typo number words)
-        cleaned = re.sub(r'\b\d{1,4}\b', ' ', cleaned)
-        cleaned = re.sub(r'\b(?:sauh|namh|tamh|muoih|bayh|bah|bonh|tuh|haih|moth|chinh)\b', ' ', cleaned, flags=re.IGNORECASE)
+        cleaned = patterns.event_numbers.sub(' ', cleaned)
+        cleaned = patterns.event_typo_numbers.sub(' ', cleaned)
         
         # Clean up whitespace and punctuation
-        cleaned = re.sub(r'\s+', ' ', cleaned)
+        cleaned = patterns.whitespace.sub(' ', cleaned)
         cleaned = cleaned.strip(' ,.;-:!?')
         
         # POST-PROCESSING: Remove trailing single-word fragments
@@ -684,26 +627,20 @@ class PhoBERTEventExtractor:
         words = cleaned.split()
         if len(words) > 1 and len(words[-1]) <= 3:
             # Check if last word is a common fragment
-            last_word = words[-1].lower()
-            if last_word in ['ham', 'tu', 'ty', 'abc', 'gan', 'nha', 'o', 'a', 'b', 'c', 'mai', 'bai', 'sai', 'gon']:
+            if words[-1].lower() in EVENT_TRAILING_FRAGMENTS:
                 words = words[:-1]
                 cleaned = ' '.join(words)
         
         # If cleaned is empty or too short, try to extract main action verb
         if not cleaned or len(cleaned) < 2:
-            # Look for common action verbs
-            action_verbs = ['họp', 'hop', 'đi', 'di', 'làm', 'lam', 'gặp', 'gap', 'học', 'hoc', 'ăn', 'an', 'chạy', 'chay', 'tập', 'tap']
-            for verb in action_verbs:
-                if re.search(r'\b' + re.escape(verb) + r'\b', text, flags=re.IGNORECASE):
-                    # Find verb and next 1-2 words
-                    match = re.search(r'\b' + re.escape(verb) + r'\b(?:\s+\w+){0,2}', text, flags=re.IGNORECASE)
-                    if match:
-                        cleaned = match.group(0)
-                        # Remove fragments from matched text too
-                        for pattern in location_fragments:
-                            cleaned = re.sub(pattern, ' ', cleaned, flags=re.IGNORECASE)
-                        cleaned = re.sub(r'\s+', ' ', cleaned).strip()
-                        break
+            # Look for common action verbs (verb and next 1-2 words)
+            for pattern in patterns.event_action_verbs:
+                match = pattern.search(text)
+                if match:
+                    # Remove fragments from matched text too
+                    cleaned = patterns.event_location_fragments.sub(' ', match.group(0))
+                    cleaned = patterns.whitespace.sub(' ', cleaned).strip()
+                    break
         
         # Final cleanup
         if not cleaned or len(cleaned) < 2:
@@ -751,25 +688,31 @@ class PhoBERTEventExtractor:
                 'reminder_minutes': 0
             }
         
-        # Use rule-based extraction (always reliable)
-        time_str = self._extract_time_heuristic(text)
-        location = self._extract_location_heuristic(text)
-        reminder = self._extract_reminder(text)
+        cached = self._cache.get(text) if self._cache is not None else None
+        if cached is not None:
+            time_str, location, reminder, event_name = cached
+        else:
+            # Use rule-based extraction (always reliable)
+            time_str = self._extract_time_heuristic(text)
+            location = self._extract_location_heuristic(text)
+            reminder = self._extract_reminder(text)
+            
+            # Extract event name by removing extracted components
+            entities_for_cleaning = {
+                'time_str': time_str,
+                'location': location,
+                'reminder_minutes': reminder
+            }
+            event_name = self._extract_event_name(text, entities_for_cleaning)
+            if self._cache is not None:
+                self._cache.put(text, [time_str, location, reminder, event_name])
         
-        # Parse time string to datetime
+        # Parse time string to datetime (per call: depends on relative_base)
         start_dt, end_dt = parse_vietnamese_time_range(
             time_str,
             relative_base=relative_base
         )
         
-        # Extract event name by removing extracted components
-        entities_for_cleaning = {
-            'time_str': time_str,
-            'location': location,
-            'reminder_minutes': reminder
-        }
-        event_name = self._extract_event_name(text, entities_for_cleaning)
-        
         return {
             'event': event_name if event_name else text,
             'start_time': start_dt.isoformat() if start_dt else None,
@@ -783,30 +726,52 @@ class PhoBERTNLPPipeline:
     """
     Main pipeline that wraps PhoBERTEventExtractor
     Compatible interface with the old NLPPipeline
+    
+    unload() drops the model to free its memory; the next process() loads it
+    again with the same settings (fast with the self-contained, memory-mapped
+    model directory of phobert_trainer).
     """
     
-    def __init__(self, model_path: Optional[str] = None, relative_base: Optional[datetime] = None):
+    def __init__(self, model_path: Optional[str] = None, relative_base: Optional[datetime] = None,
+                 quantize: Optional[str] = None, backend: str = 'torch', onnx_threads: int = 0,
+                 max_batch: int = 1, max_wait_ms: float = 5.0):
         """
         Initialize PhoBERT pipeline
         
         Args:
             model_path: Path to fine-tuned model (optional)
             relative_base: Base datetime for relative time parsing
+            quantize: 'int8' for dynamic INT8 CPU inference (see PhoBERTEventExtractor)
+            backend: 'torch', or 'onnx' = onnxruntime on the exported model_path/model.onnx
+            onnx_threads: Intra-op threads of the onnxruntime session (0 = one per core)
+            max_batch: > 1 = concurrent extract_entities() calls share forward passes of
+                up to max_batch sentences (see PhoBERTEventExtractor; process() stays
+                on the heuristics)
+            max_wait_ms: Longest time a sentence waits for others to join its batch
         """
         self.relative_base = relative_base
-        
-        # Check if transformers is available
-        if not TRANSFORMERS_AVAILABLE:
+        self._fallback_extractor = None
+        self.extractor = None
+        self._load_lock = threading.Lock()
+        self._load_counts = {'loads': 0, 'unloads': 0}
+        self._in_use = 0  # calls holding the extractor (unload() waits for 0)
+        self.last_load_seconds: Optional[float] = None
+        
+        # Check if transformers is available (the ONNX backend doesn't need torch)
+        if backend == 'torch' and not TRANSFORMERS_AVAILABLE:
             pass  # Silently fallback to rule-based system
             self.use_phobert = False
             return
         
         try:
             # Determine device
-            device = 'cuda' if torch.cuda.is_available() else 'cpu'
+            device = 'cuda' if backend == 'torch' and torch.cuda.is_available() else 'cpu'
             print(f"🔧 Using device: {device}")
             
-            self.extractor = PhoBERTEventExtractor(model_path=model_path, device=device)
+            self._extractor_args = dict(model_path=model_path, device=device, quantize=quantize,
+                                        backend=backend, onnx_threads=onnx_threads,
+                                        max_batch=max_batch, max_wait_ms=max_wait_ms)
+            self._load_extractor()
             self.use_phobert = True
             print("✅ PhoBERT pipeline initialized successfully")
             
@@ -829,16 +794,107 @@ class PhoBERTNLPPipeline:
             return self._fallback_process(text)
         
         try:
-            return self.extractor.process(text, relative_base=self.relative_base)
+            with self._extractor_in_use() as extractor:
+                return extractor.process(text, relative_base=self.relative_base)
         except Exception as e:
             print(f"❌ PhoBERT processing error: {e}")
             return self._fallback_process(text)
     
+    def _load_extractor(self) -> PhoBERTEventExtractor:
+        """Build the extractor from the init settings (caller holds _load_lock, or is __init__)"""
+        started = time.perf_counter()
+        self.extractor = PhoBERTEventExtractor(**self._extractor_args)
+        self.last_load_seconds = time.perf_counter() - started
+        self._load_counts['loads'] += 1
+        return self.extractor
+    
+    @contextmanager
+    def _extractor_in_use(self) -> Iterator[PhoBERTEventExtractor]:
+        """The extractor (reloaded first if unload() dropped it), kept loaded until the block exits"""
+        with self._load_lock:
+            extractor = self.extractor
+            if extractor is None:
+                print("🔄 Reloading PhoBERT model...")
+                extractor = self._load_extractor()
+            self._in_use += 1
+        try:
+            yield extractor
+        finally:
+            with self._load_lock:
+                self._in_use -= 1
+    
+    @property
+    def is_loaded(self) -> bool:
+        """True while the model is in memory"""
+        return self.extractor is not None
+    
+    def unload(self) -> bool:
+        """
+        Release the model unless a call is using it
+        
+        Returns:
+            True if a loaded model was released (False if none was loaded or a
+            process()/extract_entities() call still holds it)
+        """
+        with self._load_lock:
+            if self.extractor is None or self._in_use:
+                return False
+            extractor, self.extractor = self.extractor, None
+            self._load_counts['unloads'] += 1
+        extractor.close()
+        del extractor
+        release_memory()
+        print("💾 PhoBERT model unloaded")
+        return True
+    
+    def load_stats(self) -> Dict[str, Any]:
+        """{'loaded', 'loads', 'unloads', 'in_use', 'last_load_seconds'}"""
+        with self._load_lock:
+            counts = dict(self._load_counts, in_use=self._in_use)
+        return {'loaded': self.is_loaded, **counts, 'last_load_seconds': self.last_load_seconds}
+    
     def _fallback_process(self, text: str) -> Dict[str, Any]:
         """Simple fallback when PhoBERT is not available"""
         # Use the existing PhoBERTEventExtractor heuristic methods in fallback mode
-        extractor = PhoBERTEventExtractor(fallback_mode=True)
-        return extractor.process(text, relative_base=self.relative_base)
+        # (one instance, so its parse cache is reused)
+        return self._fallback_extractor_instance().process(text, relative_base=self.relative_base)
+    
+    def _fallback_extractor_instance(self) -> PhoBERTEventExtractor:
+        """Heuristics-only extractor (created once)"""
+        if self._fallback_extractor is None:
+            self._fallback_extractor = PhoBERTEventExtractor(fallback_mode=True)
+        return self._fallback_extractor
+    
+    def extract_entities(self, text: str) -> Dict[str, Any]:
+        """
+        Model entities of one text (event_name, time_str, location, reminder_minutes)
+        
+        Goes through the extractor's micro-batching queue when max_batch > 1, so
+        concurrent callers share forward passes; heuristics without PhoBERT.
+        """
+        if not self.use_phobert:
+            return self._fallback_extractor_instance().extract_entities(text)
+        with self._extractor_in_use() as extractor:
+            return extractor.extract_entities(text)
+    
+    def extract_entities_batch(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """Model entities of many texts with one forward pass (bulk callers, e.g. imports)"""
+        if not self.use_phobert:
+            return self._fallback_extractor_instance().extract_entities_batch(texts)
+        with self._extractor_in_use() as extractor:
+            return extractor.extract_entities_batch(texts)
+    
+    def batching_stats(self) -> Dict[str, Any]:
+        """Batch-size and queue-wait histograms of the loaded extractor ({} if batching is off)"""
+        extractor = self.extractor if self.use_phobert else None
+        return extractor.batching_stats() if extractor is not None else {}
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        """Parse cache counters of the extractor in use"""
+        extractor = self.extractor if self.use_phobert else self._fallback_extractor
+        if extractor is None or extractor._cache is None:
+            return {}
+        return extractor._cache.stats()
 
 
 # Convenience function for backward compatibility
@@ -22,6 +22,12 @@ except ImportError as e:
     TRANSFORMERS_AVAILABLE = False
     print(f"Warning: Could not import dependencies: {e}")
 
+# Self-contained model directory (PhoBERTEventClassifier.save_pretrained): the
+# encoder as a transformers model (config.json + model.safetensors) and the
+# four classification heads, next to the tokenizer files
+ENCODER_DIR = "encoder"
+HEADS_FILE = "heads.safetensors"
+
 
 class EventExtractionDataset(Dataset):
     """
@@ -144,6 +150,44 @@ class PhoBERTEventClassifier(nn.Module):
             'location': location_logits,
             'reminder': reminder_logits,
         }
+    
+    def save_pretrained(self, save_dir: str | Path) -> None:
+        """Write the encoder to save_dir/encoder and the heads to save_dir/heads.safetensors"""
+        from safetensors.torch import save_file
+        
+        save_path = Path(save_dir)
+        self.phobert.save_pretrained(save_path / ENCODER_DIR, safe_serialization=True)
+        heads = {name: tensor.detach().cpu().contiguous() for name, tensor in self.state_dict().items()
+                 if not name.startswith('phobert.')}
+        save_file(heads, str(save_path / HEADS_FILE))
+    
+    @staticmethod
+    def is_pretrained(model_dir: str | Path) -> bool:
+        """True if model_dir holds a save_pretrained() model"""
+        model_path = Path(model_dir)
+        return (model_path / HEADS_FILE).exists() and (model_path / ENCODER_DIR / "config.json").exists()
+    
+    @classmethod
+    def from_pretrained(cls, model_dir: str | Path, device: str = 'cpu') -> 'PhoBERTEventClassifier':
+        """
+        Load a save_pretrained() model, offline
+        
+        The encoder is built from its own config and its safetensors weights are
+        memory-mapped and read once (no vinai/phobert-base download or skeleton).
+        """
+        from safetensors.torch import load_file
+        
+        model_path = Path(model_dir)
+        encoder = AutoModel.from_pretrained(model_path / ENCODER_DIR, local_files_only=True)
+        model = cls(encoder, hidden_size=encoder.config.hidden_size)
+        missing, unexpected = model.load_state_dict(load_file(str(model_path / HEADS_FILE)), strict=False)
+        missing = [name for name in missing if not name.startswith('phobert.')]
+        if missing or unexpected:
+            raise RuntimeError(f"{model_path / HEADS_FILE} does not match PhoBERTEventClassifier "
+                               f"(missing {missing}, unexpected {unexpected})")
+        model.to(device)
+        model.eval()
+        return model
 
 
 class PhoBERTTrainer:
@@ -442,8 +486,9 @@ class PhoBERTTrainer:
         save_path = Path(save_dir)
         save_path.mkdir(parents=True, exist_ok=True)
         
-        # Save model
-        torch.save(self.model.state_dict(), save_path / "model.pt")
+        # Save model (self-contained: loads without vinai/phobert-base)
+        model = self.model.module if isinstance(self.model, nn.DataParallel) else self.model
+        model.save_pretrained(save_path)
         
         # Save tokenizer
         self.tokenizer.save_pretrained(save_path)
@@ -455,6 +500,8 @@ class PhoBERTTrainer:
             'num_epochs': self.num_epochs,
             'learning_rate': self.learning_rate,
             'batch_size': self.batch_size,
+            'encoder': ENCODER_DIR,
+            'heads': HEADS_FILE,
         }
         with open(save_path / "config.json", 'w', encoding='utf-8') as f:
             json.dump(config, f, indent=2, ensure_ascii=False)
@@ -1,6 +1,6 @@
 from __future__ import annotations
 import re
-from typing import Optional, Tuple, Dict, Any
+from typing import Optional, Tuple, Dict, Any, Iterable, List
 
 try:
     from underthesea import ner
@@ -10,13 +10,59 @@ except Exception:
         return []
 
 from .time_parser import parse_vietnamese_time, parse_vietnamese_time_range
+from .parse_cache import ParseCache
+from .location_scanner import LocationScanner, is_compound_event
+from .gazetteer import DEFAULT_GAZETTEER_PATH, open_gazetteer
+from .normalized_text import NormalizedText
+from .stage_scheduler import StageScheduler
 from datetime import datetime
 
 
+def _replace_spans(text: str, spans: List[Tuple[int, int]], repl: str) -> str:
+    """Replace sorted, non-overlapping spans of text in one pass (like re.sub over those matches)"""
+    parts = []
+    prev = 0
+    for start, end in spans:
+        parts.append(text[prev:start])
+        parts.append(repl)
+        prev = end
+    parts.append(text[prev:])
+    return ''.join(parts)
+
+
 class NLPPipeline:
-    def __init__(self, *, relative_base: Optional[datetime] = None):
+    def __init__(self, *, relative_base: Optional[datetime] = None,
+                 cache_size: int = 1024, cache_path: Optional[str] = None,
+                 gazetteer_path: Optional[str] = DEFAULT_GAZETTEER_PATH,
+                 gate_ner: bool = False):
+        """
+        Args:
+            relative_base: Base datetime for relative time parsing (None = now)
+            cache_size: Extraction results kept in the LRU parse cache (0 = disabled)
+            cache_path: Optional SQLite file persisting the parse cache across runs
+            gazetteer_path: Compiled location gazetteer (see core_nlp.gazetteer); skipped
+                if the file does not exist, None = disabled
+            gate_ner: Only run the NER fallback when the text has a location cue
+                (see core_nlp.stage_scheduler); faster, but can drop locations typed
+                in lowercase without a marker. False = always run it
+        """
         self.relative_base = relative_base
         
+        # External gazetteer (memory-mapped, shared by all pipelines of the process)
+        self.gazetteer = open_gazetteer(gazetteer_path) if gazetteer_path else None
+        # Cached results depend on the gazetteer contents
+        namespace = f'rule:{self.gazetteer.build_id:08x}' if self.gazetteer is not None else 'rule'
+        self._cache = ParseCache(cache_size, cache_path, namespace=namespace) if cache_size > 0 else None
+        
+        # Known-location patterns, compiled once per process
+        self.location_scanner = LocationScanner.default()
+        # Decides whether NER runs; per-stage hit rates and timings
+        self.scheduler = StageScheduler(self.location_scanner, self.gazetteer, gate_ner=gate_ner)
+        self.location_reminder_words = re.compile(
+            r'\b(?:before|earlier|notify|nhac|nhắc|báo|bao|trc|truoc|trước|som|sớm|hon|hơn)\b', re.IGNORECASE
+        )
+        self.multi_space_regex = re.compile(r'\s{2,}')
+        
         # ========== IMPROVED TIME PATTERNS ==========
         # Fix: Prevent matching time patterns adjacent to letters (both upper and lowercase)
         # Use Unicode category \w which includes all Vietnamese letters
@@ -122,6 +168,58 @@ class NLPPipeline:
         self.reminder_month_regex2 = re.compile(fr"\b{num}\s*{unit_month}{before}\s*(?:{verb})", re.IGNORECASE)
         # Presence-only (no number): used to strip from text and optional boolean
         self.reminder_presence_regex = re.compile(fr"{verb}{pron}(?:\s*(?:trước|truoc|trc))?\b", re.IGNORECASE)
+        # Search order: first explicit number found per form wins the max
+        self.reminder_regexes = [
+            (self.reminder_month_regex1, 43200),  # 30 days * 24 hours * 60 min
+            (self.reminder_week_regex1, 10080),   # 7 days * 24 hours * 60 min
+            (self.reminder_day_regex1, 1440),     # 24 hours * 60 min
+            (self.reminder_hour_regex1, 60),
+            (self.reminder_min_regex1, 1),
+            (self.reminder_month_regex2, 43200),
+            (self.reminder_week_regex2, 10080),
+            (self.reminder_day_regex2, 1440),
+            (self.reminder_hour_regex2, 60),
+            (self.reminder_min_regex2, 1),
+        ]
+        # v1.0.7: Standalone reminder keywords left behind by the patterns above
+        # (e.g., "before 2" when pattern matched "nhac 2 week" but left "before" behind)
+        self.reminder_standalone_regex = re.compile(r'\b(?:before|earlier|notify|som|sớm|hon|hơn)\b', re.IGNORECASE)
+
+        self.reminder_verb_regex = re.compile(verb, re.IGNORECASE)
+
+        # Unified reminder grammar: one left-to-right scan reports, at every position,
+        # which of the forms above match there (each family in its own named lookahead,
+        # the unit group that matched tells the form). Units of one family never match
+        # at the same position, so the first position per unit group is exactly where
+        # the separate regex of that form would have matched.
+        units = [('month', unit_month, 43200), ('week', unit_week, 10080), ('day', unit_day, 1440),
+                 ('hour', unit_hour, 60), ('min', unit_min, 1)]
+        fwd_units = '|'.join(fr"(?P<fwd_{name}>{unit})" for name, unit, _ in units)
+        bwd_units = '|'.join(fr"(?P<bwd_{name}>{unit})" for name, unit, _ in units)
+        fwd = fr"{verb}{pron}(?:{before}\s*)?(?P<fwd_num>\d{{1,3}})\s*(?:{fwd_units})(?:\s*(?:trước|truoc|trc))?\b"
+        bwd = fr"\b(?P<bwd_num>\d{{1,3}})\s*(?:{bwd_units}){before}\s*(?:{verb})"
+        presence = self.reminder_presence_regex.pattern
+        keyword = self.reminder_standalone_regex.pattern
+        # Dispatch on the first character: digits start the backward form, verbs start
+        # the forward/presence forms (and "before"/"notify"), other keywords start with e/s/h
+        self.reminder_grammar = re.compile(
+            fr"(?:(?=\d)(?=(?P<bwd>{bwd}))"
+            fr"|(?=[nbr])(?=(?P<fwd>{fwd}))?(?=(?P<presence>{presence}))?(?=(?P<keyword>{keyword}))?"
+            r"(?(fwd)|(?(presence)|(?(keyword)|(?!))))"
+            fr"|(?=[esh])(?=(?P<keyword2>{keyword})))",
+            re.IGNORECASE,
+        )
+        gi = self.reminder_grammar.groupindex
+        # Same order (and factors) as reminder_regexes: (form group, number group, unit group, factor)
+        self._reminder_forms = [(gi[fam], gi[f'{fam}_num'], gi[f'{fam}_{name}'], factor)
+                                for fam in ('fwd', 'bwd') for name, _, factor in units]
+        # Per family: (form group, number group, [(form index, unit group)])
+        self._reminder_families = [
+            (gi[fam], gi[f'{fam}_num'], [(i, form[2]) for i, form in enumerate(self._reminder_forms) if form[0] == gi[fam]])
+            for fam in ('fwd', 'bwd')
+        ]
+        self._reminder_presence_group = gi['presence']
+        self._reminder_keyword_groups = (gi['keyword'], gi['keyword2'])
 
         # Time connectors and period words to strip from event name (comprehensive list with/without diacritics)
         time_connectors = r"(?:vào|vao|lúc|luc|vào\s+lúc|vao\s+luc|khoảng|khoang|từ|tu|đến|den|tới|cho\s+đến|cho\s+den|bắt\s+đầu|bat\s+dau|kết\s+thúc|ket\s+thuc)"
@@ -132,6 +230,64 @@ class NLPPipeline:
         timezone_words = r"(?:utc|gmt|múi\s*giờ|mui\s*gio)"
         self.time_related_words = re.compile(fr"\b({time_connectors}|{period_words}|{relative_time}|{timezone_words})\b", re.IGNORECASE)
 
+        # Event name cleanup passes (see _clean_event_name), applied in this order
+        self.event_pronoun_regex = re.compile(
+            r"\b(?:toi|tôi|minh|mình|chúng\s*tôi|chung\s*toi)\s+(?:di|đi|se|sẽ|can|cần|phai|phải|muon|muốn|den|đến|ve|về)\b",
+            re.IGNORECASE,
+        )
+        self.event_date_regexes = [re.compile(r'\b\d{1,2}[-./]\d{1,2}\b'), re.compile(r'\b\d{1,2}\.\d{1,2}\b')]
+        self.event_with_period_regex = re.compile(r'\b(?:an|ăn|ve|về)\s+(?:sang|sáng|trua|trưa|toi|tối|chieu|chiều)\b', re.IGNORECASE)
+        self.event_period_regex = re.compile(r'\b(?:toi|tối|sang|sáng|trua|trưa|chieu|chiều)\b', re.IGNORECASE)
+        self.event_time_words_regex = re.compile(fr"\b({time_connectors}|{relative_time}|{timezone_words})\b", re.IGNORECASE)
+        self.event_time_unit_regex = re.compile(r"\b(?:giờ|gio|phút|phut)\b", re.IGNORECASE)
+        self.event_period_word_regexes = [
+            (period, re.compile(fr"\b{period}\b", re.IGNORECASE))
+            for period in ['sáng', 'sang', 'trưa', 'trua', 'chiều', 'chieu', 'tối', 'toi', 'đêm', 'dem', 'khuya']
+        ]
+        self.event_connector_regex = re.compile(r"\b(vào|vao|lúc|luc|khoảng|khoang|tại|tai|ở|o)\b", re.IGNORECASE)
+        # Any removal pass above (period words included): a clean name skips straight to trimming
+        self.event_cleanup_any = re.compile('|'.join(f'(?:{rx.pattern})' for rx in [
+            self.event_pronoun_regex, *self.event_date_regexes, self.event_period_regex,
+            self.event_time_words_regex, self.event_time_unit_regex,
+            *(rx for _, rx in self.event_period_word_regexes), self.event_connector_regex,
+        ]), re.IGNORECASE)
+
+        # Time components stripped from location candidates (see _clean_location_of_time_components), in order
+        self.location_time_component_regexes = [
+            re.compile(p, flags) for p, flags in [
+                # Pattern 1: Remove "X:00 thứ Y" → "00 thứ Y" (e.g., "18:00 thứ 2" → "00 thứ 2")
+                (r'\b\d{1,2}:00\s+', re.IGNORECASE),
+                # Pattern 2: Remove "Xh thứ Y" → "h thứ Y" (e.g., "9h thứ 2" → "h thứ 2")
+                (r'\b\d{1,2}h\s+', re.IGNORECASE),
+                # Pattern 3: Remove standalone time indicators: thứ 2-8, t2-t8, cn (chủ nhật)
+                (r'\b(?:thứ|thu)\s*[2-8]\b', re.IGNORECASE),
+                (r'\bt[2-8]\b', re.IGNORECASE),
+                (r'\bcn\b', re.IGNORECASE),
+                # Pattern 4: Remove "h sáng/chiều/tối/trưa" patterns
+                (r'\bh\s+(?:sáng|sang|chiều|chieu|tối|toi|trưa|trua)\b', re.IGNORECASE),
+                # Pattern 5: Remove "h ngày X" patterns
+                (r'\bh\s+(?:ngày|ngay)\s+\w+\b', re.IGNORECASE),
+                # Pattern 6: Remove standalone "00" from ":00"
+                (r'\b00\b', 0),
+                # Pattern 7: Remove standalone "h" or "giờ"
+                (r'\b(?:h|giờ|gio)\b', re.IGNORECASE),
+                # Pattern 8: Remove year/month/day patterns (already handled but double-check)
+                (r'\b(?:năm|nam)\s+\d{4}\b', re.IGNORECASE),
+                (r'\b(?:tháng|thang)\s+\d{1,2}\b', re.IGNORECASE),
+                (r'\b(?:ngày|ngay)\s+\d{1,2}\b', re.IGNORECASE),
+                # Pattern 9: Remove time range indicators
+                (r'\b(?:mai|hôm nay|hom nay|ngày mai|ngay mai)\b', re.IGNORECASE),
+                (r'\b(?:sáng|sang|chiều|chieu|tối|toi|trưa|trua)\s+(?:mai|nay)\b', re.IGNORECASE),
+                # Pattern 10: Remove "ngày mốt", "ngày kia", "mai mốt"
+                (r'\b(?:ngày|ngay)\s+(?:mốt|mot|kia)\b', re.IGNORECASE),
+                (r'\b(?:mai)\s+(?:mốt|mot)\b', re.IGNORECASE),
+            ]
+        ]
+        # Any of the above: most candidates have no time component, one search skips all passes
+        self.location_time_component_any = re.compile(
+            '|'.join(f'(?:{rx.pattern})' for rx in self.location_time_component_regexes), re.IGNORECASE
+        )
+
     def _extract_location_ner(self, text: str) -> Tuple[Optional[str], str]:
         """Sử dụng underthesea NER để ghép các token B-LOC/I-LOC thành một cụm địa điểm.
         Trả về (location, text_without_location)
@@ -196,85 +352,30 @@ class NLPPipeline:
             return None
         
         # Step 1: Clean reminder keywords (before, earlier, som hon, notify, etc.)
-        reminder_keywords = r'\b(?:before|earlier|notify|nhac|nhắc|báo|bao|trc|truoc|trước|som|sớm|hon|hơn)\b'
-        text_cleaned = re.sub(reminder_keywords, ' ', text, flags=re.IGNORECASE)
-        text_cleaned = re.sub(r'\s{2,}', ' ', text_cleaned).strip()
-        
-        # Common Vietnamese location names (cities, districts, venues)
-        # v1.0.7: Extracted from training_100k_comprehensive.json top locations
-        # ENHANCED: Added many more location keywords to improve 24.8% detection rate
-        known_locations = [
-            # Cities (highest priority - most specific)
-            r'\b(?:hà\s*nội|ha\s*noi|sài\s*gòn|sai\s*gon|đà\s*nẵng|da\s*nang|hải\s*phòng|hai\s*phong|cần\s*thơ|can\s*tho|hồ\s*chí\s*minh|ho\s*chi\s*minh)\b',
-            # Branded venues (specific names)
-            r'\b(?:30\s*shines|highlands?\s*coffee|starbucks?|kfc|lotteria|phúc\s*long|phuc\s*long|trung\s*nguyên|trung\s*nguyen|café|cafe)\b',
-            # Building components (specific)
-            r'\b(?:tầng\s*\d+|tang\s*\d+|toà\s*[a-z]|toa\s*[a-z]|khu\s*[a-z]|phòng\s*\d+|phong\s*\d+|lầu\s*\d+|lau\s*\d+)\b',
-            r'\b(?:quận\s*\d+|quan\s*\d+|phường\s*\d+|phuong\s*\d+|huyện\s*\d+|huyen\s*\d+)\b',
-            r'\b(?:ngõ\s*\d+|ngo\s*\d+|hẻm\s*\d+|hem\s*\d+|đường\s*\d+|duong\s*\d+)\b',
-            # Generic venues (lower priority - more ambiguous)
-            r'\b(?:rạp\s*chiếu\s*phim|rap\s*chieu\s*phim|cinema|lotte|cgv|galaxy)\b',
-            r'\b(?:trung\s*tâm\s*thương\s*mại|trung\s*tam\s*thuong\s*mai|mall|plaza|center|centre)\b',
-            r'\b(?:sân\s*bay|san\s*bay|ga\s*tàu|ga\s*tau|bến\s*xe|ben\s*xe|trạm\s*xe\s*buýt|tram\s*xe\s*buyt)\b',
-            r'\b(?:bệnh\s*viện|benh\s*vien|phòng\s*khám|phong\s*kham|nha\s*khoa|nha\s*khoa)\b',
-            r'\b(?:trường\s*học|truong\s*hoc|đại\s*học|dai\s*hoc|học\s*viện|hoc\s*vien|trường\s*đại\s*học|truong\s*dai\s*hoc)\b',
-            r'\b(?:thư\s*viện|thu\s*vien|thư\s*viện\s*tỉnh|thu\s*vien\s*tinh)\b',
-            r'\b(?:nhà\s*hàng|nha\s*hang|quán\s*ăn|quan\s*an|quán\s*cà\s*phê|quan\s*ca\s*phe|cafe|restaurant)\b',
-            r'\b(?:khách\s*sạn|khach\s*san|hotel|resort|homestay|nhà\s*nghỉ|nha\s*nghi)\b',
-            r'\b(?:công\s*viên|cong\s*vien|park|công\s*viên\s*thống\s*nhất|cong\s*vien\s*thong\s*nhat)\b',
-            r'\b(?:văn\s*phòng|van\s*phong|office|công\s*ty|cong\s*ty|company)\b',
-            r'\b(?:phòng\s*họp|phong\s*hop|meeting\s*room|conference\s*room)\b',
-            r'\b(?:giảng\s*đường|giang\s*duong|lecture\s*hall|lớp\s*học|lop\s*hoc|classroom)\b',
-            r'\b(?:siêu\s*thị|sieu\s*thi|market|vinmart|co\.op|coop)\b',
-            r'\b(?:bể\s*bơi|be\s*boi|pool|gym|hồ\s*bơi|ho\s*boi|fitness\s*center)\b',
-            r'\b(?:spa|salon|làm\s*đẹp|lam\s*dep|beauty\s*salon)\b',
-            r'\b(?:chợ|cho|market|traditional\s*market)\b',
-            r'\b(?:công\s*viên\s*thống\s*nhất|cong\s*vien\s*thong\s*nhat|thống\s*nhất|thong\s*nhat)\b',
-            r'\b(?:sông\s*hàn|song\s*han|cafe\s*sông\s*hàn|cafe\s*song\s*han)\b',
-            r'\b(?:hương\s*sen|huong\s*sen|café\s*hương\s*sen|cafe\s*huong\s*sen)\b',
-            r'\b(?:đà\s*nẵng|da\s*nang|lotte\s*cinema|lotte\s*cinema\s*đà\s*nẵng)\b',
-            # Additional common locations from training data
-            r'\b(?:villa|căn\s*hộ|can\s*ho|apartment|chung\s*cư|chung\s*cu)\b',
-            r'\b(?:trạm\s*xe\s*buýt|tram\s*xe\s*buyt|bus\s*station)\b',
-            r'\b(?:ga\s*tàu\s*xe\s*lửa|ga\s*tau\s*xe\s*lua|train\s*station)\b',
-            r'\b(?:cảng|cang|port|harbor)\b',
-            r'\b(?:sân\s*tennis|san\s*tennis|court)\b',
-            r'\b(?:sân\s*bóng|san\s*bong|stadium|field)\b',
-            r'\b(?:sân\s*bay\s*tân\s*sơn\s*nhất|san\s*bay\s*tan\s*son\s*nhat)\b',
-            r'\b(?:bệnh\s*viện\s*việt\s*đức|benh\s*vien\s*viet\s*duc)\b',
-            r'\b(?:trường\s*đại\s*học\s*bách\s*khoa|truong\s*dai\s*hoc\s*bach\s*khoa)\b',
-        ]
+        text_cleaned = self.location_reminder_words.sub(' ', text)
+        text_cleaned = self.multi_space_regex.sub(' ', text_cleaned).strip()
         
         # Search for location patterns (highest priority first)
         # Use text_cleaned (reminder keywords already removed)
         text_lower = text_cleaned.lower()
         
-        for pattern in known_locations:
-            match = re.search(pattern, text_lower, re.IGNORECASE)
-            if match:
-                location_candidate = match.group(0).strip()
-                
-                # Validate: Make sure it's not part of the event name
-                if event_name and location_candidate.lower() in event_name.lower():
-                    continue
-                
-                # Additional validation: Skip if it's a compound event phrase
-                # e.g., "đi chợ", "ăn buffet" where "chợ"/"buffet" is event, not location
-                # ENHANCED: Added more compound event patterns to avoid false positives
-                compound_event_patterns = [
-                    r'\b(?:đi|di|ra|den|đến|toi|tới)\s+' + re.escape(location_candidate) + r'\b',
-                    r'\b(?:ăn|an|uống|uong|mua|mua|ban|ban)\s+' + re.escape(location_candidate) + r'\b',
-                    r'\b(?:xem|xem|choi|chơi|tap|tap|hoc|học)\s+' + re.escape(location_candidate) + r'\b',
-                    r'\b(?:gap|gặp|tham|thăm|kham|khám)\s+' + re.escape(location_candidate) + r'\b',
-                ]
-                is_event_part = any(re.search(p, text_lower, re.IGNORECASE) for p in compound_event_patterns)
-                if is_event_part:
-                    continue
-                
-                # Final cleaning and validation
-                location_candidate = self._clean_location_of_time_components(location_candidate)
-                if location_candidate and self._validate_location(location_candidate):
-                    return location_candidate
+        # One scan finds the first match of every known-location pattern (see location_scanner)
+        for match in self.location_scanner.first_matches(text_lower):
+            location_candidate = text_lower[match.start:match.end].strip()
+            
+            # Validate: Make sure it's not part of the event name
+            if event_name and location_candidate.lower() in event_name.lower():
+                continue
+            
+            # Additional validation: Skip if it's a compound event phrase
+            # e.g., "đi chợ", "ăn buffet" where "chợ"/"buffet" is event, not location
+            if is_compound_event(text_lower, location_candidate):
+                continue
+            
+            # Final cleaning and validation
+            location_candidate = self._clean_location_of_time_components(location_candidate)
+            if location_candidate and self._validate_location(location_candidate):
+                return location_candidate
         
         return None
 
@@ -403,7 +504,8 @@ class NLPPipeline:
                 'bach mai', 'bạch mai', 'cho', 'chợ', 'sieu thi', 'siêu thị'
             ]
             
-            has_location_keyword = any(kw in results['event_name'].lower() for kw in location_keywords)
+            event_lower = results['event_name'].lower()
+            has_location_keyword = any(kw in event_lower for kw in location_keywords)
             
             # Only split event/location if we have location keywords
             if has_location_keyword:
@@ -619,79 +721,211 @@ class NLPPipeline:
         """
         if not text:
             return ""
+        cleaned = text
+        if self.event_cleanup_any.search(cleaned):
+            # NEW: Remove common pronoun + verb prefixes (tôi đi, tôi sẽ, mình đi, etc.)
+            # These are filler words that don't add meaning to the event
+            cleaned = self.event_pronoun_regex.sub(" ", cleaned)
+
+            # v0.6.4: Remove date patterns that leak into event name
+            # Pattern: "6.12", "06-12", "6-12", "12/12", etc.
+            for date_regex in self.event_date_regexes:
+                cleaned = date_regex.sub('', cleaned)
+
+            # v0.6.4: Remove standalone time period words if NOT part of common event phrases
+            # Check if "toi/tối" is standalone (not part of "ăn tối", "về tối", etc.)
+            # Common event phrases with time periods: "ăn sáng", "ăn trưa", "ăn tối", "về tối"
+            if not self.event_with_period_regex.search(cleaned):
+                # Remove standalone period words
+                cleaned = self.event_period_regex.sub('', cleaned)
+
+            # First pass: Remove time connectors and relative time words (always remove these)
+            cleaned = self.event_time_words_regex.sub(" ", cleaned)
+
+            # Second pass: Remove time-related words like "gio" (giờ) that are part of time expressions
+            # This fixes: "sauh gio chieu di cafe" → "di cafe" (not "gio di cafe")
+            cleaned = self.event_time_unit_regex.sub(" ", cleaned)
+
+            # Third pass: Only remove period words if they appeared in the extracted time_str
+            # This prevents removing period words that are part of event phrases
+            if time_str:
+                time_str_lower = time_str.lower()
+                for period, period_regex in self.event_period_word_regexes:
+                    # Only remove this period word if it's in the time_str
+                    if period in time_str_lower:
+                        cleaned = period_regex.sub(" ", cleaned)
+
+            # Remove location/time connectors
+            cleaned = self.event_connector_regex.sub("", cleaned)
+        # Collapse spaces and trim punctuation
+        cleaned = self.multi_space_regex.sub(" ", cleaned).strip(' ,.-').strip()
+        return cleaned
+
+    def process(self, text: str) -> Dict[str, Any]:
+        processed_text = NormalizedText.of(text).lowered
+        entry = self._cache.get(processed_text) if self._cache is not None else None
+        fresh = entry is None
+        if fresh:
+            reminder_minutes, text_wo_reminder, ex = self._extract_fields(processed_text)
+            # NER not run yet (False); None or a location once it has
+            entry = [reminder_minutes, ex, text_wo_reminder, False]
+        # 4) If still no location, try NER as final backup (slowest, gated on location cues if enabled)
+        ex = self._ner_fallback(processed_text, entry, text, fresh)
+        # Time is resolved on every call: it depends on the base down to the minute
+        return self._build_result(ex, entry[0], self.relative_base)
+
+    def process_batch(self, texts: Iterable[str], relative_base: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """
+        Process many texts at once. Same output as [process(t) for t in texts].
         
-        # NEW: Remove common pronoun + verb prefixes (tôi đi, tôi sẽ, mình đi, etc.)
-        # These are filler words that don't add meaning to the event
-        pronoun_verb_patterns = r"\b(?:toi|tôi|minh|mình|chúng\s*tôi|chung\s*toi)\s+(?:di|đi|se|sẽ|can|cần|phai|phải|muon|muốn|den|đến|ve|về)\b"
-        cleaned = re.sub(pronoun_verb_patterns, " ", text, flags=re.IGNORECASE)
-        
-        # v0.6.4: Remove date patterns that leak into event name
-        # Pattern: "6.12", "06-12", "6-12", "12/12", etc.
-        cleaned = re.sub(r'\b\d{1,2}[-./]\d{1,2}\b', '', cleaned)
-        cleaned = re.sub(r'\b\d{1,2}\.\d{1,2}\b', '', cleaned)
-        
-        # v0.6.4: Remove standalone time period words if NOT part of common event phrases
-        # Check if "toi/tối" is standalone (not part of "ăn tối", "về tối", etc.)
-        # Common event phrases with time periods: "ăn sáng", "ăn trưa", "ăn tối", "về tối"
-        event_with_period = r'\b(?:an|ăn|ve|về)\s+(?:sang|sáng|trua|trưa|toi|tối|chieu|chiều)\b'
-        if not re.search(event_with_period, cleaned, re.IGNORECASE):
-            # Remove standalone period words
-            cleaned = re.sub(r'\b(?:toi|tối|sang|sáng|trua|trưa|chieu|chiều)\b', '', cleaned, flags=re.IGNORECASE)
-        
-        # First pass: Remove time connectors and relative time words (always remove these)
-        time_connectors = r"(?:vào|vao|lúc|luc|vào\s+lúc|vao\s+luc|khoảng|khoang|từ|tu|đến|den|tới|cho\s+đến|cho\s+den|bắt\s+đầu|bat\s+dau|kết\s+thúc|ket\s+thuc)"
-        relative_time = r"(?:hôm\s*nay|hom\s*nay|ngày\s*mai|ngay\s*mai|mai|ngày\s*mốt|ngay\s*mot|mốt|mot|hôm\s*qua|hom\s*qua|qua|nay|tuần\s*sau|tuan\s*sau|tuần\s*trước|tuan\s*truoc)"
-        timezone_words = r"(?:utc|gmt|múi\s*giờ|mui\s*gio)"
+        All inputs are normalized up front and each stage runs across the batch;
+        identical inputs are extracted once and NER only runs for the residues
+        that still lack a location (each distinct residue once).
         
-        cleaned = re.sub(fr"\b({time_connectors}|{relative_time}|{timezone_words})\b", " ", cleaned, flags=re.IGNORECASE)
+        Args:
+            texts: Input texts
+            relative_base: Base datetime for relative time parsing (default: the
+                pipeline's relative_base, else datetime.now() taken once for the whole batch)
+            
+        Returns:
+            One result dict per input, in order
+        """
+        base = relative_base or self.relative_base or datetime.now()
+        texts = list(texts)
+        normalized = [NormalizedText.of(t).lowered for t in texts]
+        unique = list(dict.fromkeys(normalized))
         
-        # Second pass: Remove time-related words like "gio" (giờ) that are part of time expressions
-        # This fixes: "sauh gio chieu di cafe" → "di cafe" (not "gio di cafe")
-        time_unit_words = r"(?:giờ|gio|phút|phut)"
-        cleaned = re.sub(fr"\b{time_unit_words}\b", " ", cleaned, flags=re.IGNORECASE)
+        entries: Dict[str, Any] = {}
+        if self._cache is not None:
+            for text in unique:
+                cached = self._cache.get(text)
+                if cached is not None:
+                    entries[text] = cached
+        misses = [t for t in unique if t not in entries]
         
-        # Third pass: Only remove period words if they appeared in the extracted time_str
-        # This prevents removing period words that are part of event phrases
-        if time_str:
-            period_words = ['sáng', 'sang', 'trưa', 'trua', 'chiều', 'chieu', 'tối', 'toi', 'đêm', 'dem', 'khuya']
-            time_str_lower = time_str.lower()
-            
-            for period in period_words:
-                # Only remove this period word if it's in the time_str
-                if period in time_str_lower:
-                    cleaned = re.sub(fr"\b{period}\b", " ", cleaned, flags=re.IGNORECASE)
+        # 1-3) Reminder, regex and heuristic location for every distinct uncached input
+        for text in misses:
+            reminder_minutes, text_wo_reminder, ex = self._extract_fields(text)
+            entries[text] = [reminder_minutes, ex, text_wo_reminder, False]
         
-        # Remove location/time connectors
-        cleaned = re.sub(r"\b(vào|vao|lúc|luc|khoảng|khoang|tại|tai|ở|o)\b", "", cleaned, flags=re.IGNORECASE)
-        # Collapse spaces and trim punctuation
-        cleaned = re.sub(r"\s{2,}", " ", cleaned).strip(' ,.-').strip()
-        return cleaned
+        # 4) NER fallback per input (the gate may look at how it was typed), each residue once
+        ner_locations: Dict[str, Optional[str]] = {}
+        fresh = set(misses)
+        results = {}
+        out = []
+        for raw, text in zip(texts, normalized):
+            entry = entries[text]
+            ex = self._ner_fallback(text, entry, raw, text in fresh, ner_locations)
+            fresh.discard(text)
+            key = (text, ex is not entry[1])
+            if key not in results:
+                results[key] = self._build_result(ex, entry[0], base)
+            out.append(dict(results[key]))
+        return out
 
-    def process(self, text: str) -> Dict[str, Any]:
-        processed_text = text.lower() if text else ''
+    def _ner_fallback(self, key: str, entry: List[Any], raw_text: str, fresh: bool,
+                      ner_locations: Optional[Dict[str, Optional[str]]] = None) -> Dict[str, Any]:
+        """
+        Entities of a parse cache entry, with the NER location if the earlier stages found none.
+
+        entry is [reminder_minutes, entities, text_without_reminder, ner_location]
+        (ner_location False until NER has run on it). The gate decides per call
+        from raw_text, so NER results are stored in the entry, never in its entities.
+
+        Args:
+            key: Parse cache key of entry (lowercased input)
+            entry: Cache entry, stored (again) once NER has run on it
+            raw_text: The input as typed (capitalization cue for the NER gate)
+            fresh: entry was just extracted (not a cache hit): count a gate skip
+            ner_locations: NER results by residue, shared across a batch
+        """
+        _, ex, text_wo_reminder, loc_ner = entry
+        store = fresh
+        if not ex.get('location'):
+            if self.scheduler.ner_can_help(text_wo_reminder, raw_text):
+                if loc_ner is False:
+                    if ner_locations is not None and text_wo_reminder in ner_locations:
+                        loc_ner = ner_locations[text_wo_reminder]
+                    else:
+                        with self.scheduler.timed('ner') as hit:
+                            loc_ner = self._extract_location_ner(text_wo_reminder)[0]
+                            hit[0] = bool(loc_ner and self._clean_location_of_time_components(loc_ner))
+                        if ner_locations is not None:
+                            ner_locations[text_wo_reminder] = loc_ner
+                    entry[3] = loc_ner
+                    store = True
+                ex = dict(ex)
+                self._apply_ner_location(ex, loc_ner)
+            elif fresh:
+                self.scheduler.record_skip('ner')
+        if store and self._cache is not None:
+            self._cache.put(key, entry)
+        return ex
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """Parse cache hit/miss counters (empty dict if the cache is disabled)"""
+        return self._cache.stats() if self._cache is not None else {}
+
+    def stage_stats(self) -> Dict[str, Any]:
+        """Per location stage: runs, hits, hit_rate, skipped (NER gate), avg_ms (parse cache misses only)"""
+        return self.scheduler.stats()
+
+    def _extract_fields(self, processed_text: str) -> Tuple[int, str, Dict[str, Any]]:
+        """Reminder, time/event/location regex and heuristic location on lowercased text.
+        Trả về: (reminder_minutes, text_without_reminder, entities)
+        """
         # 1) Extract reminder minutes first, strip reminder phrases from text to avoid leaking into location
         reminder_minutes, text_wo_reminder, has_reminder_phrase = self._extract_reminder(processed_text)
         # 2) Extract entities (time, location, event) - location fallback runs inside _extract_entities_regex
-        ex = self._extract_entities_regex(text_wo_reminder)
+        with self.scheduler.timed('regex') as hit:
+            ex = self._extract_entities_regex(text_wo_reminder)
+            hit[0] = bool(ex.get('location'))
         # 3) v1.0.7: If location not found by regex, try heuristic extraction (no marker needed)
         if not ex.get('location'):
-            loc_heuristic = self._extract_location_heuristic(text_wo_reminder, ex.get('event_name', ''))
-            if loc_heuristic:
-                ex['location'] = loc_heuristic
-        # 4) If still no location, try NER as final backup (slowest but most comprehensive)
-        if not ex.get('location'):
-            loc_ner, _ = self._extract_location_ner(text_wo_reminder)
-            if loc_ner:
-                # CRITICAL FIX v0.6.3: Enhanced time component filtering for NER
-                loc_ner = self._clean_location_of_time_components(loc_ner)
-                if loc_ner:  # Only set if something remains after cleaning
-                    ex['location'] = loc_ner
-        # Parse time
-        start_dt, end_dt = parse_vietnamese_time_range(ex['time_str'], relative_base=self.relative_base)
+            with self.scheduler.timed('heuristic') as hit:
+                loc_heuristic = self._extract_location_heuristic(text_wo_reminder, ex.get('event_name', ''))
+                if loc_heuristic:
+                    ex['location'] = loc_heuristic
+                    hit[0] = True
+        # 3b) External gazetteer (provinces, streets, rooms...) before the slower NER
+        if not ex.get('location') and self.gazetteer is not None:
+            with self.scheduler.timed('gazetteer') as hit:
+                loc_gazetteer = self._extract_location_gazetteer(text_wo_reminder)
+                if loc_gazetteer:
+                    ex['location'] = loc_gazetteer
+                    hit[0] = True
+        return reminder_minutes, text_wo_reminder, ex
+
+    def _extract_location_gazetteer(self, text: str) -> Optional[str]:
+        """Longest gazetteer name in text (2+ words: single words are too ambiguous in free text).
+        Trả về cụm địa điểm như người dùng gõ, hoặc None.
+        """
+        # No compound-verb guard here: gazetteer names are specific places ("đi chơi Vũng Tàu")
+        for match in self.gazetteer.find(text, min_words=2):
+            candidate = text[match.start:match.end].strip()
+            candidate = self._clean_location_of_time_components(candidate)
+            if candidate and self._validate_location(candidate):
+                return candidate
+        return None
+
+    def _apply_ner_location(self, ex: Dict[str, Any], loc_ner: Optional[str]) -> None:
+        """Set the NER location on ex (after stripping time components)"""
+        if loc_ner:
+            # CRITICAL FIX v0.6.3: Enhanced time component filtering for NER
+            loc_ner = self._clean_location_of_time_components(loc_ner)
+            if loc_ner:  # Only set if something remains after cleaning
+                ex['location'] = loc_ner
+
+    def _build_result(self, ex: Dict[str, Any], reminder_minutes: int,
+                      relative_base: Optional[datetime]) -> Dict[str, Any]:
+        """Resolve time_str against relative_base and assemble the result dict"""
+        # Parse time (time string normalized once, reused by the parser and the fallbacks below)
+        time_text = NormalizedText.of(ex['time_str']) if ex.get('time_str') else None
+        start_dt, end_dt = parse_vietnamese_time_range(time_text, relative_base=relative_base)
         # If parsing produced no start_dt but we have a period-only time_str (e.g., "tối", "hôm nay"),
         # infer a reasonable default hour so 'gặp nay' / 'học tối' produce a start_time.
-        if not start_dt and ex.get('time_str'):
-            ts = ex['time_str'].lower()
+        if not start_dt and time_text:
+            ts = time_text.lowered
             # Map period words to default hours
             period_map = {
                 'sáng': 9, 'sang': 9, 'sáng': 9, 'sang': 9,
@@ -708,7 +942,7 @@ class NLPPipeline:
             # If found a period, build a datetime at that hour for the relative date
             if chosen_hour is not None:
                 try:
-                    base = self.relative_base or datetime.now()
+                    base = relative_base or datetime.now()
                     # Use parse_vietnamese_time_range to resolve the date (day/month/year) if possible
                     # Fallback: if parse didn't resolve day, assume today/relative base
                     # We'll set start_dt to base with chosen_hour and zero minutes
@@ -718,8 +952,8 @@ class NLPPipeline:
         
         # ENHANCED: If still no time but we have relative time context, infer default time
         # This handles cases like "tháng này điều trị" (this month treatment) - assume morning
-        if not start_dt and ex.get('time_str'):
-            ts_lower = ex['time_str'].lower()
+        if not start_dt and time_text:
+            ts_lower = time_text.lowered
             # Check for relative time indicators that suggest we should have a time
             relative_indicators = [
                 'tháng này', 'thang nay', 'tuần này', 'tuan nay', 'tuần sau', 'tuan sau',
@@ -734,7 +968,7 @@ class NLPPipeline:
             if has_relative:
                 # Infer morning time (9 AM) for relative time expressions without explicit hours
                 try:
-                    base = self.relative_base or datetime.now()
+                    base = relative_base or datetime.now()
                     start_dt = base.replace(hour=9, minute=0, second=0, microsecond=0)
                 except Exception:
                     start_dt = None
@@ -755,49 +989,75 @@ class NLPPipeline:
         minutes = 0
         has = False
         working = text
-        # Try different forms, prioritize the first explicit number found
-        for rx, factor in [
-            (self.reminder_month_regex1, 43200),  # 30 days * 24 hours * 60 min
-            (self.reminder_week_regex1, 10080),   # 7 days * 24 hours * 60 min
-            (self.reminder_day_regex1, 1440),     # 24 hours * 60 min
-            (self.reminder_hour_regex1, 60),
-            (self.reminder_min_regex1, 1),
-            (self.reminder_month_regex2, 43200),
-            (self.reminder_week_regex2, 10080),
-            (self.reminder_day_regex2, 1440),
-            (self.reminder_hour_regex2, 60),
-            (self.reminder_min_regex2, 1),
-        ]:
-            m = rx.search(working)
-            if m:
-                try:
-                    val = int(m.group(1))
-                    minutes = max(minutes, val * factor)
-                except Exception:
-                    pass
-                has = True
-                working = working.replace(m.group(0), ' ').strip()
+        firsts, presence, keywords = self._scan_reminder(working)
+        # Forms in priority order, the first explicit number found per form wins the max.
+        # A removal changes the text, so later forms are looked up on a fresh scan.
+        for i, (_, _, _, factor) in enumerate(self._reminder_forms):
+            hit = firsts[i]
+            if hit is None:
+                continue
+            start, end, val = hit
+            minutes = max(minutes, val * factor)
+            has = True
+            working = working.replace(working[start:end], ' ').strip()
+            keywords = None
+            # Every numeric form needs a reminder verb: none left, no later form can match
+            if self.reminder_verb_regex.search(working) is None:
+                break
+            firsts = self._scan_reminder(working)[0]
         # If no number captured but reminder words exist, strip them
-        if not has:
-            if self.reminder_presence_regex.search(working):
-                has = True
-                working = self.reminder_presence_regex.sub(' ', working).strip()
-        
+        if not has and presence:
+            has = True
+            working = _replace_spans(working, presence, ' ').strip()
+            keywords = None
+
         # v1.0.7: Clean standalone reminder keywords that weren't matched by patterns
-        # (e.g., "before 2" when pattern matched "nhac 2 week" but left "before" behind)
-        standalone_reminder = r'\b(?:before|earlier|notify|som|sớm|hon|hơn)\b'
-        working = re.sub(standalone_reminder, ' ', working, flags=re.IGNORECASE)
-        
+        if keywords is None:
+            working = self.reminder_standalone_regex.sub(' ', working)
+        elif keywords:
+            working = _replace_spans(working, keywords, ' ')
+
         # Collapse multiple spaces
-        working = re.sub(r"\s{2,}", " ", working).strip()
+        working = self.multi_space_regex.sub(' ', working).strip()
         return minutes, working, has
 
+    def _scan_reminder(self, view: str):
+        """One pass of the reminder grammar over view.
+        Trả về: (first (start, end, number) per form or None, presence spans, keyword spans);
+        presence/keyword spans are the non-overlapping matches re.sub would replace.
+        """
+        firsts: List[Optional[Tuple[int, int, int]]] = [None] * len(self._reminder_forms)
+        presence: List[Tuple[int, int]] = []
+        keywords: List[Tuple[int, int]] = []
+        for m in self.reminder_grammar.finditer(view):
+            groups = m.groups()
+            for family in self._reminder_families:
+                fg, ng, unit_groups = family
+                if groups[fg - 1] is None:
+                    continue
+                for i, ug in unit_groups:
+                    if groups[ug - 1] is not None:
+                        if firsts[i] is None:
+                            start, end = m.span(fg)
+                            firsts[i] = (start, end, int(groups[ng - 1]))
+                        break
+            if groups[self._reminder_presence_group - 1] is not None:
+                start, end = m.span(self._reminder_presence_group)
+                if not presence or start >= presence[-1][1]:
+                    presence.append((start, end))
+            for kg in self._reminder_keyword_groups:
+                if groups[kg - 1] is not None:
+                    start, end = m.span(kg)
+                    if not keywords or start >= keywords[-1][1]:
+                        keywords.append((start, end))
+        return firsts, presence, keywords
+
     def _clean_location_of_reminder(self, loc: Optional[str]) -> Optional[str]:
         if not loc:
             return loc
         # Remove reminder keywords from location, both diacritic and non-diacritic
         loc2 = self.reminder_presence_regex.sub(' ', loc)
-        loc2 = re.sub(r"\s{2,}", " ", loc2).strip(" ,.-").strip()
+        loc2 = self.multi_space_regex.sub(' ', loc2).strip(" ,.-").strip()
         return loc2 or None
     
     def _validate_location(self, loc: Optional[str]) -> bool:
@@ -899,51 +1159,13 @@ class NLPPipeline:
         if not loc:
             return loc
         
-        original = loc
-        
-        # Pattern 1: Remove "X:00 thứ Y" → "00 thứ Y" (e.g., "18:00 thứ 2" → "00 thứ 2")
-        loc = re.sub(r'\b\d{1,2}:00\s+', '', loc, flags=re.IGNORECASE)
-        
-        # Pattern 2: Remove "Xh thứ Y" → "h thứ Y" (e.g., "9h thứ 2" → "h thứ 2")
-        loc = re.sub(r'\b\d{1,2}h\s+', '', loc, flags=re.IGNORECASE)
-        
-        # Pattern 3: Remove standalone time indicators
-        # "thứ 2", "thứ 3", "t2", "t3", etc.
-        time_day_patterns = [
-            r'\b(?:thứ|thu)\s*[2-8]\b',  # thứ 2-8
-            r'\bt[2-8]\b',                # t2-t8
-            r'\bcn\b',                    # cn (chủ nhật)
-        ]
-        for pattern in time_day_patterns:
-            loc = re.sub(pattern, '', loc, flags=re.IGNORECASE)
-        
-        # Pattern 4: Remove "h sáng/chiều/tối/trưa" patterns
-        loc = re.sub(r'\bh\s+(?:sáng|sang|chiều|chieu|tối|toi|trưa|trua)\b', '', loc, flags=re.IGNORECASE)
-        
-        # Pattern 5: Remove "h ngày X" patterns
-        loc = re.sub(r'\bh\s+(?:ngày|ngay)\s+\w+\b', '', loc, flags=re.IGNORECASE)
-        
-        # Pattern 6: Remove standalone "00" from ":00"
-        loc = re.sub(r'\b00\b', '', loc)
-        
-        # Pattern 7: Remove standalone "h" or "giờ"
-        loc = re.sub(r'\b(?:h|giờ|gio)\b', '', loc, flags=re.IGNORECASE)
-        
-        # Pattern 8: Remove year/month/day patterns (already handled but double-check)
-        loc = re.sub(r'\b(?:năm|nam)\s+\d{4}\b', '', loc, flags=re.IGNORECASE)
-        loc = re.sub(r'\b(?:tháng|thang)\s+\d{1,2}\b', '', loc, flags=re.IGNORECASE)
-        loc = re.sub(r'\b(?:ngày|ngay)\s+\d{1,2}\b', '', loc, flags=re.IGNORECASE)
-        
-        # Pattern 9: Remove time range indicators
-        loc = re.sub(r'\b(?:mai|hôm nay|hom nay|ngày mai|ngay mai)\b', '', loc, flags=re.IGNORECASE)
-        loc = re.sub(r'\b(?:sáng|sang|chiều|chieu|tối|toi|trưa|trua)\s+(?:mai|nay)\b', '', loc, flags=re.IGNORECASE)
-        
-        # Pattern 10: Remove "ngày mốt", "ngày kia", "mai mốt"
-        loc = re.sub(r'\b(?:ngày|ngay)\s+(?:mốt|mot|kia)\b', '', loc, flags=re.IGNORECASE)
-        loc = re.sub(r'\b(?:mai)\s+(?:mốt|mot)\b', '', loc, flags=re.IGNORECASE)
+        # Remove every time component (patterns in __init__, applied in order)
+        if self.location_time_component_any.search(loc):
+            for component_regex in self.location_time_component_regexes:
+                loc = component_regex.sub('', loc)
         
         # Clean up whitespace
-        loc = re.sub(r'\s{2,}', ' ', loc).strip(" ,.-").strip()
+        loc = self.multi_space_regex.sub(' ', loc).strip(" ,.-").strip()
         
         # If nothing left or only punctuation/numbers, return None
         if not loc or len(loc) <= 2 or loc.isdigit() or all(c in ' ,.-:' for c in loc):
@@ -0,0 +1,87 @@
+"""
+Process Memory - resident set size of the current process, without psutil
+Reads /proc/self/status (Linux), the working set from K32GetProcessMemoryInfo
+(Windows); elsewhere falls back to the peak RSS from resource.getrusage, or
+None when none of them is available.
+
+release_memory() hands freed heap pages back to the OS after a large object
+(a transformer model) was dropped.
+"""
+from __future__ import annotations
+import ctypes
+import gc
+import sys
+from typing import Optional
+
+try:
+    import resource
+    RESOURCE_AVAILABLE = True
+except ImportError:
+    RESOURCE_AVAILABLE = False
+
+
+class _ProcessMemoryCounters(ctypes.Structure):
+    """PROCESS_MEMORY_COUNTERS (psapi.h)"""
+    _fields_ = [
+        ('cb', ctypes.c_ulong),
+        ('PageFaultCount', ctypes.c_ulong),
+        ('PeakWorkingSetSize', ctypes.c_size_t),
+        ('WorkingSetSize', ctypes.c_size_t),
+        ('QuotaPeakPagedPoolUsage', ctypes.c_size_t),
+        ('QuotaPagedPoolUsage', ctypes.c_size_t),
+        ('QuotaPeakNonPagedPoolUsage', ctypes.c_size_t),
+        ('QuotaNonPagedPoolUsage', ctypes.c_size_t),
+        ('PagefileUsage', ctypes.c_size_t),
+        ('PeakPagefileUsage', ctypes.c_size_t),
+    ]
+
+
+def _windows_working_set() -> Optional[int]:
+    """Working set of the current process in bytes (Windows), or None"""
+    try:
+        kernel32 = ctypes.WinDLL('kernel32')
+        kernel32.GetCurrentProcess.restype = ctypes.c_void_p
+        get_info = kernel32.K32GetProcessMemoryInfo
+        get_info.argtypes = [ctypes.c_void_p, ctypes.POINTER(_ProcessMemoryCounters), ctypes.c_ulong]
+        get_info.restype = ctypes.c_int
+    except (AttributeError, OSError):
+        return None  # before Windows 7 the function lives in psapi.dll only
+    counters = _ProcessMemoryCounters()
+    counters.cb = ctypes.sizeof(counters)
+    if not get_info(kernel32.GetCurrentProcess(), ctypes.byref(counters), counters.cb):
+        return None
+    return counters.WorkingSetSize
+
+
+def current_rss_bytes() -> Optional[int]:
+    """Current resident set size in bytes (peak RSS where the current one is unknown), or None"""
+    if sys.platform == 'win32':
+        return _windows_working_set()
+    try:
+        with open('/proc/self/status', encoding='ascii') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError):
+        pass
+    if RESOURCE_AVAILABLE:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # kilobytes on Linux, bytes on macOS
+        return peak if sys.platform == 'darwin' else peak * 1024
+    return None
+
+
+def current_rss_mb() -> Optional[float]:
+    """current_rss_bytes() in MiB"""
+    rss = current_rss_bytes()
+    return rss / (1024 * 1024) if rss is not None else None
+
+
+def release_memory() -> None:
+    """Collect garbage and, on glibc, return free heap pages to the OS (malloc_trim)"""
+    gc.collect()
+    if sys.platform.startswith('linux'):
+        try:
+            ctypes.CDLL('libc.so.6').malloc_trim(0)
+        except (OSError, AttributeError):
+            pass  # not glibc (e.g. musl)
@@ -0,0 +1,142 @@
+"""
+Stage Scheduler - run the expensive location stages only when they can matter
+Location extraction tries its stages from cheap to expensive and stops at the
+first hit: regex ("ở/tại ..."), heuristic known-location scanner, gazetteer,
+then underthesea NER, which costs more than all the others together.
+
+Most inputs reaching NER have no location at all ("đi khám bệnh lúc 9h"), and
+NER then tags pieces of the time or the event as a place. With gate_ner=True
+the scheduler looks at cheap cues and skips NER when none is present:
+
+    - a location marker left over ("ở", "tại", "o", "tai") that the regex stage
+      could not turn into a valid location
+    - a known-location word the heuristic stage rejected ("phòng", "chợ"...)
+    - a single-word gazetteer name (the gazetteer stage only accepts 2+ words)
+    - a capitalized word after the first one in the text as typed ("sân Chảo
+      Lửa"): NER runs on the lowercased residue, so this is the only trace of
+      a proper name the user wrote without a marker
+
+The gate is off by default: place names typed in lowercase without a marker
+("cắt tóc 6 rưỡi tối sân chảo lửa") have no cue, and gating drops the
+location NER would find for them.
+
+Every stage records runs, hits (it supplied the location), skips and time
+spent, so the stage order and the NER gate can be tuned from real traffic
+(NLPPipeline.stage_stats()).
+"""
+from __future__ import annotations
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+# Stage names, in the order the pipeline tries them
+STAGES = ('regex', 'heuristic', 'gazetteer', 'ner')
+
+_LOCATION_MARKER_RE = re.compile(r'(?<!\w)(?:ở|o|tại|tai)(?!\w)')
+
+
+def has_inner_capital(raw_text: str) -> bool:
+    """True if a word other than the first of a sentence starts with a capital letter."""
+    sentence_start = True
+    for word in raw_text.split():
+        if not sentence_start and word[0].isupper():
+            return True
+        sentence_start = word.endswith(('.', '!', '?'))
+    return False
+
+
+class StageScheduler:
+    """NER gate + per-stage run/hit/skip counters and timings (thread-safe)."""
+
+    def __init__(self, location_scanner, gazetteer=None, gate_ner: bool = False):
+        """
+        Args:
+            location_scanner: LocationScanner of the pipeline (known-location cue)
+            gazetteer: Optional Gazetteer (single-word name cue)
+            gate_ner: Skip NER when no cue is present (False = always run it)
+        """
+        self.location_scanner = location_scanner
+        self.gazetteer = gazetteer
+        self.gate_ner = gate_ner
+        self._lock = threading.Lock()
+        self._counters: Dict[str, List[float]] = {}
+        self.reset()
+
+    def ner_can_help(self, text: str, raw_text: Optional[str] = None) -> bool:
+        """
+        True if NER may find a location in text that the cheaper stages missed.
+
+        Args:
+            text: Lowercased residue NER would run on
+            raw_text: The input as typed (capitalization cue), if available
+        """
+        if not self.gate_ner:
+            return True
+        if not text or not text.strip():
+            return False
+        if _LOCATION_MARKER_RE.search(text):
+            return True
+        if self.location_scanner.first_matches(text):
+            return True
+        if self.gazetteer is not None and self.gazetteer.find(text, min_words=1):
+            return True
+        if raw_text and has_inner_capital(raw_text):
+            return True
+        return False
+
+    @contextmanager
+    def timed(self, stage: str) -> Iterator[List[bool]]:
+        """
+        Time one run of stage; set hit[0] = True inside the block if it found the location.
+
+            with scheduler.timed('ner') as hit:
+                loc = ...
+                hit[0] = bool(loc)
+        """
+        hit = [False]
+        t0 = time.perf_counter()
+        try:
+            yield hit
+        finally:
+            self.record(stage, hit[0], time.perf_counter() - t0)
+
+    def record(self, stage: str, hit: bool, seconds: float = 0.0) -> None:
+        """Count one run of stage."""
+        with self._lock:
+            c = self._counters[stage]
+            c[0] += 1
+            c[1] += hit
+            c[3] += seconds
+
+    def record_skip(self, stage: str, count: int = 1) -> None:
+        """Count runs of stage the gate avoided."""
+        with self._lock:
+            self._counters[stage][2] += count
+
+    def reset(self) -> None:
+        with self._lock:
+            # stage -> [runs, hits, skipped, seconds]
+            self._counters = {stage: [0, 0, 0, 0.0] for stage in STAGES}
+
+    def stats(self, stage: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Per-stage counters.
+
+        Returns:
+            {stage: {'runs', 'hits', 'hit_rate', 'skipped', 'avg_ms', 'total_ms'}},
+            or the dict of one stage if stage is given
+        """
+        with self._lock:
+            out = {}
+            for name, (runs, hits, skipped, seconds) in self._counters.items():
+                out[name] = {
+                    'runs': runs,
+                    'hits': hits,
+                    'hit_rate': hits / runs if runs else 0.0,
+                    'skipped': skipped,
+                    'avg_ms': seconds * 1000 / runs if runs else 0.0,
+                    'total_ms': seconds * 1000,
+                }
+        return out[stage] if stage is not None else out
@@ -1,36 +1,163 @@
 from __future__ import annotations
 import re
-from datetime import datetime, timedelta, timezone
-from typing import Optional
-import unicodedata
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
 try:
     from zoneinfo import ZoneInfo  # Python 3.9+
 except Exception:
     ZoneInfo = None  # Fallback: will use fixed offset
+from .normalized_text import NormalizedText, vn_fold
 
 def _vn_norm(s: str) -> str:
-    """Lowercase and remove Vietnamese diacritics for matching; map đ->d."""
-    if not s:
-        return ''
-    s = s.lower()
-    s = s.replace('đ', 'd').replace('Đ', 'D')
-    
-    # Fix typo numbers: "sauh" -> "sau", "namh" -> "nam", etc.
-    typo_map = {
-        'moth': 'mot', 'haih': 'hai', 'bah': 'ba', 'bonh': 'bon', 
-        'tuh': 'tu', 'namh': 'nam', 'sauh': 'sau', 'bayh': 'bay', 
-        'tamh': 'tam', 'chinh': 'chin', 'muoih': 'muoi'
-    }
-    for typo, correct in typo_map.items():
-        s = s.replace(typo, correct)
-    
-    nfkd = unicodedata.normalize('NFKD', s)
-    return ''.join(c for c in nfkd if not unicodedata.combining(c))
+    """Lowercase and remove Vietnamese diacritics for matching; map đ->d (memoized, see vn_fold)."""
+    return vn_fold(s)
 
 # Only apply timezone when explicitly specified in the text. Default: naive datetimes for compatibility.
 DEFAULT_TZ = None  # Could be ZoneInfo("Asia/Ho_Chi_Minh") if desired
 
 
+# --- Lexer ---
+# Every stage below used to rescan (and rewrite) the normalized string with its own
+# regex cascade. Instead the folded text is cut once into typed tokens; the parser
+# stages dispatch on the tokens (keyword words, separators, period words) and only
+# run a compiled pattern where a numeric form (clock, date, duration, timezone,
+# weekday) can actually start. Lexing is memoized per string.
+#
+# Tokens follow regex word semantics: digit and letter runs that touch ("10h30",
+# "thu3") are glued into one regex word (no \b between them); a token is "alone"
+# when it is a whole word by itself, i.e. what \bword\b matches.
+NUMBER = 'number'        # 10, 2025
+HOUR = 'hour'            # h, gio
+MINUTE = 'minute'        # p, phut
+PERIOD = 'period'        # sang, trua, chieu, toi, dem, noon, midnight
+WEEKDAY = 'weekday'      # thu, t, cn, chu, nhat
+RELATIVE = 'relative'    # mai, nay, hom, ngay, kia, tuan, thang, nam, ...
+SEPARATOR = 'separator'  # den, -, –, —, ―, −
+TIMEZONE = 'timezone'    # utc, gmt, mui
+WORD = 'word'            # any other letters (number words, luc, tu, ...)
+SPACE = 'space'
+PUNCT = 'punct'
+
+_WORD_KINDS = {
+    'h': HOUR, 'gio': HOUR,
+    'p': MINUTE, 'phut': MINUTE,
+    'sang': PERIOD, 'trua': PERIOD, 'chieu': PERIOD, 'toi': PERIOD, 'dem': PERIOD,
+    'noon': PERIOD, 'midnight': PERIOD,
+    'thu': WEEKDAY, 't': WEEKDAY, 'cn': WEEKDAY, 'chu': WEEKDAY, 'nhat': WEEKDAY,
+    'mai': RELATIVE, 'nay': RELATIVE, 'hom': RELATIVE, 'ngay': RELATIVE, 'kia': RELATIVE,
+    'cuoi': RELATIVE, 'tuan': RELATIVE, 'thang': RELATIVE, 'nam': RELATIVE, 'sau': RELATIVE,
+    'trong': RELATIVE, 'nua': RELATIVE,
+    'den': SEPARATOR,
+    'utc': TIMEZONE, 'gmt': TIMEZONE, 'mui': TIMEZONE,
+}
+_DASHES = frozenset('-–—―−')
+_LEXEME_RE = re.compile(r"(\d+)|([^\W\d]+)|(\s+)|(.)", re.DOTALL)
+
+
+class _Token:
+    __slots__ = ('kind', 'text', 'start', 'w', 'glued', 'alone')
+
+    def __init__(self, kind: str, text: str, start: int, w: bool, glued: bool):
+        self.kind = kind
+        self.text = text
+        self.start = start
+        self.w = w            # regex word chars (\w)
+        self.glued = glued    # same regex word as the previous token
+        self.alone = False    # whole regex word by itself (set by _lex)
+
+    def __repr__(self) -> str:
+        return f"{self.kind}:{self.text!r}"
+
+
+class _Lexed:
+    __slots__ = ('text', 'tokens', 'words')
+
+    def __init__(self, text: str, tokens: Tuple[_Token, ...]):
+        self.text = text
+        self.tokens = tokens
+        # Whole letter words present, for keyword dispatch ("mai" in words <=> \bmai\b matches)
+        self.words = frozenset(t.text for t in tokens if t.alone and t.kind != NUMBER)
+
+
+@lru_cache(maxsize=4096)
+def _lex(s: str) -> _Lexed:
+    """Cut s into tokens: digit runs, letter runs, whitespace runs, other chars one by one."""
+    tokens: List[_Token] = []
+    prev_w = False
+    for m in _LEXEME_RE.finditer(s):
+        group = m.lastindex
+        text = m.group()
+        if group == 1:
+            kind = NUMBER
+        elif group == 2:
+            kind = _WORD_KINDS.get(text, WORD)
+        elif group == 3:
+            kind = SPACE
+        else:
+            kind = SEPARATOR if text in _DASHES else PUNCT
+        w = group <= 2
+        tokens.append(_Token(kind, text, m.start(), w, w and prev_w))
+        prev_w = w
+    for i, t in enumerate(tokens):
+        if t.w and not t.glued and not (i + 1 < len(tokens) and tokens[i + 1].glued):
+            t.alone = True
+    return _Lexed(s, tuple(tokens))
+
+
+# --- Token patterns ---
+# A pattern is a sequence of: a word (whole word equal to it), a set of words,
+# _SP (a whitespace run, \s+) or ' ' (exactly one space, a literal in the old regexes).
+_SP = None
+
+
+def _match_at(tokens: Tuple[_Token, ...], i: int, pattern) -> int:
+    """Index after the match of pattern at tokens[i], or -1."""
+    n = len(tokens)
+    for part in pattern:
+        if i >= n:
+            return -1
+        t = tokens[i]
+        if part is _SP:
+            if t.kind != SPACE:
+                return -1
+        elif part == ' ':
+            if t.text != ' ':
+                return -1
+        elif not t.alone or (t.text != part if isinstance(part, str) else t.text not in part):
+            return -1
+        i += 1
+    return i
+
+
+def _find(lx: _Lexed, pattern) -> int:
+    """Token index of the first match of pattern, or -1 (like re.search)."""
+    first = pattern[0]
+    if (first not in lx.words) if isinstance(first, str) else first.isdisjoint(lx.words):
+        return -1
+    for i in range(len(lx.tokens)):
+        if _match_at(lx.tokens, i, pattern) >= 0:
+            return i
+    return -1
+
+
+def _remove(lx: _Lexed, *patterns) -> str:
+    """Text with every match of the patterns removed, left to right (like re.sub(..., '', text))."""
+    tokens = lx.tokens
+    out = []
+    i = 0
+    while i < len(tokens):
+        for pattern in patterns:
+            end = _match_at(tokens, i, pattern)
+            if end >= 0:
+                i = end
+                break
+        else:
+            out.append(tokens[i].text)
+            i += 1
+    return ''.join(out)
+
+
 def _has_period_flags(s_norm: str) -> dict[str, bool]:
     """Detect period hints: morning/afternoon/evening/noon/night/midnight in normalized text.
     
@@ -41,12 +168,14 @@ def _has_period_flags(s_norm: str) -> dict[str, bool]:
     
     Also handles typos: "sang" (no accent), "toi" (no accent)
     """
+    lx = _lex(s_norm)
+    words = lx.words
     return {
-        'sang': bool(re.search(r"\bs[aà]ng\b", s_norm)),
-        'trua': bool(re.search(r"\btr[uư]a\b", s_norm)) or bool(re.search(r"\bnoon\b", s_norm)),
-        'chieu': bool(re.search(r"\bchi[eê]u\b", s_norm)),
-        'toi': bool(re.search(r"\bt[oô]i\b", s_norm) or re.search(r"\bd[eê]m\b", s_norm)),
-        'nua_dem': bool(re.search(r"\bn[uư]a\s*d[eê]m\b", s_norm)) or bool(re.search(r"\bmidnight\b", s_norm)),
+        'sang': 'sang' in words,
+        'trua': 'trua' in words or 'noon' in words,
+        'chieu': 'chieu' in words,
+        'toi': 'toi' in words or 'dem' in words,
+        'nua_dem': 'nuadem' in words or _find(lx, ('nua', _SP, 'dem')) >= 0 or 'midnight' in words,
     }
 
 def _adjust_hour_by_period(hh: int, flags: dict[str, bool]) -> int:
@@ -121,122 +250,160 @@ def _adjust_hour_by_period(hh: int, flags: dict[str, bool]) -> int:
     # Default: keep original hour
     return hh
 
-def _parse_explicit_time(s: str) -> tuple[Optional[int], Optional[int], str]:
+# Vietnamese number words -> digits
+# Include typo variations: "bah" (ba+h), "sáuh" (sau+h), "mườih" (muoi+h)
+_NUMBER_WORDS = {
+    'mot': '1', 'moh': '1', 'moth': '1',  # typo: mộth
+    'hai': '2', 'haih': '2',
+    'ba': '3', 'bah': '3',  # typo: bah
+    'bon': '4', 'bonh': '4', 'tu': '4', 'tuh': '4',
+    'nam': '5', 'namh': '5',  # typo: nămh
+    'sau': '6', 'sauh': '6',  # typo: sáuh
+    'bay': '7', 'bayh': '7',
+    'tam': '8', 'tamh': '8',  # typo: támh
+    'chin': '9', 'chinh': '9',
+    'muoi': '10', 'muoih': '10',  # typo: mườih
+}
+# Two-word numbers win over their parts ("muoi hai" -> 12, not "10 2"); one literal space
+_NUMBER_WORD_PAIRS = {
+    ('muoi', 'mot'): '11', ('muoi', 'hai'): '12', ('muoi', 'haih'): '12', ('muoih', 'haih'): '12',  # typo variations
+}
+_PERIOD_FIRST_WORDS = frozenset(('sang', 'chieu', 'trua', 'toi', 'dem'))
+
+_RUOI_RE = re.compile(r"\b(\d{1,2})\s*(?:h|gio)?\s*ruoi\b")
+_KEM_RE = re.compile(r"\b(\d{1,2})\s*(?:h|gio)\s*kem\s*(\d{1,2})\b")
+_COLON_RE = re.compile(r"\b(\d{1,2}):(\d{1,2})\b")
+_H_MINUTES_P_RE = re.compile(r"\b(\d{1,2})\s*h\s*(\d{1,2})\s*p(?:hut)?\b")
+_H_MINUTES_RE = re.compile(r"\b(\d{1,2})\s*h\s*(\d{1,2})?(?!p)\b")
+_PERIOD_FIRST_RE = re.compile(r"\b(sang|chieu|trua|toi|dem)\s+(\d{1,2})\s*(?:h|gio)\b")
+_GIO_RE = re.compile(r"\b(\d{1,2})\s*gio(?:\s*(\d{1,2})\s*phut)?\b")
+_BARE_NUMBER_RE = re.compile(r"\b(\d{1,2})\b")
+
+
+def _numbers_to_digits(lx: _Lexed) -> str:
+    """Number words -> digits and "lúc" prefix dropped, in one pass over the tokens."""
+    tokens = lx.tokens
+    n = len(tokens)
+    out = []
+    i = 0
+    while i < n:
+        t = tokens[i]
+        if t.alone and t.kind != NUMBER:
+            if i + 2 < n and tokens[i + 1].text == ' ' and tokens[i + 2].alone:
+                num = _NUMBER_WORD_PAIRS.get((t.text, tokens[i + 2].text))
+                if num is not None:
+                    out.append(num)
+                    i += 3
+                    continue
+            num = _NUMBER_WORDS.get(t.text)
+            if num is not None:
+                out.append(num)
+                i += 1
+                continue
+            # "lúc 12 giờ" / "lúc 12h" - remove "lúc" prefix
+            if t.text == 'luc' and i + 1 < n and tokens[i + 1].kind == SPACE:
+                i += 2
+                continue
+        out.append(t.text)
+        i += 1
+    return ''.join(out)
+
+
+def _parse_explicit_time(s: str) -> tuple[Optional[int], Optional[int]]:
+    """Hour and minute of the first clock expression in s (normalized text), or (None, None)."""
     s = s.strip()
     s_norm = _vn_norm(s)
-    
-    # Map Vietnamese number words to digits
-    # Include typo variations: "bah" (ba+h), "sáuh" (sau+h), "mườih" (muoi+h)
-    number_words = {
-        'mot': 1, 'moh': 1, 'moth': 1,  # typo: mộth
-        'hai': 2, 'haih': 2,
-        'ba': 3, 'bah': 3,  # typo: bah
-        'bon': 4, 'bonh': 4, 'tu': 4, 'tuh': 4,
-        'nam': 5, 'namh': 5,  # typo: nămh
-        'sau': 6, 'sauh': 6,  # typo: sáuh
-        'bay': 7, 'bayh': 7,
-        'tam': 8, 'tamh': 8,  # typo: támh
-        'chin': 9, 'chinh': 9,
-        'muoi': 10, 'muoi': 10, 'mười': 10, 'muoih': 10,  # typo: mườih
-        'muoi mot': 11, 'muoi hai': 12, 'muoi haih': 12, 'muoih haih': 12,  # typo variations
-    }
-    
-    # Replace number words with digits in normalized string
-    s_norm_numbers = s_norm
-    # Sort by length (longest first) to avoid partial replacements
-    for word, num in sorted(number_words.items(), key=lambda x: -len(x[0])):
-        s_norm_numbers = re.sub(r"\b" + word + r"\b", str(num), s_norm_numbers)
-    
-    # SPECIAL CASE: "sauh gio chieu" → "6 gio chieu" (number word + gio + period)
-    # Must handle BEFORE removing "luc" to preserve full expression
-    # Pattern: number_word + gio/giờ + period
-    # After conversion above: "6 gio chieu", "8 gio sang", "10 gio toi"
-    # This ensures period flags are preserved for _adjust_hour_by_period()
-    
-    # "lúc 12 giờ" / "lúc 12h" - remove "lúc" prefix
-    s_norm_numbers = re.sub(r"\bluc\s+", "", s_norm_numbers)
-    
+    lx = _lex(s_norm)
+    # Number words are digits from here on: "sauh gio chieu" -> "6 gio chieu", so the
+    # patterns below (and the period flags detected by the caller) see the full expression
+    s_num = _numbers_to_digits(lx)
+
     #  rưỡi / giờ rưỡi /  rưỡi => HH:30
-    m = re.search(r"\b(\d{1,2})\s*(?:h|gio|giờ)?\s*(?:ruoi|r\u01b0oi)\b", s_norm_numbers)
-    if m:
-        hh = int(m.group(1))
-        mm = 30
-        # remove the matched raw segment approximately by digits and 'rưỡi'
-        s = re.sub(r"\b" + re.escape(m.group(1)) + r"\s*(?:h|giờ)?\s*r[ưu]ỡi\b", "", s, flags=re.IGNORECASE)
-        return hh, mm, s.strip()
+    if 'ruoi' in s_num:
+        m = _RUOI_RE.search(s_num)
+        if m:
+            return int(m.group(1)), 30
     # 10 giờ kém 15 => 09:45
     # Allow formats: 10h|10 giờ kém 15
-    mk = re.search(r"\b(\d{1,2})\s*(?:h|gio|giờ)\s*k[eé]m\s*(\d{1,2})\b", s_norm_numbers)
-    if mk:
-        base_h = int(mk.group(1))
-        minus_m = int(mk.group(2))
-        hh = base_h - 1 if minus_m > 0 else base_h
-        mm = 60 - minus_m if minus_m > 0 else 0
-        # strip approximate raw segment
-        s = re.sub(r"\b" + re.escape(mk.group(1)) + r"\s*(?:h|giờ)\s*k[eé]m\s*" + re.escape(mk.group(2)) + r"\b", "", s, flags=re.IGNORECASE)
-        return hh, mm, s.strip()
+    if 'kem' in s_num:
+        mk = _KEM_RE.search(s_num)
+        if mk:
+            base_h = int(mk.group(1))
+            minus_m = int(mk.group(2))
+            hh = base_h - 1 if minus_m > 0 else base_h
+            mm = 60 - minus_m if minus_m > 0 else 0
+            return hh, mm
     # 17:30
-    m = re.search(r"\b(\d{1,2}):(\d{1,2})\b", s)
-    if m:
-           return int(m.group(1)), int(m.group(2)), re.sub(m.group(0), "", s, count=1).strip()
-    
-    # NEW PATTERN: 1h50p | 2h30p (hour + h + minute + p/phút)
-    # Example: "1h50p", "2h30p", "10h15p"
-    # PRIORITY: Check this BEFORE general "17h30 | 17h" pattern
-    m = re.search(r"\b(\d{1,2})\s*h\s*(\d{1,2})\s*p(?:hut|hút)?\b", s)
-    if m:
-        hh = int(m.group(1))
-        mm = int(m.group(2))
-        return hh, mm, re.sub(m.group(0), "", s, count=1).strip()
-    
-    # 17h30 | 17h (but NOT 17h30p - use negative lookahead)
-    # FIXED: Add negative lookahead (?!p) to prevent matching "1h50p" pattern
-    m = re.search(r"\b(\d{1,2})\s*h\s*(\d{1,2})?(?!p)\b", s)
-    if m:
-        hh = int(m.group(1))
-        mm = int(m.group(2) or 0)
-        return hh, mm, re.sub(m.group(0), "", s, count=1).strip()
+    if ':' in s:
+        m = _COLON_RE.search(s)
+        if m:
+            return int(m.group(1)), int(m.group(2))
+    if 'h' in s:
+        # NEW PATTERN: 1h50p | 2h30p (hour + h + minute + p/phút)
+        # PRIORITY: Check this BEFORE general "17h30 | 17h" pattern
+        m = _H_MINUTES_P_RE.search(s)
+        if m:
+            return int(m.group(1)), int(m.group(2))
+        # 17h30 | 17h (but NOT 17h30p - use negative lookahead)
+        m = _H_MINUTES_RE.search(s)
+        if m:
+            return int(m.group(1)), int(m.group(2) or 0)
     # ENHANCED: Handle "period + number" (reversed order)
     # Example: "chiều 3h" → period="chieu", hour=3
-    # Pattern: period_word + number + h/gio
-    period_first = re.search(r"\b(sang|chieu|trua|toi|dem)\s+(\d{1,2})\s*(?:h|gio|giờ)\b", s_norm_numbers)
-    if period_first:
-        # Extract hour from reversed pattern
-        hh = int(period_first.group(2))
-        mm = 0
-        # Remove the matched pattern from original string
-        s = re.sub(r"\b(?:sáng|sang|chiều|chieu|trưa|trua|tối|toi|đêm|dem)\s+\d{1,2}\s*(?:h|gio|giờ)\b", "", s, 1, flags=re.IGNORECASE).strip()
-        return hh, mm, s
-    
+    if not _PERIOD_FIRST_WORDS.isdisjoint(lx.words):
+        period_first = _PERIOD_FIRST_RE.search(s_num)
+        if period_first:
+            return int(period_first.group(2)), 0
     # "12 giờ 30 phút" / "12 giờ" - now with number word support
-    m = re.search(r"\b(\d{1,2})\s*(?:gio|giờ)(?:\s*(\d{1,2})\s*(?:phut|phút))?\b", s_norm_numbers)
-    if m:
-        hh = int(m.group(1))
-        mm = int(m.group(2) or 0)
-        return hh, mm, re.sub(r"\b\d{1,2}\s*(?:giờ|gio)(?:\s*\d{1,2}\s*(?:phút|phut))?\b", "", s, count=1, flags=re.IGNORECASE).strip()
-    
-    # ENHANCED: "sau gio" → "6 gio" (number word + gio, after typo normalization)
-    # Pattern: NUMBER_WORD + gio (where NUMBER_WORD was already converted to digit above)
-    # BUT: Also handle case where "gio" comes AFTER the period word
-    # Example: "sauh gio chieu" → "6 gio chieu" (already converted by typo_map + number_words)
-    # Example: "muoi gio sang" → "10 gio sang"
-    # This pattern catches the converted form: "\d+ gio [period]?"
-    # The period flag will be detected later by _has_period_flags()
-    
+    if 'gio' in s_num:
+        m = _GIO_RE.search(s_num)
+        if m:
+            return int(m.group(1)), int(m.group(2) or 0)
     # Standalone number (from number word conversion like "támh" -> "8", "mười haih" -> "12")
-    # This catches cases where number words with typo "h" were converted to digits
-    m = re.search(r"\b(\d{1,2})\b", s_norm_numbers)
+    m = _BARE_NUMBER_RE.search(s_num)
     if m:
         hh = int(m.group(1))
         # Validate hour range
         if 0 <= hh <= 23:
-            return hh, 0, re.sub(r"\b" + m.group(1) + r"\b", "", s_norm_numbers, 1).strip()
-    return None, None, s
+            return hh, 0
+    return None, None
+
+
+class _Day(NamedTuple):
+    """Day of an expression relative to its base, e.g. "+1 day at 20:00" for "tối mai".
+
+    Either base + shift (clock pinned to hour:minute when given, else the base clock),
+    or a fixed naive date (clock pinned, or base hour:minute when hour is None).
+    """
+    shift: timedelta = timedelta(0)
+    hour: Optional[int] = None
+    minute: Optional[int] = None
+    date: Optional[datetime] = None
+
+    def at(self, base: datetime) -> datetime:
+        """Datetime of the day for this base."""
+        if self.date is not None:
+            if self.hour is None:
+                return self.date.replace(hour=base.hour, minute=base.minute)
+            return self.date.replace(hour=self.hour, minute=self.minute)
+        dt = base + self.shift
+        if self.hour is not None:
+            dt = dt.replace(hour=self.hour, minute=self.minute)
+        return dt
+
+
+_FULL_DATE_RE = re.compile(r"\b(\d{1,2})[\.\-/](\d{1,2})[\.\-/](\d{4})\b")
+_SHORT_DATE_RE = re.compile(r"(?:ngay\s*)?(\d{1,2})[\.\-/](\d{1,2})\b")
+_DAY_MONTH_RE = re.compile(r"ngay\s*(\d{1,2})\s*thang\s*(\d{1,2})(?:\s*nam\s*(\d{4}))?")
+_DAY_ONLY_RE = re.compile(r"ngay\s+(\d{1,2})(?!\s*(?:thang|/))")
+_DAY_ONLY_STRIP_RE = re.compile(r"ngay\s+\d{1,2}")
+_MONTH_ONLY_RE = re.compile(r"thang\s+(\d{1,2})(?:\s*nam\s*(\d{4}))?")
 
 
 def _parse_explicit_date(base: datetime, s_norm: str) -> tuple[Optional[datetime], str]:
+    has_sep = '/' in s_norm or '-' in s_norm or '.' in s_norm
     # Format: DD.MM.YYYY or DD/MM/YYYY or DD-MM-YYYY
-    m = re.search(r"\b(\d{1,2})[\.\-/](\d{1,2})[\.\-/](\d{4})\b", s_norm)
+    m = _FULL_DATE_RE.search(s_norm) if has_sep else None
     if m:
         day = int(m.group(1))
         month = int(m.group(2))
@@ -253,7 +420,7 @@ def _parse_explicit_date(base: datetime, s_norm: str) -> tuple[Optional[datetime
     
     # Format: DD.MM or DD/MM or DD-MM (short date, current year)
     # FIXED: Support optional "ngày/ngay" prefix
-    m = re.search(r"(?:ngay\s*)?(\d{1,2})[\.\-/](\d{1,2})\b", s_norm)
+    m = _SHORT_DATE_RE.search(s_norm) if has_sep else None
     if m:
         day = int(m.group(1))
         month = int(m.group(2))
@@ -268,8 +435,10 @@ def _parse_explicit_date(base: datetime, s_norm: str) -> tuple[Optional[datetime
         except ValueError:
             pass
     
+    has_ngay = 'ngay' in s_norm
+    has_thang = 'thang' in s_norm
     # Format: ngay DD thang MM (normalized Vietnamese)
-    m = re.search(r"ngay\s*(\d{1,2})\s*thang\s*(\d{1,2})(?:\s*nam\s*(\d{4}))?", s_norm)
+    m = _DAY_MONTH_RE.search(s_norm) if has_ngay and has_thang else None
     if m:
         day = int(m.group(1))
         month = int(m.group(2))
@@ -286,7 +455,7 @@ def _parse_explicit_date(base: datetime, s_norm: str) -> tuple[Optional[datetime
             pass
     
     # ENHANCEMENT: ngay DD (without month - assumes current or next month)
-    m = re.search(r"ngay\s+(\d{1,2})(?!\s*(?:thang|/))", s_norm)
+    m = _DAY_ONLY_RE.search(s_norm) if has_ngay else None
     if m:
         day = int(m.group(1))
         # Use current month, or next month if day has passed
@@ -302,12 +471,12 @@ def _parse_explicit_date(base: datetime, s_norm: str) -> tuple[Optional[datetime
                     month = 1
                     year += 1
                 dt = datetime(year, month, day, 0, 0)
-                return dt, re.sub(r"ngay\s+\d{1,2}", "", s_norm, count=1).strip()
+                return dt, _DAY_ONLY_STRIP_RE.sub("", s_norm, count=1).strip()
         except ValueError:
             pass
     
     # ENHANCEMENT: thang MM (without day - assumes 1st of month)
-    m = re.search(r"thang\s+(\d{1,2})(?:\s*nam\s*(\d{4}))?", s_norm)
+    m = _MONTH_ONLY_RE.search(s_norm) if has_thang else None
     if m:
         month = int(m.group(1))
         year = int(m.group(2)) if m.group(2) else base.year
@@ -326,74 +495,63 @@ def _parse_explicit_date(base: datetime, s_norm: str) -> tuple[Optional[datetime
     return None, s_norm
 
 
-def _parse_relative_words(base: datetime, s_norm: str) -> tuple[Optional[datetime], str]:
-    text = s_norm
+# Period + day words: (pattern, days from base, default hour if no explicit time)
+_PERIOD_DAY_WORDS = [
+    (('toi', _SP, 'mai'), 1, 20),    # "tối mai" = tomorrow evening (default 20:00 if no explicit time)
+    (('dem', _SP, 'nay'), 0, 22),    # "đêm nay" = tonight (default 22:00 if no explicit time)
+    (('sang', _SP, 'mai'), 1, 8),    # "sáng mai" = tomorrow morning (default 08:00 if no explicit time)
+    (('chieu', _SP, 'mai'), 1, 15),  # "chiều mai" = tomorrow afternoon (default 15:00 if no explicit time)
+    (('trua', _SP, 'mai'), 1, 12),   # "trưa mai" = tomorrow noon (default 12:00 if no explicit time)
+]
+# ngay mot / mai mot / mot / ngay kia => +2 days (alternatives in this order at each word)
+_DAY_AFTER_TOMORROW = [('ngay', ' ', 'mot'), ('mai', ' ', 'mot'), ('mot',), ('ngay', ' ', 'kia')]
+_NEXT_WORDS = frozenset(('sau', 'toi'))
+
+_WEEKDAY_RE = re.compile(r"\b(?:(?:tuan sau\s+)?(?:thus?|t)\s*(\d|hai|ba|tu|nam|sau|bay|tam)(?:\s+tuan sau)?)\b")
+_SUNDAY_RE = re.compile(r"(?:cn|chu\s+nhat)(?:\s*tuan sau)?")
+
+
+def _parse_relative_words(base: datetime, s_norm: str) -> tuple[Optional[_Day], str]:
+    lx = _lex(s_norm)
+    words = lx.words
     
     # Handle compound time expressions: "tối mai", "sáng mai", "chiều mai", "đêm nay"
     # Support both with/without diacritics and typos (toi/tối, dem/đêm, sang/sáng)
     # Strategy: Only set DATE, let explicit time + period flags determine HOUR
     # Exception: If no explicit time, use default hours
-    
-    # "tối mai" = tomorrow evening (default 20:00 if no explicit time)
-    if re.search(r"\btoi\s+mai\b", text):
-        dt = (base + timedelta(days=1)).replace(hour=20, minute=0)
-        text = re.sub(r"\btoi\s+mai\b", "", text).strip()
-        return dt, text
-    # "đêm nay" = tonight (default 22:00 if no explicit time)
-    if re.search(r"\bdem\s+nay\b", text):
-        dt = base.replace(hour=22, minute=0)
-        text = re.sub(r"\bdem\s+nay\b", "", text).strip()
-        return dt, text
-    # "sáng mai" = tomorrow morning (default 08:00 if no explicit time)
-    if re.search(r"\bsang\s+mai\b", text):
-        dt = (base + timedelta(days=1)).replace(hour=8, minute=0)
-        text = re.sub(r"\bsang\s+mai\b", "", text).strip()
-        return dt, text
-    # "chiều mai" = tomorrow afternoon (default 15:00 if no explicit time)
-    if re.search(r"\bchieu\s+mai\b", text):
-        dt = (base + timedelta(days=1)).replace(hour=15, minute=0)
-        text = re.sub(r"\bchieu\s+mai\b", "", text).strip()
-        return dt, text
-    # "trưa mai" = tomorrow noon (default 12:00 if no explicit time)
-    if re.search(r"\btrua\s+mai\b", text):
-        dt = (base + timedelta(days=1)).replace(hour=12, minute=0)
-        text = re.sub(r"\btrua\s+mai\b", "", text).strip()
-        return dt, text
+    if 'mai' in words or 'nay' in words:
+        for pattern, days, hour in _PERIOD_DAY_WORDS:
+            if _find(lx, pattern) >= 0:
+                return _Day(timedelta(days=days), hour, 0), _remove(lx, pattern).strip()
     
     # hom nay / ngay mai / mai
     # BUG FIX: "hôm nay" keeps base date (today) with current base time
     # "ngày mai" / "mai" → tomorrow, PRESERVE base hour/minute (will be overridden by explicit time if found)
-    if re.search(r"\bhom\s+nay\b", text):
-        dt = base  # Keep current base datetime
-        text = re.sub(r"\bhom\s+nay\b", "", text).strip()
-        return dt, text
-    if re.search(r"\bngay\s+mai\b", text):
+    if _find(lx, ('hom', _SP, 'nay')) >= 0:
+        return _Day(), _remove(lx, ('hom', _SP, 'nay')).strip()  # Keep current base datetime
+    if _find(lx, ('ngay', _SP, 'mai')) >= 0:
         # BUG FIX: Don't set hour=base.hour here! Just shift date by +1
         # Hour will be set by explicit time parsing or period flags later
-        dt = base + timedelta(days=1)
-        text = re.sub(r"\bngay\s+mai\b", "", text).strip()
-        return dt, text
-    if re.search(r"\bmai\b", text):
+        return _Day(timedelta(days=1)), _remove(lx, ('ngay', _SP, 'mai')).strip()
+    if 'mai' in words:
         # "mai" alone (not part of compound like "tối mai")
-        dt = base + timedelta(days=1)
-        text = re.sub(r"\bmai\b", "", text).strip()
-        return dt, text
+        return _Day(timedelta(days=1)), _remove(lx, ('mai',)).strip()
     # ngay mot / mot / ngay kia / mai mot => +2 days
-    if re.search(r"\b(ngay mot|mai mot|mot|ngay kia)\b", text):
-        dt = (base + timedelta(days=2)).replace(hour=base.hour, minute=base.minute)
-        text = re.sub(r"\b(ngay mot|mai mot|mot|ngay kia)\b", "", text).strip()
-        return dt, text
+    if 'mot' in words or ('ngay' in words and 'kia' in words):
+        if any(_find(lx, pattern) >= 0 for pattern in _DAY_AFTER_TOMORROW):
+            return _Day(timedelta(days=2)), _remove(lx, *_DAY_AFTER_TOMORROW).strip()
     # cuoi tuan -> Saturday 09:00 upcoming
-    if re.search(r"\bcuoi tuan\b", text):
+    if _find(lx, ('cuoi', ' ', 'tuan')) >= 0:
         days_ahead = (5 - base.weekday()) % 7  # 5 = Saturday
         days_ahead = 7 if days_ahead == 0 else days_ahead
-        dt = (base + timedelta(days=days_ahead)).replace(hour=9, minute=0)
-        text = re.sub(r"\bcuoi tuan\b", "", text).strip()
-        return dt, text
+        return _Day(timedelta(days=days_ahead), 9, 0), _remove(lx, ('cuoi', ' ', 'tuan')).strip()
     # thứ d / t d (tuần sau)?
     # Match "thứ 3", "thu 3", "t 3", "thứ ba", "thứ hai" etc.
     # Also match "tuần sau" before or after: "tuần sau thứ 3", "thứ 3 tuần sau"
-    m = re.search(r"\b(?:(?:tuan sau\s+)?(?:thu[sứ]?|t)\s*(\d|hai|ba|tu|nam|sau|bay|tam)(?:\s+tuan sau)?)\b", text)
+    # (can only start at a word beginning with "t")
+    m = None
+    if any(t.w and not t.glued and t.text[0] == 't' for t in lx.tokens):
+        m = _WEEKDAY_RE.search(s_norm)
     if m:
         # Check if "tuần sau" appears anywhere in the match
         has_tuan_sau = 'tuan sau' in m.group(0)
@@ -432,13 +590,12 @@ def _parse_relative_words(base: datetime, s_norm: str) -> tuple[Optional[datetim
         elif days_ahead == 0:
             days_ahead = 7
         
-        dt = (base + timedelta(days=days_ahead)).replace(hour=base.hour, minute=base.minute)
-        text = text.replace(m.group(0), '').strip()
-        return dt, text
+        text = s_norm.replace(m.group(0), '').strip()
+        return _Day(timedelta(days=days_ahead)), text
     # CN / Chủ nhật (tuần sau)?
     # ENHANCED: Also match "chu nhat" ANYWHERE in text (not just at boundaries)
     # This handles "muoi gio sang chu nhat" (number words + period + weekday)
-    m = re.search(r"(?:cn|chu\s+nhat)(?:\s*tuan sau)?", text)
+    m = _SUNDAY_RE.search(s_norm) if 'cn' in s_norm or 'chu' in s_norm else None
     if m:
         target_wd = 6  # Sunday
         days_ahead = (target_wd - base.weekday()) % 7
@@ -451,147 +608,174 @@ def _parse_relative_words(base: datetime, s_norm: str) -> tuple[Optional[datetim
         elif days_ahead == 0:
             # Same day - default to next week
             days_ahead = 7
-        dt = (base + timedelta(days=days_ahead)).replace(hour=base.hour, minute=base.minute)
-        text = text.replace(m.group(0), '').strip()
-        return dt, text
+        text = s_norm.replace(m.group(0), '').strip()
+        return _Day(timedelta(days=days_ahead)), text
     # hom kia (two days ago)
-    if re.search(r"\bhom kia\b", text):
-        dt = (base - timedelta(days=2)).replace(hour=base.hour, minute=base.minute)
-        text = re.sub(r"\bhom kia\b", "", text).strip()
-        return dt, text
+    if _find(lx, ('hom', ' ', 'kia')) >= 0:
+        return _Day(timedelta(days=-2)), _remove(lx, ('hom', ' ', 'kia')).strip()
     # tuần sau / tuần tới (next week - Monday of next week)
-    if re.search(r"\btuan\s+(?:sau|toi|tới)\b", text):
+    if _find(lx, ('tuan', _SP, _NEXT_WORDS)) >= 0:
         days_ahead = (7 - base.weekday()) % 7  # Days until next Monday
         days_ahead = 7 if days_ahead == 0 else days_ahead  # If today is Monday, go to next Monday
-        dt = (base + timedelta(days=days_ahead)).replace(hour=base.hour, minute=base.minute)
-        text = re.sub(r"\btuan\s+(?:sau|toi|tới)\b", "", text).strip()
-        return dt, text
+        return _Day(timedelta(days=days_ahead)), _remove(lx, ('tuan', _SP, _NEXT_WORDS)).strip()
     # tháng sau / tháng tới (next month - 1st day of next month)
-    if re.search(r"\bthang\s+(?:sau|toi|tới)\b", text):
+    if _find(lx, ('thang', _SP, _NEXT_WORDS)) >= 0:
         # Approximate: add 30 days
-        dt = (base + timedelta(days=30)).replace(hour=base.hour, minute=base.minute)
-        text = re.sub(r"\bthang\s+(?:sau|toi|tới)\b", "", text).strip()
-        return dt, text
-    
-    # ENHANCEMENT: năm sau / năm tới (next year - January 1st of next year)
-    if re.search(r"\bnam\s+(?:sau|toi|tới)\b", text):
-        dt = datetime(base.year + 1, 1, 1, base.hour, base.minute)
-        text = re.sub(r"\bnam\s+(?:sau|toi|tới)\b", "", text).strip()
-        return dt, text
-    
-    # ENHANCEMENT: năm nay / năm này (this year - keeps current date)
-    if re.search(r"\bnam\s+(?:nay|này)\b", text):
-        dt = base  # Keep current date
-        text = re.sub(r"\bnam\s+(?:nay|này)\b", "", text).strip()
-        return dt, text
+        return _Day(timedelta(days=30)), _remove(lx, ('thang', _SP, _NEXT_WORDS)).strip()
     
-    # ENHANCEMENT: năm YYYY (specific year - January 1st of that year)
-    m = re.search(r"\bnam\s+(\d{4})\b", text)
-    if m:
-        year = int(m.group(1))
-        # Validate: cannot create events in the past (before current year)
-        if year < base.year:
-            # Return None to indicate past year (invalid)
-            return None, text
-        dt = datetime(year, 1, 1, base.hour, base.minute)
-        text = re.sub(m.group(0), "", text).strip()
-        return dt, text
+    if 'nam' in words:
+        # ENHANCEMENT: năm sau / năm tới (next year - January 1st of next year)
+        if _find(lx, ('nam', _SP, _NEXT_WORDS)) >= 0:
+            return _Day(date=datetime(base.year + 1, 1, 1)), _remove(lx, ('nam', _SP, _NEXT_WORDS)).strip()
+        
+        # ENHANCEMENT: năm nay / năm này (this year - keeps current date)
+        if _find(lx, ('nam', _SP, 'nay')) >= 0:
+            return _Day(), _remove(lx, ('nam', _SP, 'nay')).strip()  # Keep current date
+        
+        # ENHANCEMENT: năm YYYY (specific year - January 1st of that year)
+        tokens = lx.tokens
+        for i, t in enumerate(tokens[:-2]):
+            year_tok = tokens[i + 2]
+            if (t.text == 'nam' and t.alone and tokens[i + 1].kind == SPACE
+                    and year_tok.kind == NUMBER and year_tok.alone and len(year_tok.text) == 4):
+                year = int(year_tok.text)
+                # Validate: cannot create events in the past (before current year)
+                if year < base.year:
+                    # Return None to indicate past year (invalid)
+                    return None, s_norm
+                text = s_norm.replace(t.text + tokens[i + 1].text + year_tok.text, "").strip()
+                return _Day(date=datetime(year, 1, 1)), text
     
     return None, s_norm
 
 
-def _parse_duration(base: datetime, s_norm: str) -> tuple[Optional[datetime], str]:
+_DURATION_UNITS = {
+    'phut': lambda val: timedelta(minutes=val),
+    'gio': lambda val: timedelta(hours=val),
+    'ngay': lambda val: timedelta(days=val),
+    'tuan': lambda val: timedelta(weeks=val),
+    'thang': lambda val: timedelta(days=val*30),  # Approximate: 1 month = 30 days
+}
+_DURATION_IN_RE = re.compile(r"\b(trong|sau)\s*(\d{1,3})\s*(phut|gio|ngay|tuan|thang)\b")
+_DURATION_MORE_RE = re.compile(r"\b(\d{1,3})\s*(phut|gio|ngay|tuan|thang)\s*nua\b")
+
+
+def _parse_duration(s_norm: str) -> tuple[Optional[_Day], str]:
     """Parse phrases like 'trong 2 tuần', 'sau 3 ngày', '5 ngày nữa', '30 phút nữa'.
-    Returns (dt, remaining_text). dt uses base date/time for time-of-day unless overridden later.
+    Returns (day, remaining_text). The day is base + duration, keeping the base time-of-day unless overridden later.
     """
-    text = s_norm
     # trong/sau X đơn vị (add "thang" for month)
-    m = re.search(r"\b(trong|sau)\s*(\d{1,3})\s*(phut|gio|ngay|tuan|thang)\b", text)
+    m = _DURATION_IN_RE.search(s_norm) if 'trong' in s_norm or 'sau' in s_norm else None
     if m:
-        val = int(m.group(2))
-        unit = m.group(3)
-        delta = {
-            'phut': timedelta(minutes=val),
-            'gio': timedelta(hours=val),
-            'ngay': timedelta(days=val),
-            'tuan': timedelta(weeks=val),
-            'thang': timedelta(days=val*30),  # Approximate: 1 month = 30 days
-        }[unit]
-        dt = base + delta
-        text = text.replace(m.group(0), '').strip()
-        return dt, text
+        return _Day(_DURATION_UNITS[m.group(3)](int(m.group(2)))), s_norm.replace(m.group(0), '').strip()
     # X đơn vị nữa
-    m = re.search(r"\b(\d{1,3})\s*(phut|gio|ngay|tuan|thang)\s*nua\b", text)
+    m = _DURATION_MORE_RE.search(s_norm) if 'nua' in s_norm else None
     if m:
-        val = int(m.group(1))
-        unit = m.group(2)
-        delta = {
-            'phut': timedelta(minutes=val),
-            'gio': timedelta(hours=val),
-            'ngay': timedelta(days=val),
-            'tuan': timedelta(weeks=val),
-            'thang': timedelta(days=val*30),  # Approximate: 1 month = 30 days
-        }[unit]
-        dt = base + delta
-        text = text.replace(m.group(0), '').strip()
-        return dt, text
+        return _Day(_DURATION_UNITS[m.group(2)](int(m.group(1)))), s_norm.replace(m.group(0), '').strip()
     return None, s_norm
 
 
+_TZ_NAMED_RE = re.compile(r"mui\s*gio\s*(?:utc|gmt)?\s*([+\-]?\d{1,2})(?::?(\d{2}))?")
+_TZ_PREFIX_RE = re.compile(r"\b(?:utc|gmt)\s*([+\-]?\d{1,2})(?::?(\d{2}))?\b")
+
+
 def _parse_timezone(s_norm: str) -> tuple[Optional[timezone], str]:
     """Parse timezone hints like 'UTC+7', 'GMT+07:00', 'múi giờ +07:00', 'múi giờ UTC+7'.
     Returns (tzinfo or None, remaining_text).
     """
-    text = s_norm
+    m = None
     # múi giờ ...
-    m = re.search(r"mui\s*gio\s*(?:utc|gmt)?\s*([+\-]?\d{1,2})(?::?(\d{2}))?", text)
-    if not m:
+    if 'mui' in s_norm:
+        m = _TZ_NAMED_RE.search(s_norm)
+    if not m and ('utc' in s_norm or 'gmt' in s_norm):
         # UTC/GMT prefix
-        m = re.search(r"\b(?:utc|gmt)\s*([+\-]?\d{1,2})(?::?(\d{2}))?\b", text)
+        m = _TZ_PREFIX_RE.search(s_norm)
     if m:
         hours = int(m.group(1))
         minutes = int(m.group(2) or 0)
         offset = timedelta(hours=hours, minutes=minutes if hours >= 0 else -minutes)
         tz = timezone(offset)
-        text = text.replace(m.group(0), '').strip()
+        text = s_norm.replace(m.group(0), '').strip()
         return tz, text
     return None, s_norm
 
 
-def _parse_common_day(base: datetime, s_raw: str, s_norm: str) -> tuple[datetime, str, Optional[timezone]]:
-    """Extract timezone and day (explicit date, duration, relative words). Returns (day_dt, rest_norm, tzinfo)."""
+def _parse_common_day(base: datetime, s_norm: str) -> tuple[_Day, str, Optional[timezone]]:
+    """Extract timezone and day (explicit date, duration, relative words). Returns (day, rest_norm, tzinfo)."""
     tzinfo, _ = _parse_timezone(s_norm)
     # 1) Giờ/phút tường minh (not used here)
     # 2) Ngày tường minh
     date_dt, s_norm2 = _parse_explicit_date(base, s_norm)
     # 3) Khoảng thời gian tương đối
-    dur_dt, s_norm3 = _parse_duration(base, s_norm2)
+    dur_day, s_norm3 = _parse_duration(s_norm2)
     # 4) Từ khóa tương đối
-    rel_dt, rest_norm = _parse_relative_words(base, s_norm3)
+    rel_day, rest_norm = _parse_relative_words(base, s_norm3)
 
     if date_dt:
-        day_dt = date_dt
-    elif dur_dt:
-        day_dt = dur_dt
-    elif rel_dt:
-        day_dt = rel_dt
+        day = _Day(hour=date_dt.hour, minute=date_dt.minute, date=date_dt)
+    elif dur_day:
+        day = dur_day
+    elif rel_day:
+        day = rel_day
     else:
-        day_dt = base
+        day = _Day()
     
-    return day_dt, rest_norm, tzinfo
+    return day, rest_norm, tzinfo
+
+def _split_range(lx: _Lexed) -> List[str]:
+    """Non-empty stripped parts of the text between range separators ("den", dashes)."""
+    parts = []
+    piece: List[str] = []
+    for t in lx.tokens:
+        if t.kind == SEPARATOR and (not t.w or t.alone):
+            parts.append(''.join(piece).strip())
+            piece = []
+        else:
+            piece.append(t.text)
+    parts.append(''.join(piece).strip())
+    return [p for p in parts if p]
+
+
+def _has_clock_marker(lx: _Lexed) -> bool:
+    """True when a number is followed by an hour marker or a colon ("6h", "6 gio", "6:")."""
+    tokens = lx.tokens
+    n = len(tokens)
+    for i, t in enumerate(tokens):
+        if t.kind != NUMBER:
+            continue
+        j = i + 1
+        if j < n and tokens[j].kind == SPACE:
+            j += 1
+        if j < n:
+            nxt = tokens[j].text
+            if nxt == ':' or (tokens[j].w and (nxt[0] == 'h' or nxt.startswith('gio'))):
+                return True
+    return False
+
+
+class _Plan(NamedTuple):
+    """Everything parse_vietnamese_time_range reads from the text, for one base bucket."""
+    day: _Day
+    tzinfo: Optional[timezone]
+    flags: Dict[str, bool]
+    start: Tuple[Optional[int], Optional[int]]
+    end: Tuple[Optional[int], Optional[int]]
+    has_clock: bool  # rest has "6h" / "6 gio" / "6:" (explicit time wins over the day's default hour)
+
+
+_PLAN_CACHE_SIZE = 4096
+
 
-def parse_vietnamese_time_range(time_str: str | None, *, relative_base: Optional[datetime] = None) -> tuple[Optional[datetime], Optional[datetime]]:
+@lru_cache(maxsize=_PLAN_CACHE_SIZE)
+def _plan(s_norm: str, base_day: date, base_at_midnight: bool, base_tz) -> _Plan:
     """
-    Parse time expressions possibly containing a range (từ X đến Y, X-Y). Returns (start_dt, end_dt).
-    If no range present, end_dt is None.
+    Parse s_norm for every base of one bucket: same calendar day, same tzinfo, and
+    whether the base is exactly 00:00. That is all the day rules read from the base
+    (weekday, month, year, past-date checks of 00:00 dates); the base clock only
+    enters through _Day.at and the past-time rollover, which run on every call.
     """
-    if not time_str:
-        return None, None
-    base = relative_base or datetime.now()
-    s_raw = time_str.strip()
-    s_norm = _vn_norm(s_raw)
-
-    day_dt, rest_norm, tzinfo = _parse_common_day(base, s_raw, s_norm)
+    base = datetime(base_day.year, base_day.month, base_day.day, 0 if base_at_midnight else 12, tzinfo=base_tz)
+    day, rest_norm, tzinfo = _parse_common_day(base, s_norm)
 
     # Detect general period flags from the ORIGINAL string (before relative words removed)
     # This ensures "6h chiều mai" detects "chiều" flag correctly
@@ -599,31 +783,64 @@ def parse_vietnamese_time_range(time_str: str | None, *, relative_base: Optional
 
     # Split range using common separators
     # Patterns: "tu 10h den 12h", "10:00 den 11:30", "10h-12h", "10h – 12h"
-    parts = re.split(r"\bden\b|\-|\u2013|\u2014|\u2015|\u2212", rest_norm)
-    parts = [p.strip() for p in parts if p.strip()]
-    start_h = start_m = end_h = end_m = None
-
-    def parse_hhmm(segment: str) -> tuple[Optional[int], Optional[int]]:
-        hh, mm, _ = _parse_explicit_time(segment)
-        return hh, mm
-
+    rest_lx = _lex(rest_norm)
+    parts = _split_range(rest_lx)
+    start = end = (None, None)
     if len(parts) >= 2:
         # Handle optional leading 'tu' token
-        parts[0] = re.sub(r"\btu\b", "", parts[0]).strip()
-        sh, sm = parse_hhmm(parts[0])
-        eh, em = parse_hhmm(parts[1])
-        start_h, start_m = sh, sm
-        end_h, end_m = eh, em
+        start = _parse_explicit_time(_remove(_lex(parts[0]), ('tu',)).strip())
+        end = _parse_explicit_time(parts[1])
     else:
         # Single time expression - use rest_norm (after relative words removed)
-        sh, sm, _rest = _parse_explicit_time(rest_norm)
-        start_h, start_m = sh, sm
+        start = _parse_explicit_time(rest_norm)
+    return _Plan(day, tzinfo, flags, start, end, _has_clock_marker(rest_lx))
+
+
+def time_cache_stats() -> Dict[str, Any]:
+    """Hit/miss counters of the memoized expression analysis (see _plan)."""
+    info = _plan.cache_info()
+    total = info.hits + info.misses
+    return {
+        'hits': info.hits,
+        'misses': info.misses,
+        'hit_rate': info.hits / total if total else 0.0,
+        'size': info.currsize,
+        'maxsize': info.maxsize,
+    }
+
+
+def parse_vietnamese_time_range(time_str: str | NormalizedText | None, *, relative_base: Optional[datetime] = None) -> tuple[Optional[datetime], Optional[datetime]]:
+    """
+    Parse time expressions possibly containing a range (từ X đến Y, X-Y). Returns (start_dt, end_dt).
+    If no range present, end_dt is None.
+    time_str may be a NormalizedText already computed by the caller (its folded form is reused).
+
+    The text analysis is memoized per (text, base day) as a day relative to the base
+    ("+1 day at 20:00") plus the explicit clock; resolving it against the base, including
+    the past-time rollover, is redone on every call, so any base time of the day hits.
+    """
+    if not time_str:
+        return None, None
+    base = relative_base or datetime.now()
+    text = NormalizedText.of(time_str)
+    if text.raw != text.raw.strip():
+        text = NormalizedText.of(text.raw.strip())
+    if not text.raw:
+        return None, None
+
+    at_midnight = not (base.hour or base.minute or base.second or base.microsecond)
+    plan = _plan(text.folded, base.date(), at_midnight, base.tzinfo)
+    day_dt = plan.day.at(base)
+    tzinfo = plan.tzinfo
+    flags = plan.flags
+    start_h, start_m = plan.start
+    end_h, end_m = plan.end
 
     # If no explicit time found, check if day_dt already has the time set
     # (e.g., from "đêm nay" = 22:00 or "tối mai" = 20:00)
     # BUT: Only use day_dt time if rest_norm has NO time patterns
     # (e.g., "tối mai" alone is OK, but "6h tối mai" should use 6h + tối flag)
-    if start_h is None and day_dt != base and not re.search(r"\d{1,2}\s*(?:h|gio|:|giờ)", rest_norm):
+    if start_h is None and day_dt != base and not plan.has_clock:
         # day_dt was set by relative words with specific time, use it directly
         return day_dt, None
     
@@ -699,10 +916,6 @@ def parse_vietnamese_time(time_str: str | None, *, relative_base: Optional[datet
     """
     if not time_str:
         return None
-    base = relative_base or datetime.now()
-    s_raw = time_str.strip().lower()
-    s_norm = _vn_norm(s_raw)
-
     # Use the range parser and return only the start time for compatibility
     start_dt, _ = parse_vietnamese_time_range(time_str, relative_base=relative_base)
     # If still None, fallback to 09:00 of base date
@@ -0,0 +1,334 @@
+"""
+Worker Pipeline - NLP inference in separate worker processes
+PhoBERT inference and underthesea NER hold the GIL, so running them in the
+GUI process stalls the Tk main loop and the notification thread.
+ProcessNLPPipeline runs HybridNLPPipeline in one or more worker processes
+(spawn start method) and talks to each over a duplex pipe: requests are
+(request_id, method, args) and responses (request_id, status, payload).
+Texts and result dicts are small, so pickling over a pipe costs far less
+than the inference itself.
+
+Each worker builds its pipeline after start and announces it with a 'ready'
+message. A request that finds no ready worker, times out (timeout_s), hits a
+crashed worker or gets an error back is answered in-process by the
+rule-based NLPPipeline; timed-out and crashed workers are killed and
+restarted. A health thread pings idle workers every health_interval_s and
+restarts the ones that are dead or don't answer.
+"""
+
+from __future__ import annotations
+import itertools
+import multiprocessing
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from .pipeline import NLPPipeline
+from .process_memory import current_rss_mb
+
+# Request ids (shared by all workers of the process; id 0 is the 'ready' message)
+_request_ids = itertools.count(1)
+
+
+class WorkerError(RuntimeError):
+    """The worker's pipeline raised while handling a request"""
+
+
+def _worker_main(conn, pipeline_kwargs: Dict[str, Any]) -> None:
+    """Worker process: build the hybrid pipeline, then answer requests until None or EOF"""
+    try:
+        from .hybrid_pipeline import HybridNLPPipeline
+        pipeline = HybridNLPPipeline(**pipeline_kwargs)
+    except Exception as e:
+        conn.send((0, 'error', f"{type(e).__name__}: {e}"))
+        return
+    conn.send((0, 'ready', pipeline.get_model_info()))
+
+    while True:
+        try:
+            request = conn.recv()
+        except (EOFError, OSError):
+            return  # parent went away
+        if request is None:
+            return
+        request_id, method, args = request
+        if method == 'ping':
+            conn.send((request_id, 'pong', current_rss_mb()))
+            continue
+        try:
+            if method.startswith('_'):
+                raise AttributeError(f"private method {method!r}")
+            conn.send((request_id, 'ok', getattr(pipeline, method)(*args)))
+        except Exception as e:
+            conn.send((request_id, 'error', f"{type(e).__name__}: {e}"))
+
+
+class _Worker:
+    """One worker process and the parent end of its pipe (one request at a time)"""
+
+    def __init__(self, context: Any, index: int, pipeline_kwargs: Dict[str, Any]):
+        self.context = context
+        self.index = index
+        self.pipeline_kwargs = pipeline_kwargs
+        self.restarts = -1
+        self.requests = 0
+        self.start()
+
+    def start(self) -> None:
+        parent_conn, child_conn = self.context.Pipe()
+        self.process = self.context.Process(target=_worker_main, args=(child_conn, self.pipeline_kwargs),
+                                            name=f'nlp-worker-{self.index}', daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.conn = parent_conn
+        self.ready = False
+        self.info: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.rss_mb: Optional[float] = None
+        self.started_at = time.monotonic()
+        self.restarts += 1
+
+    def stop(self, timeout: float = 1.0) -> None:
+        """Ask the worker to exit; kill it if it doesn't within timeout"""
+        try:
+            self.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(timeout)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join(timeout)
+        self.conn.close()
+
+    def restart(self) -> None:
+        """Kill the worker (stuck or crashed) and start a fresh one"""
+        self.process.kill()
+        self.process.join(1.0)
+        self.conn.close()
+        self.start()
+
+    def poll_ready(self) -> bool:
+        """Consume the startup message if it has arrived (non-blocking)"""
+        if not self.ready and self.error is None and self.conn.poll(0):
+            try:
+                _, status, payload = self.conn.recv()
+            except (EOFError, OSError):
+                # Died before its startup message (pipe closed): caller restarts it
+                self.error = f"exited with code {self.process.exitcode}"
+                return False
+            if status == 'ready':
+                self.ready = True
+                self.info = payload
+            else:
+                self.error = payload
+        return self.ready
+
+    def request(self, method: str, args: tuple, timeout: float) -> Any:
+        """Send one request and wait for its response (TimeoutError, EOFError/OSError on crash)"""
+        request_id = next(_request_ids)
+        self.conn.send((request_id, method, args))
+        if not self.conn.poll(max(0.0, timeout)):
+            raise TimeoutError(f"nlp-worker-{self.index}: no answer to {method} within {timeout:.1f}s")
+        response_id, status, payload = self.conn.recv()
+        if response_id != request_id:
+            raise OSError(f"nlp-worker-{self.index}: answer to request {response_id}, expected {request_id}")
+        if status == 'error':
+            raise WorkerError(payload)
+        self.requests += 1
+        return payload
+
+
+class ProcessNLPPipeline:
+    """
+    HybridNLPPipeline running in worker processes, NLPPipeline-compatible interface
+
+    Falls back to the in-process rule-based pipeline while the workers load and
+    whenever a request times out, crashes its worker or fails.
+    """
+
+    def __init__(self, model_path: Optional[str] = None, *, relative_base: Optional[datetime] = None,
+                 workers: int = 1, timeout_s: float = 10.0, health_interval_s: float = 30.0,
+                 **pipeline_kwargs: Any):
+        """
+        Start the worker processes
+
+        Args:
+            model_path: Path to fine-tuned PhoBERT model (optional)
+            relative_base: Base datetime for relative time parsing
+            workers: Number of worker processes (each loads its own model)
+            timeout_s: Longest wait for a free worker plus its answer, per request
+            health_interval_s: Seconds between pings of the idle workers
+            **pipeline_kwargs: Further HybridNLPPipeline options (e.g. phobert_idle_minutes)
+        """
+        if workers < 1:
+            raise ValueError(f"workers must be >= 1, got {workers}")
+        self.relative_base = relative_base
+        self.timeout_s = timeout_s
+        self.health_interval_s = health_interval_s
+        self._fallback: Optional[NLPPipeline] = None
+        self._lock = threading.Lock()
+        self._counts = {'worker': 0, 'fallback': 0, 'loading': 0, 'busy': 0,
+                        'timeouts': 0, 'crashes': 0, 'errors': 0}
+
+        # spawn: no fork of the Tk process (and the same behaviour on Windows)
+        context = multiprocessing.get_context('spawn')
+        kwargs = dict(pipeline_kwargs, model_path=model_path, relative_base=relative_base)
+        self._workers = [_Worker(context, i, kwargs) for i in range(workers)]
+        self._idle: queue.Queue[_Worker] = queue.Queue()
+        for worker in self._workers:
+            self._idle.put(worker)
+        print(f"⚡ NLP Pipeline: {workers} worker process(es) starting")
+
+        self._closed = threading.Event()
+        self._health_thread = threading.Thread(target=self._health_loop, name='nlp-worker-health', daemon=True)
+        self._health_thread.start()
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self._counts[key] += 1
+
+    def _rule_based(self) -> NLPPipeline:
+        """In-process rule-based pipeline for fallback answers (created once)"""
+        with self._lock:
+            if self._fallback is None:
+                self._fallback = NLPPipeline(relative_base=self.relative_base)
+            return self._fallback
+
+    def _call(self, method: str, *args: Any) -> Any:
+        """
+        Run a pipeline method on a free worker
+
+        Raises:
+            LookupError: no ready worker was free in time (nothing was sent)
+            TimeoutError, WorkerError, EOFError, OSError: the request failed
+        """
+        deadline = time.monotonic() + self.timeout_s
+        try:
+            worker = self._idle.get(timeout=self.timeout_s)
+        except queue.Empty:
+            self._count('busy')
+            raise LookupError("all NLP workers busy")
+        try:
+            if not worker.poll_ready():
+                if worker.error is not None or not worker.process.is_alive():
+                    print(f"⚠️ nlp-worker-{worker.index} failed to start ({worker.error}), restarting")
+                    self._count('crashes')
+                    worker.restart()
+                else:
+                    self._count('loading')
+                raise LookupError(f"nlp-worker-{worker.index} is not ready")
+            try:
+                return worker.request(method, args, deadline - time.monotonic())
+            except TimeoutError:
+                self._count('timeouts')
+                worker.restart()
+                raise
+            except WorkerError:
+                self._count('errors')
+                raise
+            except (EOFError, OSError):
+                self._count('crashes')
+                print(f"⚠️ nlp-worker-{worker.index} crashed, restarting")
+                worker.restart()
+                raise
+        finally:
+            self._idle.put(worker)
+
+    def process(self, text: str, relative_base: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Process text in a worker (rule-based in-process answer if that fails)
+
+        Args:
+            text: Input Vietnamese text
+            relative_base: Base datetime for relative time parsing
+
+        Returns:
+            Same dict as HybridNLPPipeline.process
+        """
+        try:
+            result = self._call('process', text, relative_base)
+            self._count('worker')
+            return result
+        except (LookupError, TimeoutError, WorkerError, EOFError, OSError) as e:
+            if isinstance(e, WorkerError):
+                print(f"⚠️ NLP worker error: {e}")
+            self._count('fallback')
+            result = dict(self._rule_based().process(text))
+            result['_models_used'] = 'rule-based-in-process'
+            return result
+
+    def process_batch(self, texts: Iterable[str], relative_base: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """Process many texts in one worker request (one process() per text if that fails)"""
+        texts = list(texts)
+        try:
+            results = self._call('process_batch', texts, relative_base)
+            self._count('worker')
+            return results
+        except (LookupError, TimeoutError, WorkerError, EOFError, OSError):
+            return [self.process(text, relative_base) for text in texts]
+
+    def extract(self, text: str) -> Dict[str, Any]:
+        """Alias for process() for compatibility"""
+        return self.process(text)
+
+    def get_model_info(self) -> Dict[str, Any]:
+        """Model info of the first ready worker (from its startup message)"""
+        for worker in self._workers:
+            if worker.info is not None:
+                return dict(worker.info, workers=len(self._workers))
+        return {'mode': 'Rule-based (workers loading)', 'workers': len(self._workers)}
+
+    def _health_loop(self) -> None:
+        """Health thread: ping the idle workers, restart dead or unresponsive ones"""
+        while not self._closed.wait(self.health_interval_s):
+            for _ in range(len(self._workers)):
+                try:
+                    worker = self._idle.get_nowait()
+                except queue.Empty:
+                    break  # the rest are busy (their requests have a timeout)
+                try:
+                    if not worker.process.is_alive():
+                        print(f"⚠️ nlp-worker-{worker.index} died, restarting")
+                        self._count('crashes')
+                        worker.restart()
+                    elif worker.poll_ready():
+                        worker.rss_mb = worker.request('ping', (), min(5.0, self.timeout_s))
+                except (TimeoutError, WorkerError, EOFError, OSError) as e:
+                    print(f"⚠️ nlp-worker-{worker.index} failed its health check ({e}), restarting")
+                    self._count('crashes')
+                    worker.restart()
+                finally:
+                    self._idle.put(worker)
+
+    def health(self) -> Dict[str, Any]:
+        """
+        Worker status and request counters
+
+        Returns:
+            {'workers': [{'index', 'pid', 'alive', 'ready', 'restarts', 'requests',
+             'rss_mb', 'uptime_s'}], 'counts': {...}, 'rss_mb' (this process)}
+        """
+        now = time.monotonic()
+        workers = [{
+            'index': worker.index,
+            'pid': worker.process.pid,
+            'alive': worker.process.is_alive(),
+            'ready': worker.ready,
+            'restarts': worker.restarts,
+            'requests': worker.requests,
+            'rss_mb': worker.rss_mb,
+            'uptime_s': now - worker.started_at,
+        } for worker in self._workers]
+        with self._lock:
+            counts = dict(self._counts)
+        return {'workers': workers, 'counts': counts, 'rss_mb': current_rss_mb()}
+
+    def close(self, timeout: float = 1.0) -> None:
+        """Stop the health thread and the workers"""
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        for worker in self._workers:
+            worker.stop(timeout)
@@ -2,13 +2,17 @@ from __future__ import annotations
 import os
 import sys
 import sqlite3
-from datetime import date
-from typing import List, Dict, Any
+from datetime import date, datetime, timedelta, timezone
+from typing import List, Dict, Any, Optional, Iterable, Iterator, Sequence, Callable
 import threading
+import time
 from queue import Queue, Empty
 
 DB_FILE = "events.db"
 
+# Change stamps are UTC ISO 8601 with microseconds so they sort lexicographically
+CHANGE_STAMP_FORMAT = '%Y-%m-%dT%H:%M:%S.%fZ'
+
 def _writable_base_dir() -> str:
     """Return a writable base dir for DB when running normally or as a frozen exe.
     - In dev: use the module directory (database/)
@@ -36,6 +40,12 @@ def _schema_file_path() -> str:
     return os.path.join(os.path.dirname(__file__), 'schema.sql')
 
 
+# Columns of the events table that callers may select for streaming reads
+EVENT_COLUMNS = (
+    'id', 'event_name', 'start_time', 'end_time', 'location',
+    'reminder_minutes', 'status', 'created_at', 'updated_at',
+)
+
 DB_PATH = os.path.join(_writable_base_dir(), DB_FILE)
 SCHEMA_PATH = _schema_file_path()
 
@@ -58,30 +68,46 @@ class DatabaseManager:
         self._pool_lock = threading.Lock()
         self._pool_size = 0
         
+        # Change tracking (delta export): every write transaction gets a strictly
+        # increasing stamp and commits while holding _write_lock, so a reader that
+        # sees stamp T also sees every change stamped before T.
+        self._write_lock = threading.Lock()
+        # Cleared by compact() so no new connection is checked out while it drains the pool
+        self._pool_open = threading.Event()
+        self._pool_open.set()
+        self._last_activity = time.monotonic()  # Last connection checkout/return (for idle detection)
+        self._last_change_stamp = ''
+        
         # Initialize connection pool with more connections
         for _ in range(self.INITIAL_POOL_SIZE):
             self._create_connection()
         
         self._create_table()
 
+    def _open_connection(self) -> sqlite3.Connection:
+        """Open a configured connection (not yet counted in the pool)"""
+        conn = sqlite3.connect(
+            self.db_path,
+            check_same_thread=False,  # Allow multithreading
+            timeout=30.0  # Long timeout for busy database
+        )
+        conn.row_factory = sqlite3.Row
+        # Enable WAL mode for better concurrent access
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
     def _create_connection(self) -> None:
         """Create a new connection and add to pool"""
         with self._pool_lock:
             if self._pool_size < self.MAX_POOL_SIZE:
-                conn = sqlite3.connect(
-                    self.db_path,
-                    check_same_thread=False,  # Allow multithreading
-                    timeout=30.0  # Long timeout for busy database
-                )
-                conn.row_factory = sqlite3.Row
-                # Enable WAL mode for better concurrent access
-                conn.execute("PRAGMA journal_mode=WAL")
-                conn.execute("PRAGMA synchronous=NORMAL")
-                self._connection_pool.put(conn)
+                self._connection_pool.put(self._open_connection())
                 self._pool_size += 1
 
     def _get_connection(self) -> sqlite3.Connection:
         """Get connection from pool (or create new if pool empty)"""
+        self._pool_open.wait()
+        self._last_activity = time.monotonic()
         try:
             # Try to get from pool with timeout
             conn = self._connection_pool.get(timeout=self.POOL_TIMEOUT)
@@ -91,15 +117,7 @@ class DatabaseManager:
             with self._pool_lock:
                 if self._pool_size < self.MAX_POOL_SIZE:
                     # Create new connection immediately
-                    conn = sqlite3.connect(
-                        self.db_path,
-                        check_same_thread=False,
-                        timeout=30.0
-                    )
-                    conn.row_factory = sqlite3.Row
-                    # WAL mode for better concurrency
-                    conn.execute("PRAGMA journal_mode=WAL")
-                    conn.execute("PRAGMA synchronous=NORMAL")
+                    conn = self._open_connection()
                     # Enable memory optimization
                     conn.execute("PRAGMA cache_size=-8000")  # 8MB cache
                     self._pool_size += 1
@@ -118,6 +136,7 @@ class DatabaseManager:
         try:
             # Ensure connection is in good state before returning
             conn.commit()  # Commit any pending transactions
+            self._last_activity = time.monotonic()
             self._connection_pool.put_nowait(conn)
         except:
             # Pool full or connection bad - close and decrease count
@@ -151,6 +170,38 @@ class DatabaseManager:
                     self.conn.rollback()
                 self.manager._return_connection(self.conn)
 
+    class _ChangeTransaction(_PooledConnection):
+        """
+        Pooled connection for writes to the events table.
+        Yields (conn, stamp); the write lock is held until the commit so change
+        stamps become visible in the order they were handed out.
+        """
+        def __enter__(self):
+            self.manager._write_lock.acquire()
+            try:
+                stamp = self.manager._next_change_stamp()
+                return super().__enter__(), stamp
+            except BaseException:
+                self.manager._write_lock.release()
+                raise
+        
+        def __exit__(self, exc_type, exc_val, exc_tb):
+            try:
+                super().__exit__(exc_type, exc_val, exc_tb)
+            finally:
+                self.manager._write_lock.release()
+
+    def _next_change_stamp(self) -> str:
+        """Return a change stamp strictly greater than any stamp issued before."""
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        if self._last_change_stamp:
+            last = datetime.strptime(self._last_change_stamp, CHANGE_STAMP_FORMAT)
+            if now <= last:
+                # Clock went backwards or two writes in the same microsecond
+                now = last + timedelta(microseconds=1)
+        self._last_change_stamp = now.strftime(CHANGE_STAMP_FORMAT)
+        return self._last_change_stamp
+
     def _create_table(self) -> None:
         """Create database table from schema.sql if not exists."""
         # Ensure schema file exists
@@ -162,8 +213,40 @@ class DatabaseManager:
             )
         
         with self._PooledConnection(self) as conn:
+            # Columns must exist before schema.sql creates indexes on them
+            self._migrate_change_tracking(conn)
             with open(SCHEMA_PATH, 'r', encoding='utf-8') as f:
                 conn.executescript(f.read())
+            
+            # Resume stamps after the newest one on disk (survives clock changes)
+            row = conn.execute(
+                "SELECT MAX(stamp) FROM ("
+                "SELECT MAX(updated_at) AS stamp FROM events "
+                "UNION ALL SELECT MAX(deleted_at) FROM deleted_events)"
+            ).fetchone()
+            self._last_change_stamp = row[0] or ''
+
+    def _migrate_change_tracking(self, conn: sqlite3.Connection) -> None:
+        """Add created_at/updated_at to databases created before change tracking."""
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(events)")}
+        if not columns:
+            return  # Fresh database - schema.sql creates the full table
+        
+        added = False
+        for column in ('created_at', 'updated_at'):
+            if column not in columns:
+                # ALTER TABLE cannot use CURRENT_TIMESTAMP defaults; backfill below
+                conn.execute(f"ALTER TABLE events ADD COLUMN {column} TEXT")
+                added = True
+        
+        if added:
+            stamp = self._next_change_stamp()
+            conn.execute(
+                "UPDATE events SET created_at = COALESCE(created_at, ?), "
+                "updated_at = COALESCE(updated_at, ?)",
+                (stamp, stamp)
+            )
+            print("📊 Migrated events table: added change tracking columns")
 
     # CRUD
     def add_event(self, event_dict: Dict[str, Any]) -> Dict[str, Any]:
@@ -186,15 +269,19 @@ class DatabaseManager:
                 }
         
         sql = (
-            "INSERT INTO events (event_name, start_time, end_time, location, reminder_minutes) "
-            "VALUES (:event_name, :start_time, :end_time, :location, :reminder_minutes)"
+            "INSERT INTO events (event_name, start_time, end_time, location, reminder_minutes, "
+            "created_at, updated_at) "
+            "VALUES (:event_name, :start_time, :end_time, :location, :reminder_minutes, "
+            ":_stamp, :_stamp)"
         )
         
         # Pass event_dict directly - validation should be done by caller
         # event_name must not be None or empty - caller must validate
         try:
-            with self._PooledConnection(self) as conn:
-                conn.execute(sql, event_dict)
+            with self._ChangeTransaction(self) as (conn, stamp):
+                cur = conn.execute(sql, {**event_dict, '_stamp': stamp})
+                # IDs are reused after the table is emptied - drop a stale tombstone
+                conn.execute("DELETE FROM deleted_events WHERE id=?", (cur.lastrowid,))
             return {'success': True}
         except sqlite3.IntegrityError as e:
             import traceback
@@ -213,6 +300,72 @@ class DatabaseManager:
                 'message': str(e)
             }
 
+    def add_events_bulk(self, events: Iterable[Dict[str, Any]], skip_duplicates: bool = True,
+                        batch_size: int = 5000) -> int:
+        """
+        Insert many events in ONE transaction (used by importers).
+        
+        Streams the iterable in batches through executemany, so the input can be
+        a generator over a file of any size.
+        
+        Args:
+            events: Event dicts (event_name/start_time required, status defaults to
+                'pending' - caller validates)
+            skip_duplicates: Skip events whose start time (to the minute) is already
+                taken, like add_event does
+            batch_size: Rows per executemany call
+            
+        Returns:
+            int: Number of events inserted
+        """
+        sql = (
+            "INSERT INTO events (event_name, start_time, end_time, location, reminder_minutes, "
+            "status, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+        )
+        inserted = 0
+        with self._ChangeTransaction(self) as (conn, stamp):
+            last_id = self._last_event_id(conn)
+            taken = set()
+            if skip_duplicates:
+                # One scan instead of a check_duplicate_time query per row
+                cur = conn.execute("SELECT DISTINCT substr(start_time, 1, 16) FROM events")
+                taken = {row[0] for row in cur}
+            
+            batch = []
+            for ev in events:
+                start_time = ev.get('start_time')
+                if skip_duplicates and start_time and len(start_time) >= 16:
+                    key = start_time[:16]
+                    if key in taken:
+                        continue
+                    taken.add(key)
+                batch.append((
+                    ev.get('event_name'), start_time, ev.get('end_time'), ev.get('location'),
+                    ev.get('reminder_minutes') or 0, ev.get('status') or 'pending', stamp, stamp,
+                ))
+                if len(batch) >= batch_size:
+                    conn.executemany(sql, batch)
+                    inserted += len(batch)
+                    batch = []
+            if batch:
+                conn.executemany(sql, batch)
+                inserted += len(batch)
+            
+            if inserted:
+                # IDs are reused after the table is emptied - drop stale tombstones
+                # (AUTOINCREMENT: the new ids are exactly the range after last_id)
+                conn.execute(
+                    "DELETE FROM deleted_events WHERE id > ? AND id <= ?",
+                    (last_id, self._last_event_id(conn))
+                )
+        return inserted
+
+    @staticmethod
+    def _last_event_id(conn: sqlite3.Connection) -> int:
+        """Last id handed out by AUTOINCREMENT for the events table."""
+        row = conn.execute("SELECT seq FROM sqlite_sequence WHERE name='events'").fetchone()
+        return row[0] if row else 0
+
     def update_event(self, event_id: int, event_dict: Dict[str, Any]) -> Dict[str, Any]:
         """
         Update an existing event.
@@ -233,12 +386,13 @@ class DatabaseManager:
         
         sql = (
             "UPDATE events SET event_name=:event_name, start_time=:start_time, end_time=:end_time, "
-            "location=:location, reminder_minutes=:reminder_minutes WHERE id=:id"
+            "location=:location, reminder_minutes=:reminder_minutes, updated_at=:_stamp WHERE id=:id"
         )
         data = dict(event_dict)
         data['id'] = event_id
         try:
-            with self._PooledConnection(self) as conn:
+            with self._ChangeTransaction(self) as (conn, stamp):
+                data['_stamp'] = stamp
                 conn.execute(sql, data)
             return {'success': True}
         except sqlite3.IntegrityError as e:
@@ -251,8 +405,13 @@ class DatabaseManager:
             }
 
     def delete_event(self, event_id: int) -> None:
-        with self._PooledConnection(self) as conn:
-            conn.execute("DELETE FROM events WHERE id=?", (event_id,))
+        with self._ChangeTransaction(self) as (conn, stamp):
+            cur = conn.execute("DELETE FROM events WHERE id=?", (event_id,))
+            if cur.rowcount:
+                conn.execute(
+                    "INSERT OR REPLACE INTO deleted_events (id, deleted_at) VALUES (?, ?)",
+                    (event_id, stamp)
+                )
             # Check if all events are deleted, if so reset the AUTOINCREMENT counter
             cur = conn.execute("SELECT COUNT(*) FROM events")
             count = cur.fetchone()[0]
@@ -267,11 +426,17 @@ class DatabaseManager:
         Returns:
             int: Number of events deleted
         """
-        with self._PooledConnection(self) as conn:
+        with self._ChangeTransaction(self) as (conn, stamp):
             # Count events before deletion
             cur = conn.execute("SELECT COUNT(*) FROM events")
             count = cur.fetchone()[0]
             
+            # Record tombstones so delta exports can propagate the deletes
+            conn.execute(
+                "INSERT OR REPLACE INTO deleted_events (id, deleted_at) SELECT id, ? FROM events",
+                (stamp,)
+            )
+            
             # Delete all events
             conn.execute("DELETE FROM events")
             
@@ -329,6 +494,35 @@ class DatabaseManager:
         finally:
             self._return_connection(conn)
 
+    def iter_events(self, columns: Optional[Sequence[str]] = None,
+                    batch_size: int = 5000) -> Iterator[sqlite3.Row]:
+        """
+        Stream events ordered by start_time without building the whole list.
+        
+        Args:
+            columns: Columns to select (default: all of EVENT_COLUMNS)
+            batch_size: Rows fetched per round trip
+            
+        Yields:
+            sqlite3.Row (a sequence - can be written straight to csv.writer)
+        """
+        columns = list(columns or EVENT_COLUMNS)
+        unknown = [c for c in columns if c not in EVENT_COLUMNS]
+        if unknown:
+            raise ValueError(f"Unknown event columns: {unknown}")
+        
+        sql = f"SELECT {', '.join(columns)} FROM events ORDER BY start_time"
+        conn = self._get_connection()
+        try:
+            cur = conn.execute(sql)
+            while True:
+                rows = cur.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            self._return_connection(conn)
+
     def get_event_by_id(self, event_id: int) -> Dict[str, Any] | None:
         conn = self._get_connection()
         try:
@@ -358,8 +552,57 @@ class DatabaseManager:
             self._return_connection(conn)
 
     def update_event_status(self, event_id: int, new_status: str) -> None:
-        with self._PooledConnection(self) as conn:
-            conn.execute("UPDATE events SET status=? WHERE id=?", (new_status, event_id))
+        with self._ChangeTransaction(self) as (conn, stamp):
+            conn.execute(
+                "UPDATE events SET status=?, updated_at=? WHERE id=?",
+                (new_status, stamp, event_id)
+            )
+
+    # --- Change tracking (delta export) ---
+    def get_changes_since(self, since_token: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Get events changed and deleted after a change token.
+        
+        Args:
+            since_token: Token returned by a previous call (None/'' = everything)
+            
+        Returns:
+            Dict with 'events' (changed rows, oldest change first), 'deleted'
+            (tombstones: id + deleted_at), 'since' and 'token' - the token to pass
+            next time (unchanged when nothing changed)
+        """
+        since = since_token or ''
+        conn = self._get_connection()
+        try:
+            # One read transaction = one consistent WAL snapshot for both queries
+            conn.execute("BEGIN")
+            cur = conn.execute(
+                "SELECT * FROM events WHERE updated_at > ? ORDER BY updated_at, id",
+                (since,)
+            )
+            events = [dict(r) for r in cur.fetchall()]
+            if since:
+                cur = conn.execute(
+                    "SELECT id, deleted_at FROM deleted_events WHERE deleted_at > ? "
+                    "ORDER BY deleted_at, id",
+                    (since,)
+                )
+                deleted = [dict(r) for r in cur.fetchall()]
+            else:
+                deleted = []  # A full export has nothing to delete on the other side
+            conn.commit()
+        finally:
+            self._return_connection(conn)
+        
+        stamps = [since]
+        stamps.extend(ev['updated_at'] for ev in events[-1:])
+        stamps.extend(d['deleted_at'] for d in deleted[-1:])
+        return {
+            'since': since_token,
+            'token': max(stamps),
+            'events': events,
+            'deleted': deleted,
+        }
 
     # --- Search helpers ---
     def search_events_by_id(self, event_id: int) -> List[Dict[str, Any]]:
@@ -432,6 +675,178 @@ class DatabaseManager:
         finally:
             self._return_connection(conn)
     
+    # --- Backup & maintenance ---
+    def backup(self, dest: str, pages_per_step: int = 256,
+               progress: Optional[Callable[[int, int, int], None]] = None) -> str:
+        """
+        Online backup using the sqlite3 backup API.
+        
+        Copies pages_per_step pages per step and releases the read lock between
+        steps, so the app keeps reading and writing while the backup runs.
+        The copy is written next to dest and renamed when complete.
+        
+        Args:
+            dest: Backup file path
+            pages_per_step: Pages copied per step (-1 = all at once)
+            progress: Optional callback(status, remaining, total) after each step
+            
+        Returns:
+            dest
+        """
+        dest_dir = os.path.dirname(os.path.abspath(dest))
+        os.makedirs(dest_dir, exist_ok=True)
+        partial = dest + '.part'
+        
+        target = sqlite3.connect(partial)
+        conn = self._get_connection()
+        try:
+            try:
+                conn.backup(target, pages=pages_per_step, progress=progress)
+            finally:
+                target.close()
+                self._return_connection(conn)
+        except BaseException:
+            # Don't leave a half-written copy next to dest
+            if os.path.exists(partial):
+                os.remove(partial)
+            raise
+        os.replace(partial, dest)
+        return dest
+
+    def _file_size(self) -> int:
+        """Database file + WAL size in bytes"""
+        size = 0
+        for path in (self.db_path, self.db_path + '-wal'):
+            if os.path.exists(path):
+                size += os.path.getsize(path)
+        return size
+
+    def wal_size(self) -> int:
+        """Size of the -wal file in bytes (0 if there is none)"""
+        try:
+            return os.path.getsize(self.db_path + '-wal')
+        except OSError:
+            return 0
+
+    def idle_seconds(self) -> float:
+        """Seconds since the last connection was used (0 while any connection is checked out)"""
+        if self._connection_pool.qsize() < self._pool_size:
+            return 0.0
+        return time.monotonic() - self._last_activity
+
+    def compact(self) -> Dict[str, int]:
+        """
+        Rebuild the database without free pages (VACUUM INTO + swap).
+        
+        Waits for every pooled connection to come back, writes a compacted copy,
+        swaps it in place of the database file and reopens the pool. Other
+        threads block until the swap is done.
+        
+        Returns:
+            Dict with 'before' and 'after' sizes in bytes (database + WAL)
+            
+        Raises:
+            RuntimeError: if connections stay checked out longer than POOL_TIMEOUT
+        """
+        compacted = self.db_path + '.compact'
+        with self._write_lock, self._pool_lock:
+            # Take every connection so nothing can touch the file during the swap
+            conns = []
+            self._pool_open.clear()
+            try:
+                for _ in range(self._pool_size):
+                    conns.append(self._connection_pool.get(timeout=self.POOL_TIMEOUT))
+            except Empty:
+                for conn in conns:
+                    self._connection_pool.put_nowait(conn)
+                raise RuntimeError("Database busy: connections still in use, compact skipped")
+            finally:
+                self._pool_open.set()
+            
+            before = self._file_size()
+            try:
+                if os.path.exists(compacted):
+                    os.remove(compacted)
+                conns[0].execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                conns[0].execute("VACUUM INTO ?", (compacted,))
+            except Exception:
+                for conn in conns:
+                    self._connection_pool.put_nowait(conn)
+                if os.path.exists(compacted):
+                    os.remove(compacted)
+                raise
+            
+            for conn in conns:
+                conn.close()
+            try:
+                os.replace(compacted, self.db_path)
+                for suffix in ('-wal', '-shm'):
+                    if os.path.exists(self.db_path + suffix):
+                        os.remove(self.db_path + suffix)
+            finally:
+                # Reopen the same number of connections (on whichever file is in place)
+                for _ in range(len(conns)):
+                    self._connection_pool.put_nowait(self._open_connection())
+            after = self._file_size()
+        
+        print(f"🗜️ Database compacted: {before // 1024} KB → {after // 1024} KB")
+        return {'before': before, 'after': after}
+
+    def checkpoint(self, mode: str = 'PASSIVE') -> Dict[str, Any]:
+        """
+        Checkpoint the WAL into the database file.
+        
+        Args:
+            mode: 'PASSIVE' (never blocks, may leave frames behind), 'FULL', 'RESTART'
+                or 'TRUNCATE' (waits for readers, then shrinks the WAL file to zero bytes)
+            
+        Returns:
+            Dict with mode, busy, log_frames, checkpointed_frames and duration_ms
+        """
+        mode = mode.upper()
+        if mode not in ('PASSIVE', 'FULL', 'RESTART', 'TRUNCATE'):
+            raise ValueError(f"Invalid checkpoint mode: {mode}")
+        
+        started = time.perf_counter()
+        with self._PooledConnection(self) as conn:
+            busy, log_frames, checkpointed = conn.execute(
+                f"PRAGMA wal_checkpoint({mode})"
+            ).fetchone()
+        return {
+            'mode': mode,
+            'busy': bool(busy),
+            'log_frames': log_frames,
+            'checkpointed_frames': checkpointed,
+            'duration_ms': (time.perf_counter() - started) * 1000,
+        }
+
+    def optimize(self, analyze: bool = False) -> float:
+        """
+        Refresh query planner statistics.
+        
+        Args:
+            analyze: Run a full ANALYZE instead of the incremental PRAGMA optimize
+            
+        Returns:
+            Duration in milliseconds
+        """
+        started = time.perf_counter()
+        with self._PooledConnection(self) as conn:
+            conn.execute("ANALYZE" if analyze else "PRAGMA optimize")
+        return (time.perf_counter() - started) * 1000
+
+    def run_maintenance(self, checkpoint_mode: str = 'PASSIVE', analyze: bool = False) -> Dict[str, Any]:
+        """
+        Refresh planner statistics and checkpoint the WAL (see optimize() and checkpoint()).
+        
+        Returns:
+            checkpoint() result plus optimize_ms
+        """
+        optimize_ms = self.optimize(analyze)
+        result = self.checkpoint(checkpoint_mode)
+        result['optimize_ms'] = optimize_ms
+        return result
+
     def close_pool(self):
         """Close all connections in pool (call on app shutdown)"""
         with self._pool_lock:
@@ -457,7 +872,7 @@ class DatabaseManager:
         Returns:
             Setting value or default
         """
-        with self._get_connection() as conn:
+        with self._PooledConnection(self) as conn:
             cursor = conn.execute(
                 "SELECT value FROM app_settings WHERE key = ?",
                 (key,)
@@ -473,7 +888,7 @@ class DatabaseManager:
             key: Setting key
             value: Setting value (stored as TEXT)
         """
-        with self._get_connection() as conn:
+        with self._PooledConnection(self) as conn:
             conn.execute("""
                 INSERT INTO app_settings (key, value, updated_at)
                 VALUES (?, ?, CURRENT_TIMESTAMP)
@@ -493,7 +908,7 @@ class DatabaseManager:
         if not settings:
             return
         
-        with self._get_connection() as conn:
+        with self._PooledConnection(self) as conn:
             for key, value in settings.items():
                 conn.execute("""
                     INSERT INTO app_settings (key, value, updated_at)
@@ -506,7 +921,7 @@ class DatabaseManager:
     
     def delete_setting(self, key: str) -> None:
         """Delete a setting by key"""
-        with self._get_connection() as conn:
+        with self._PooledConnection(self) as conn:
             conn.execute("DELETE FROM app_settings WHERE key = ?", (key,))
             conn.commit()
     
@@ -520,13 +935,13 @@ class DatabaseManager:
         if not keys:
             return
         
-        with self._get_connection() as conn:
+        with self._PooledConnection(self) as conn:
             placeholders = ','.join('?' * len(keys))
             conn.execute(f"DELETE FROM app_settings WHERE key IN ({placeholders})", keys)
             conn.commit()
     
     def get_all_settings(self) -> Dict[str, str]:
         """Get all settings as a dictionary"""
-        with self._get_connection() as conn:
+        with self._PooledConnection(self) as conn:
             cursor = conn.execute("SELECT key, value FROM app_settings")
             return {row['key']: row['value'] for row in cursor.fetchall()}
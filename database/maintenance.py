@@ -0,0 +1,167 @@
+"""
+Database Maintenance - background WAL checkpoints and planner statistics
+SQLite's automatic checkpoint is PASSIVE only: it is skipped while readers are
+active and never shrinks the -wal file, so with the notification thread writing
+and the UI reading the WAL keeps growing. This scheduler checks the WAL size on
+a daemon thread and checkpoints it:
+
+    WAL >= truncate_wal_bytes and database idle  -> TRUNCATE (WAL back to 0 bytes)
+    WAL >= passive_wal_bytes                      -> PASSIVE  (never blocks the app)
+
+It also runs PRAGMA optimize / ANALYZE periodically and keeps metrics
+(WAL size, checkpoint durations) available through get_metrics().
+"""
+from __future__ import annotations
+import threading
+import time
+from typing import Any, Dict, Optional
+
+
+class MaintenanceScheduler:
+    """WAL checkpoint + optimize policy for a DatabaseManager, run on a daemon thread."""
+
+    def __init__(self, db_manager,
+                 check_interval: float = 30.0,
+                 passive_wal_bytes: int = 1024 * 1024,
+                 truncate_wal_bytes: int = 4 * 1024 * 1024,
+                 idle_seconds: float = 10.0,
+                 optimize_interval: float = 60 * 60,
+                 analyze_interval: float = 24 * 60 * 60):
+        """
+        Args:
+            db_manager: DatabaseManager
+            check_interval: Seconds between policy checks
+            passive_wal_bytes: WAL size that triggers a PASSIVE checkpoint
+            truncate_wal_bytes: WAL size that triggers a TRUNCATE checkpoint once idle
+            idle_seconds: No connection used for this long = database idle
+            optimize_interval: Seconds between PRAGMA optimize runs
+            analyze_interval: Seconds between full ANALYZE runs (only when idle)
+        """
+        self.db_manager = db_manager
+        self.check_interval = check_interval
+        self.passive_wal_bytes = passive_wal_bytes
+        self.truncate_wal_bytes = truncate_wal_bytes
+        self.idle_seconds = idle_seconds
+        self.optimize_interval = optimize_interval
+        self.analyze_interval = analyze_interval
+
+        now = time.monotonic()
+        self._last_optimize = now
+        self._last_analyze = now
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._metrics_lock = threading.Lock()
+        self._metrics: Dict[str, Any] = {
+            'checks': 0,
+            'checkpoints': {'PASSIVE': 0, 'TRUNCATE': 0},
+            'busy_checkpoints': 0,
+            'checkpoint_ms_total': 0.0,
+            'checkpoint_ms_max': 0.0,
+            'last_checkpoint': None,
+            'optimize_runs': 0,
+            'analyze_runs': 0,
+            'last_optimize_ms': None,
+            'errors': 0,
+            'last_error': None,
+        }
+
+    # --- Thread control ---
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name='db-maintenance', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _loop(self) -> None:
+        # Event.wait doubles as an interruptible sleep
+        while not self._stop.wait(self.check_interval):
+            self.run_once()
+
+    # --- Policy ---
+    def choose_checkpoint(self, wal_bytes: int, idle: float) -> Optional[str]:
+        """Checkpoint mode for the current WAL size / idle time (None = nothing to do)."""
+        if wal_bytes >= self.truncate_wal_bytes and idle >= self.idle_seconds:
+            return 'TRUNCATE'
+        if wal_bytes >= self.passive_wal_bytes:
+            return 'PASSIVE'
+        return None
+
+    def run_once(self) -> Optional[Dict[str, Any]]:
+        """
+        Run one policy check now. Errors are counted and logged, never raised.
+
+        Returns:
+            Checkpoint result, or None if no checkpoint was needed (or it failed)
+        """
+        db = self.db_manager
+        result = None
+        try:
+            idle = db.idle_seconds()
+            mode = self.choose_checkpoint(db.wal_size(), idle)
+            if mode is not None:
+                result = db.checkpoint(mode)
+                self._record_checkpoint(result)
+
+            now = time.monotonic()
+            if idle >= self.idle_seconds and now - self._last_analyze >= self.analyze_interval:
+                self._record_optimize(db.optimize(analyze=True), analyze=True)
+                self._last_analyze = self._last_optimize = now
+            elif now - self._last_optimize >= self.optimize_interval:
+                self._record_optimize(db.optimize(), analyze=False)
+                self._last_optimize = now
+        except Exception as e:
+            with self._metrics_lock:
+                self._metrics['errors'] += 1
+                self._metrics['last_error'] = str(e)
+            print(f"⚠️ Database maintenance failed: {e}")
+        finally:
+            with self._metrics_lock:
+                self._metrics['checks'] += 1
+        return result
+
+    # --- Metrics ---
+    def _record_checkpoint(self, result: Dict[str, Any]) -> None:
+        with self._metrics_lock:
+            m = self._metrics
+            m['checkpoints'][result['mode']] = m['checkpoints'].get(result['mode'], 0) + 1
+            m['busy_checkpoints'] += result['busy']
+            m['checkpoint_ms_total'] += result['duration_ms']
+            m['checkpoint_ms_max'] = max(m['checkpoint_ms_max'], result['duration_ms'])
+            m['last_checkpoint'] = dict(result, at=time.time())
+
+    def _record_optimize(self, duration_ms: float, analyze: bool) -> None:
+        with self._metrics_lock:
+            self._metrics['analyze_runs' if analyze else 'optimize_runs'] += 1
+            self._metrics['last_optimize_ms'] = duration_ms
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Snapshot of maintenance metrics.
+
+        Returns:
+            Dict with wal_size_bytes, idle_seconds, checkpoint counts per mode,
+            busy_checkpoints, checkpoint_ms_total/max/avg, last_checkpoint,
+            optimize/analyze run counts and error counts
+        """
+        with self._metrics_lock:
+            metrics = dict(self._metrics)
+            metrics['checkpoints'] = dict(self._metrics['checkpoints'])
+        total = sum(metrics['checkpoints'].values())
+        metrics['checkpoint_ms_avg'] = metrics['checkpoint_ms_total'] / total if total else 0.0
+        metrics['wal_size_bytes'] = self.db_manager.wal_size()
+        metrics['idle_seconds'] = self.db_manager.idle_seconds()
+        return metrics
+
+
+def start_maintenance_service(db_manager, **policy) -> MaintenanceScheduler:
+    """Start background database maintenance. Keyword args override the MaintenanceScheduler policy."""
+    scheduler = MaintenanceScheduler(db_manager, **policy)
+    scheduler.start()
+    return scheduler
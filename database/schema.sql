@@ -5,7 +5,15 @@ CREATE TABLE IF NOT EXISTS events (
     end_time TEXT,                  -- Cho phép NULL (theo Image 2)
     location TEXT,
     reminder_minutes INTEGER DEFAULT 0,
-    status TEXT NOT NULL DEFAULT 'pending' -- Dùng cho hệ thống nhắc nhở ('pending', 'notified')
+    status TEXT NOT NULL DEFAULT 'pending', -- Dùng cho hệ thống nhắc nhở ('pending', 'notified')
+    created_at TEXT,                -- Change tracking (UTC ISO 8601), do DatabaseManager ghi
+    updated_at TEXT                 -- Đổi mỗi lần ghi, dùng làm watermark cho delta export
+);
+
+-- Tombstones: id của sự kiện đã xoá, để delta export báo được thao tác xoá
+CREATE TABLE IF NOT EXISTS deleted_events (
+    id INTEGER PRIMARY KEY,
+    deleted_at TEXT NOT NULL
 );
 
 -- App Settings Table (for persistent configuration)
@@ -22,3 +30,5 @@ CREATE INDEX IF NOT EXISTS idx_events_start_time ON events(start_time);
 CREATE INDEX IF NOT EXISTS idx_events_status ON events(status);
 CREATE INDEX IF NOT EXISTS idx_events_date ON events(DATE(start_time));
 CREATE INDEX IF NOT EXISTS idx_settings_key ON app_settings(key);
+CREATE INDEX IF NOT EXISTS idx_events_updated_at ON events(updated_at);
+CREATE INDEX IF NOT EXISTS idx_deleted_events_deleted_at ON deleted_events(deleted_at);
@@ -55,9 +55,10 @@ from tkcalendar import Calendar
 from datetime import date, datetime, timedelta
 
 from database.db_manager import DatabaseManager
+from database.maintenance import start_maintenance_service
 from services.notification_service import start_notification_service
-from services.export_service import export_to_json, export_to_ics
-from services.import_service import import_from_json, import_from_ics
+from services.export_service import export_to_json, export_to_ics, export_to_csv
+from services.import_service import import_from_json, import_from_ics, import_from_csv
 from services.statistics_service import StatisticsService
 from widgets.event_card import EventCard
 
@@ -65,6 +66,9 @@ from widgets.event_card import EventCard
 # Silence verbose startup logs in production builds
 VERBOSE_LOG = False
 
+# Run the NLP pipeline in a worker process (keeps the Tk main loop free during inference)
+NLP_WORKER_PROCESS = False
+
 # NLP Pipeline - Lazy-loaded for faster startup
 try:
     from core_nlp.lazy_pipeline import LazyLoadPipeline
@@ -812,6 +816,8 @@ class Application(ctk.CTk):
     
     def handle_add_event(self):
         """Add event via NLP input"""
+        if getattr(self, '_nlp_busy', False):
+            return  # previous command still being parsed
         text = self.nlp_entry.get().strip()
         
         if not text:
@@ -832,9 +838,42 @@ class Application(ctk.CTk):
             )
             return
         
+        self._async_parse_command(text)
+    
+    def _async_parse_command(self, text):
+        """Parse the command off the Tk thread (PhoBERT / the NLP worker may take seconds)"""
+        import threading
+        
+        self._nlp_busy = True
+        self.nlp_entry.configure(state='disabled')
+        
+        def parse_task():
+            """Background NLP parse"""
+            try:
+                event_dict = self.nlp_pipeline.process(text)
+            except Exception as e:
+                self.after(0, self._fail_add_event, e)
+                return
+            # Validate and save on main thread
+            self.after(0, self._complete_add_event, event_dict)
+        
+        thread = threading.Thread(target=parse_task, daemon=True)
+        thread.start()
+    
+    def _end_parse(self):
+        """Re-enable the command entry after a parse"""
+        self._nlp_busy = False
+        self.nlp_entry.configure(state='normal')
+    
+    def _fail_add_event(self, error):
+        """Report a failed parse"""
+        self._end_parse()
+        messagebox.showerror("Lỗi xử lý", f"Đã xảy ra lỗi:\n{error}")
+    
+    def _complete_add_event(self, event_dict):
+        """Validate the parsed command and add the event"""
+        self._end_parse()
         try:
-            event_dict = self.nlp_pipeline.process(text)
-            
             # Validation
             event_name = event_dict.get('event_name')
             if not event_name or not event_name.strip():
@@ -1501,7 +1540,9 @@ class Application(ctk.CTk):
             ("📥 Import JSON", self.handle_import_json),
             ("📥 Import ICS", self.handle_import_ics),
             ("📤 Export JSON", self.handle_export_json),
-            ("📤 Export ICS", self.handle_export_ics)
+            ("📤 Export ICS", self.handle_export_ics),
+            ("📥 Import CSV", self.handle_import_csv),
+            ("📤 Export CSV", self.handle_export_csv)
         ]
         
         for i, (text, cmd) in enumerate(io_buttons):
@@ -1988,9 +2029,47 @@ class Application(ctk.CTk):
             messagebox.showinfo("Nhập ICS", f"✅ Đã nhập {count} sự kiện.")
         except Exception as e:
             messagebox.showerror("Lỗi", f"Nhập ICS thất bại: {e}")
+    
+    def handle_export_csv(self):
+        """Export to CSV (UTF-8 with BOM so Excel opens it correctly)"""
+        filepath = filedialog.asksaveasfilename(
+            title="Lưu file CSV",
+            defaultextension=".csv",
+            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")],
+            initialfile="schedule_export.csv"
+        )
+        
+        if not filepath:  # User cancelled
+            return
+        
+        try:
+            count = export_to_csv(self.db_manager, filepath)
+            messagebox.showinfo("Xuất CSV", f"✅ Đã xuất {count} sự kiện:\n{filepath}")
+        except Exception as e:
+            messagebox.showerror("Lỗi", f"Xuất CSV thất bại: {e}")
+    
+    def handle_import_csv(self):
+        """Import from CSV (bulk insert, duplicates by start time are skipped)"""
+        path = filedialog.askopenfilename(
+            title="Chọn file CSV",
+            filetypes=[("CSV", "*.csv")]
+        )
+        if not path:
+            return
+        
+        try:
+            count = import_from_csv(self.db_manager, path)
+            self.refresh_for_date(self.calendar.selection_get())
+            messagebox.showinfo("Nhập CSV", f"✅ Đã nhập {count} sự kiện.")
+        except Exception as e:
+            messagebox.showerror("Lỗi", f"Nhập CSV thất bại: {e}")
 
 
 if __name__ == '__main__':
+    # Worker processes of the packaged (PyInstaller) app re-enter here
+    import multiprocessing
+    multiprocessing.freeze_support()
+    
     if VERBOSE_LOG:
         print("\n" + "="*70)
         print("🚀 CUSTOMTKINTER VERSION - Modern UI")
@@ -2013,14 +2092,30 @@ if __name__ == '__main__':
         current_info = sound_mgr.get_current_sound_info()
         print(f"🔊 Sound loaded: {current_info['name']} ({current_info['type']})")
     
-    # Initialize NLP Pipeline (Lazy-loaded > Hybrid > PhoBERT > Rule-based)
-    if USE_LAZY:
+    # Initialize NLP Pipeline (Worker process > Lazy-loaded > Hybrid > PhoBERT > Rule-based)
+    if NLP_WORKER_PROCESS:
+        import os
+        from core_nlp.worker_pipeline import ProcessNLPPipeline
+        model_path = "./models/phobert_finetuned"
+        nlp = ProcessNLPPipeline(
+            model_path=model_path if os.path.exists(model_path) else None,
+            phobert_idle_minutes=30,
+        )
+    elif USE_LAZY:
         # Use Lazy-loaded Pipeline (defers model loading until first use)
         import os
         model_path = "./models/phobert_finetuned"
         if VERBOSE_LOG:
             print("⚡ Deferring NLP Pipeline initialization...")
-        nlp = LazyLoadPipeline(model_path=model_path if os.path.exists(model_path) else None)
+        nlp = LazyLoadPipeline(
+            model_path=model_path if os.path.exists(model_path) else None,
+            progress_callback=(lambda stage, fraction: print(f"📊 NLP preload: {stage} ({fraction:.0%})"))
+            if VERBOSE_LOG else None,
+            # Most sessions add a few events a day: free the PhoBERT memory in between
+            idle_unload_minutes=30,
+        )
+        # Warm up PhoBERT while the window opens; rule-based answers until it is ready
+        nlp.start_preload()
     elif USE_HYBRID:
         import os
         model_path = "./models/phobert_finetuned"
@@ -2053,11 +2148,15 @@ if __name__ == '__main__':
             sound_mgr.flush_pending_saves(timeout=1.0)
         except Exception as e:
             print(f"⚠️ Error flushing settings: {e}")
+        maintenance.stop(timeout=1.0)
+        if NLP_WORKER_PROCESS:
+            nlp.close()
         app.destroy()
     
     app.protocol("WM_DELETE_WINDOW", on_app_closing)
     
     start_notification_service(app, db)
+    maintenance = start_maintenance_service(db)
     
     if VERBOSE_LOG:
         print("✅ Application started! Enjoy the modern UI!\n")
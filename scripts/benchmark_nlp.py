@@ -0,0 +1,106 @@
+"""
+NLP throughput benchmark: NLPPipeline.process vs process_batch
+
+Usage:
+    python scripts/benchmark_nlp.py                 # 2000 sentences, batch of 256
+    python scripts/benchmark_nlp.py --n 10000 --batch-size 1000
+    python scripts/benchmark_nlp.py --input sentences.txt   # one sentence per line
+
+Checks that both paths return identical results, then prints sentences/second
+and the per-stage location hit rates (NER runs/skips of the stage scheduler).
+"""
+from __future__ import annotations
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core_nlp.pipeline import NLPPipeline  # noqa: E402
+
+# Representative commands (with/without diacritics, reminders, locations, NER fallback)
+SAMPLE_SENTENCES = [
+    "Họp nhóm lúc 10h sáng mai ở phòng 302",
+    "hop nhom luc 10h sang mai o phong 302",
+    "Nhắc tôi đi khám răng 3 giờ chiều thứ 6 tại nha khoa Kim, nhắc trước 30 phút",
+    "Ăn trưa với Lan 12h30 ngày 20/11",
+    "đi chợ 7h sáng",
+    "Gặp khách hàng ở quán cafe 24h lúc 9 giờ tối nay",
+    "Học tiếng Anh từ 19h đến 21h thứ 3 tuần sau",
+    "Sinh nhật mẹ ngày 5 tháng 12 năm 2025, nhắc trước 1 ngày",
+    "Chạy bộ công viên Thống Nhất 5h30 sáng chủ nhật",
+    "Nộp báo cáo 17h hôm nay",
+    "Đi xem phim tại CGV Vincom tối mai nhắc tôi trước 2 tiếng",
+    "Họp phụ huynh ở trường Nguyễn Du chiều thứ bảy",
+    "Cắt tóc lúc 4 giờ chiều",
+    "gọi điện cho bố mẹ tối nay",
+    "Đá bóng sân Chảo Lửa 18h thứ 5 hàng tuần",
+    "Khám sức khỏe định kỳ tại bệnh viện Bạch Mai 8h ngày mai",
+    "ăn tối với đồng nghiệp ở nhà hàng Sen lúc 7h tối",
+    "Phỏng vấn công ty ABC 14h00 ngày 03/12/2025",
+    "Tập gym 6h sáng mai nhắc 15 phút",
+    "đi siêu thị mua đồ cuối tuần",
+]
+
+
+def build_corpus(n: int) -> List[str]:
+    """n sentences cycling through SAMPLE_SENTENCES with varied hours (few exact repeats)."""
+    out = []
+    i = 0
+    while len(out) < n:
+        base = SAMPLE_SENTENCES[i % len(SAMPLE_SENTENCES)]
+        variant = i // len(SAMPLE_SENTENCES)
+        out.append(base if variant == 0 else f"{base} ghi chú {variant}")
+        i += 1
+    return out
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark NLPPipeline.process vs process_batch")
+    parser.add_argument('--n', type=int, default=2000, help="Number of sentences")
+    parser.add_argument('--batch-size', type=int, default=256)
+    parser.add_argument('--input', help="Text file with one sentence per line (overrides --n corpus)")
+    args = parser.parse_args()
+
+    if args.input:
+        with open(args.input, encoding='utf-8') as f:
+            texts = [line.rstrip('\n') for line in f if line.strip()]
+    else:
+        texts = build_corpus(args.n)
+
+    base = datetime(2025, 11, 3, 9, 0)
+    pipeline = NLPPipeline(relative_base=base)
+    pipeline.process("khởi động")  # warm up (NER model load)
+
+    t0 = time.perf_counter()
+    single = [pipeline.process(t) for t in texts]
+    t_single = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    batched = []
+    for i in range(0, len(texts), args.batch_size):
+        batched.extend(pipeline.process_batch(texts[i:i + args.batch_size]))
+    t_batch = time.perf_counter() - t0
+
+    mismatches = [i for i, (a, b) in enumerate(zip(single, batched)) if a != b]
+    print(f"📊 {len(texts)} sentences, batch size {args.batch_size}")
+    print(f"   process():       {t_single:8.2f}s  {len(texts) / t_single:10.0f} sentences/s")
+    print(f"   process_batch(): {t_batch:8.2f}s  {len(texts) / t_batch:10.0f} sentences/s"
+          f"  (x{t_single / t_batch:.2f})")
+    if mismatches:
+        i = mismatches[0]
+        print(f"❌ {len(mismatches)} results differ, first: {texts[i]!r}\n   {single[i]}\n   {batched[i]}")
+        return 1
+    print("✅ Batch results identical to per-item process()")
+    print("📍 Location stages (both passes):")
+    for stage, st in pipeline.stage_stats().items():
+        print(f"   {stage:<10} runs {st['runs']:6d}  hits {st['hit_rate']:6.1%}  "
+              f"skipped {st['skipped']:6d}  avg {st['avg_ms']:7.3f} ms")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,115 @@
+"""
+PhoBERT classifier latency: torch vs ONNX Runtime
+
+Usage:
+    python scripts/export_onnx.py                     # once, writes model.onnx
+    python scripts/benchmark_onnx.py
+    python scripts/benchmark_onnx.py --n 500 --batch-size 16 --threads 1 2 4
+    python scripts/benchmark_onnx.py --input sentences.txt   # one sentence per line
+
+Loads the fine-tuned classifier with the torch backend and with
+OnnxPhoBERTBackend (one session per --threads value), checks that both predict
+the same event/time/location/reminder heads on every sentence, then prints the
+per-sentence latency (mean / p50 / p95) for batches of 1 and of --batch-size,
+and the largest logit difference. Exits 1 if any prediction differs.
+"""
+from __future__ import annotations
+import argparse
+import os
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core_nlp.onnx_backend import ONNX_AVAILABLE, OnnxPhoBERTBackend  # noqa: E402
+from core_nlp.phobert_model import CLASSIFIER_HEADS, TRANSFORMERS_AVAILABLE, PhoBERTEventExtractor  # noqa: E402
+from scripts.benchmark_nlp import build_corpus  # noqa: E402
+
+
+def latency_ms(predict: Callable[[List[str]], object], texts: List[str], batch_size: int) -> Dict[str, float]:
+    """Per-sentence latency of predict over texts in batches of batch_size"""
+    predict(texts[:batch_size])  # warm up
+    per_sentence = []
+    for start in range(0, len(texts), batch_size):
+        batch = texts[start:start + batch_size]
+        t = time.perf_counter()
+        predict(batch)
+        per_sentence.append((time.perf_counter() - t) * 1000 / len(batch))
+    per_sentence.sort()
+    return {
+        'mean': statistics.fmean(per_sentence),
+        'p50': per_sentence[len(per_sentence) // 2],
+        'p95': per_sentence[min(len(per_sentence) - 1, int(len(per_sentence) * 0.95))],
+    }
+
+
+def max_logit_diff(extractor: PhoBERTEventExtractor, backend: OnnxPhoBERTBackend, texts: List[str]) -> float:
+    """Largest absolute difference between torch and ONNX logits, batch of 1"""
+    import torch
+
+    worst = 0.0
+    for text in texts:
+        inputs = extractor._tokenize([text])
+        with torch.no_grad():
+            expected = extractor.classifier(inputs['input_ids'], inputs['attention_mask'])
+        actual = backend.logits([text])
+        for head in CLASSIFIER_HEADS:
+            worst = max(worst, float(abs(expected[head].numpy() - actual[head]).max()))
+    return worst
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the PhoBERT classifier on torch vs ONNX Runtime")
+    parser.add_argument('--model-path', default='./models/phobert_finetuned')
+    parser.add_argument('--n', type=int, default=200, help="Number of sentences")
+    parser.add_argument('--batch-size', type=int, default=8)
+    parser.add_argument('--threads', type=int, nargs='+', default=[0],
+                        help="onnxruntime intra-op threads to compare (0 = one per core)")
+    parser.add_argument('--input', help="File with one sentence per line (instead of the built-in corpus)")
+    args = parser.parse_args()
+
+    if not (TRANSFORMERS_AVAILABLE and ONNX_AVAILABLE):
+        print("❌ Needs torch, transformers and onnxruntime")
+        return 1
+    if args.input:
+        with open(args.input, encoding='utf-8') as f:
+            texts = [line.strip() for line in f if line.strip()]
+    else:
+        texts = build_corpus(args.n)
+
+    extractor = PhoBERTEventExtractor(model_path=args.model_path, device='cpu', cache_size=0)
+    if extractor.classifier is None:
+        print(f"❌ No fine-tuned classifier in {args.model_path}")
+        return 1
+    variants = {'torch': extractor._predict_heads}
+    backends = {}
+    for threads in args.threads:
+        backends[threads] = OnnxPhoBERTBackend(args.model_path, intra_op_threads=threads)
+        variants[f'onnx x{threads}' if threads else 'onnx'] = backends[threads].predict
+
+    # Same decisions, sentence by sentence
+    expected = extractor._predict_heads(texts)
+    for name, predict in variants.items():
+        actual = predict(texts)
+        diffs = sum(any(actual[h][i] != expected[h][i] for h in CLASSIFIER_HEADS) for i in range(len(texts)))
+        if diffs:
+            print(f"❌ {name}: {diffs}/{len(texts)} sentences predicted differently from torch")
+            return 1
+    print(f"✅ Identical event/time/location/reminder predictions on {len(texts)} sentences")
+    print(f"   max |logit diff| torch vs onnx: {max_logit_diff(extractor, backends[args.threads[0]], texts):.2e}")
+
+    for batch_size in (1, args.batch_size):
+        print(f"⏱️  Per sentence, batches of {batch_size}:")
+        base = None
+        for name, predict in variants.items():
+            stats = latency_ms(predict, texts, batch_size)
+            base = base or stats['mean']
+            print(f"   {name:<10} mean {stats['mean']:7.2f} ms  p50 {stats['p50']:7.2f} ms  "
+                  f"p95 {stats['p95']:7.2f} ms  (x{base / stats['mean']:.2f})")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,207 @@
+"""
+PhoBERT heuristics micro-benchmark: compiled pattern bank vs per-call regex lists
+
+Usage:
+    python scripts/benchmark_phobert_heuristics.py              # built-in corpus, 20 rounds
+    python scripts/benchmark_phobert_heuristics.py --rounds 50
+    python scripts/benchmark_phobert_heuristics.py --input sentences.txt   # one sentence per line
+
+The rule-based extractors of PhoBERTEventExtractor (time, location, reminder,
+event name) match with heuristic_patterns.HeuristicPatterns. This script replays
+the previous algorithm (pattern strings re.search-ed / re.sub-ed one at a time
+on every call) with the same pattern lists, checks that both give identical
+results on every sentence, then prints the time per sentence of each extractor.
+"""
+from __future__ import annotations
+import argparse
+import itertools
+import os
+import re
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core_nlp import heuristic_patterns as hp  # noqa: E402
+from core_nlp.normalized_text import NormalizedText  # noqa: E402
+from core_nlp.phobert_model import PhoBERTEventExtractor  # noqa: E402
+from scripts.benchmark_nlp import SAMPLE_SENTENCES  # noqa: E402
+
+# Phrases combined with every sample sentence (equivalence corpus)
+EXTRA_PHRASES = [
+    "", "o truong ham tu", "tại công ty ABC phòng 401", "ở quán cafe Trung Nguyên", "đi chợ", "ra cho",
+    "nhắc tôi trước 10 phút", "nhac toi truoc 1h", "nhắc sớm hơn 2 giờ", "15 phút trước nhắc", "nhắc",
+    "từ 9h đến 11h sáng mai", "muoi gio sang chu nhat", "t5 8h sang", "cn tuần sau", "hôm qua ngày mốt",
+    "vào lúc cho đến", "ăn tối", "siêu thị", "tầng 5", "sauh gio chieu", "9:00 cn tuần sau",
+]
+
+
+def build_corpus() -> List[str]:
+    """Every sample sentence with every extra phrase, before and after it, as typed and lowercased."""
+    out = []
+    for sentence, phrase in itertools.product(SAMPLE_SENTENCES, EXTRA_PHRASES):
+        for text in (f"{sentence} {phrase}".strip(), f"{phrase} {sentence}".strip()):
+            out.append(text)
+            out.append(text.lower())
+    return out
+
+
+# --- Per-call regex lists (reference implementation) ---
+
+def legacy_time(text: str) -> Optional[str]:
+    normalized = NormalizedText.of(text)
+    raw = normalized.raw
+    best_length = 0
+    best_span = None
+    for pattern in hp.TIME_HEURISTIC_PATTERNS:
+        match = re.search(pattern, normalized.folded)
+        if match and len(match.group(0)) > best_length:
+            best_length = len(match.group(0))
+            best_span = match.span()
+    if not best_span:
+        return None
+    start, end = normalized.to_raw_span(*best_span)
+    while end < len(raw) and raw[end].isalpha():
+        end += 1
+    return raw[start:end]
+
+
+def legacy_location(text: str) -> Optional[str]:
+    match = re.search(hp.LOCATION_MARKER_PATTERN, text, re.IGNORECASE)
+    if match:
+        location = match.group(1).strip()
+        if len(location) > 2:
+            return location
+    for pattern in hp.LOCATION_FALLBACK_PATTERNS:
+        match = re.search(pattern, text, re.IGNORECASE)
+        if match:
+            location = re.sub(r'^(?:ở|o|tại|tai|đến|den|về|ve)\s+', '', match.group(0), flags=re.IGNORECASE)
+            location = location.strip(' ,.;')
+            location = re.split(r'\s+(?:\d{1,2}(?:h|:|giờ|gio)|nhắc|nhac|remind)', location)[0]
+            if len(location) > 2:
+                return location
+    return None
+
+
+def legacy_reminder(text: str) -> int:
+    for pattern, multiplier in hp.REMINDER_PATTERNS:
+        match = re.search(pattern, text, re.IGNORECASE)
+        if match:
+            return int(match.group(1)) * multiplier
+    if re.search(hp.REMINDER_KEYWORD_PATTERN, text, re.IGNORECASE):
+        return 15
+    return 0
+
+
+def legacy_event_name(text: str, extracted: Dict[str, Any]) -> str:
+    def sub_all(patterns, s):
+        for pattern in patterns:
+            s = re.sub(pattern, ' ', s, flags=re.IGNORECASE)
+        return s
+
+    def words(ws):
+        return [r'\b' + re.escape(w) + r'\b' for w in ws]
+
+    cleaned = sub_all(hp.EVENT_WEEKDAY_PATTERNS, text)
+    cleaned = sub_all(hp.EVENT_TIME_PATTERNS, cleaned)
+    if extracted.get('time_str'):
+        cleaned = cleaned.replace(extracted['time_str'], ' ')
+    cleaned = re.sub(hp.EVENT_LOCATION_MARKER_PATTERN, ' ', cleaned, flags=re.IGNORECASE)
+    if extracted.get('location'):
+        location = extracted['location']
+        cleaned = cleaned.replace(location, ' ')
+        for word in location.split():
+            if len(word) > 2:
+                skip = False
+                for phrase_pattern in hp.EVENT_COMPOUND_PHRASES:
+                    match = re.search(phrase_pattern, cleaned, re.IGNORECASE)
+                    if match and word.lower() in match.group().lower():
+                        skip = True
+                        break
+                if not skip:
+                    cleaned = re.sub(r'\b' + re.escape(word) + r'\b', ' ', cleaned, flags=re.IGNORECASE)
+    cleaned = sub_all(hp.EVENT_REMINDER_PATTERNS, cleaned)
+    cleaned = sub_all(words(hp.EVENT_RELATIVE_WORDS), cleaned)
+    cleaned = re.sub(hp.EVENT_TOI_PATTERN, ' ', cleaned, flags=re.IGNORECASE)
+    cleaned = sub_all(words(hp.EVENT_PERIOD_WORDS), cleaned)
+    cleaned = sub_all(words(hp.EVENT_CONNECTORS), cleaned)
+    cleaned = sub_all(hp.EVENT_LOCATION_FRAGMENTS, cleaned)
+    cleaned = sub_all([hp.EVENT_CAFE_PATTERN, hp.EVENT_MARKET_PATTERN, hp.EVENT_MARKET_WORDS_PATTERN], cleaned)
+    cleaned = re.sub(hp.EVENT_NUMBER_PATTERN, ' ', cleaned)
+    cleaned = re.sub(hp.EVENT_TYPO_NUMBER_PATTERN, ' ', cleaned, flags=re.IGNORECASE)
+    cleaned = re.sub(r'\s+', ' ', cleaned).strip(' ,.;-:!?')
+    tokens = cleaned.split()
+    if len(tokens) > 1 and len(tokens[-1]) <= 3 and tokens[-1].lower() in hp.EVENT_TRAILING_FRAGMENTS:
+        cleaned = ' '.join(tokens[:-1])
+    if not cleaned or len(cleaned) < 2:
+        for verb in hp.EVENT_ACTION_VERBS:
+            if re.search(r'\b' + re.escape(verb) + r'\b', text, flags=re.IGNORECASE):
+                match = re.search(r'\b' + re.escape(verb) + r'\b(?:\s+\w+){0,2}', text, flags=re.IGNORECASE)
+                if match:
+                    cleaned = sub_all(hp.EVENT_LOCATION_FRAGMENTS, match.group(0))
+                    cleaned = re.sub(r'\s+', ' ', cleaned).strip()
+                    break
+    if not cleaned or len(cleaned) < 2:
+        cleaned = ' '.join(text.split()[:3])
+    return cleaned.strip()
+
+
+def best_time(fn: Callable[[str], Any], texts: List[str], rounds: int) -> float:
+    """Best of rounds, seconds per sentence."""
+    best = float('inf')
+    for _ in range(rounds):
+        t0 = time.perf_counter()
+        for t in texts:
+            fn(t)
+        best = min(best, time.perf_counter() - t0)
+    return best / len(texts)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the compiled PhoBERT heuristic patterns")
+    parser.add_argument('--rounds', type=int, default=20)
+    parser.add_argument('--input', help="Text file with one sentence per line (overrides the built-in corpus)")
+    args = parser.parse_args()
+
+    if args.input:
+        with open(args.input, encoding='utf-8') as f:
+            texts = [line.strip() for line in f if line.strip()]
+    else:
+        texts = build_corpus()
+
+    extractor = PhoBERTEventExtractor(fallback_mode=True, cache_size=0)
+    # Event name is cleaned with the extracted fields of the same sentence
+    fields = {t: {'time_str': extractor._extract_time_heuristic(t),
+                  'location': extractor._extract_location_heuristic(t),
+                  'reminder_minutes': extractor._extract_reminder(t)} for t in texts}
+
+    extractors = [
+        ('time', extractor._extract_time_heuristic, legacy_time),
+        ('location', extractor._extract_location_heuristic, legacy_location),
+        ('reminder', extractor._extract_reminder, legacy_reminder),
+        ('event name', lambda t: extractor._extract_event_name(t, fields[t]),
+         lambda t: legacy_event_name(t, fields[t])),
+    ]
+
+    for name, bank_fn, legacy_fn in extractors:
+        mismatches = [t for t in texts if bank_fn(t) != legacy_fn(t)]
+        if mismatches:
+            t = mismatches[0]
+            print(f"❌ {name}: {len(mismatches)} of {len(texts)} sentences differ, first: {t!r}\n"
+                  f"   pattern bank: {bank_fn(t)!r}\n"
+                  f"   legacy:       {legacy_fn(t)!r}")
+            return 1
+
+    print(f"📊 {len(texts)} sentences, best of {args.rounds}")
+    for name, bank_fn, legacy_fn in extractors:
+        t_legacy = best_time(legacy_fn, texts, args.rounds)
+        t_bank = best_time(bank_fn, texts, args.rounds)
+        print(f"   {name:<10} per-call regex lists: {t_legacy * 1e6:7.1f} µs   "
+              f"pattern bank: {t_bank * 1e6:7.1f} µs  (x{t_legacy / t_bank:.2f})")
+    print("✅ Identical time, location, reminder and event name on every sentence")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,116 @@
+"""
+Reminder extraction micro-benchmark: unified grammar vs the per-form regex loop
+
+Usage:
+    python scripts/benchmark_reminder.py              # built-in corpora, 20 rounds
+    python scripts/benchmark_reminder.py --rounds 50
+    python scripts/benchmark_reminder.py --input sentences.txt   # one sentence per line
+
+NLPPipeline._extract_reminder scans the text once with the unified reminder
+grammar. This script replays the previous algorithm (ten numeric forms searched
+one by one, then the presence and standalone-keyword passes) with the same
+compiled patterns, checks that both give identical (minutes, text, has_reminder)
+on every sentence, then prints the time per sentence for the benchmark_nlp
+sample commands (mostly without reminders) and for a reminder-heavy corpus.
+"""
+from __future__ import annotations
+import argparse
+import itertools
+import os
+import re
+import sys
+import time
+from typing import List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core_nlp.pipeline import NLPPipeline  # noqa: E402
+from scripts.benchmark_nlp import SAMPLE_SENTENCES, build_corpus as build_sample_corpus  # noqa: E402
+
+# Reminder phrasings combined with every sample sentence (equivalence corpus)
+REMINDER_PHRASES = [
+    "", "nhắc tôi", "nhac toi truoc", "nhắc trước 30 phút", "nhac 10p truoc", "nhắc mình 2 tiếng",
+    "báo trước 1 ngày", "bao thuc 5 h", "15 phút trước nhắc tôi", "1 tuần trước nhắc",
+    "remind me 2 day before", "notify 3 w", "nhắc tôi 1 tháng trước", "nhắc sớm hơn 45'",
+    "2h trước nhắc, nhắc 10 phút", "nhắc 1000 phút", "sớm hơn", "before 2", "nhắc nhở 2 ngày trước 1 h nhắc",
+]
+
+
+def build_reminder_corpus() -> List[str]:
+    """Every sample sentence with every reminder phrase, before and after it."""
+    out = []
+    for sentence, phrase in itertools.product(SAMPLE_SENTENCES, REMINDER_PHRASES):
+        out.append(f"{sentence} {phrase}".strip().lower())
+        out.append(f"{phrase} {sentence}".strip().lower())
+    return out
+
+
+def legacy_extract_reminder(pipeline: NLPPipeline, text: str) -> Tuple[int, str, bool]:
+    """Per-form regex loop the unified grammar replaces (reference implementation)."""
+    minutes = 0
+    has = False
+    working = text
+    for rx, factor in pipeline.reminder_regexes:
+        m = rx.search(working)
+        if m:
+            minutes = max(minutes, int(m.group(1)) * factor)
+            has = True
+            working = working.replace(m.group(0), ' ').strip()
+    if not has and pipeline.reminder_presence_regex.search(working):
+        has = True
+        working = pipeline.reminder_presence_regex.sub(' ', working).strip()
+    working = pipeline.reminder_standalone_regex.sub(' ', working)
+    working = re.sub(r'\s{2,}', ' ', working).strip()
+    return minutes, working, has
+
+
+def best_time(fn, texts: List[str], rounds: int) -> float:
+    """Best of rounds, seconds per sentence."""
+    best = float('inf')
+    for _ in range(rounds):
+        t0 = time.perf_counter()
+        for t in texts:
+            fn(t)
+        best = min(best, time.perf_counter() - t0)
+    return best / len(texts)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the unified reminder grammar")
+    parser.add_argument('--rounds', type=int, default=20)
+    parser.add_argument('--input', help="Text file with one sentence per line (overrides the built-in corpus)")
+    args = parser.parse_args()
+
+    if args.input:
+        with open(args.input, encoding='utf-8') as f:
+            corpora = {'input': [line.strip().lower() for line in f if line.strip()]}
+    else:
+        corpora = {
+            'sample commands': [t.lower() for t in build_sample_corpus(2000)],
+            'reminder-heavy': build_reminder_corpus(),
+        }
+
+    pipeline = NLPPipeline(cache_size=0, gazetteer_path=None)
+
+    for name, texts in corpora.items():
+        mismatches = [t for t in texts
+                      if pipeline._extract_reminder(t) != legacy_extract_reminder(pipeline, t)]
+        if mismatches:
+            t = mismatches[0]
+            print(f"❌ {name}: {len(mismatches)} of {len(texts)} sentences differ, first: {t!r}\n"
+                  f"   grammar: {pipeline._extract_reminder(t)}\n"
+                  f"   legacy:  {legacy_extract_reminder(pipeline, t)}")
+            return 1
+
+        t_legacy = best_time(lambda t: legacy_extract_reminder(pipeline, t), texts, args.rounds)
+        t_grammar = best_time(pipeline._extract_reminder, texts, args.rounds)
+        with_reminder = sum(1 for t in texts if pipeline._extract_reminder(t)[2])
+        print(f"📊 {name}: {len(texts)} sentences ({with_reminder} with a reminder phrase), best of {args.rounds}")
+        print(f"   per-form regex loop: {t_legacy * 1e6:8.1f} µs/sentence")
+        print(f"   unified grammar:     {t_grammar * 1e6:8.1f} µs/sentence  (x{t_legacy / t_grammar:.2f})")
+    print("✅ Identical minutes, text and reminder flag on every sentence")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
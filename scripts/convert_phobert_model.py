@@ -0,0 +1,127 @@
+"""
+Convert a legacy fine-tuned PhoBERT model (model.pt) to the self-contained format
+
+Usage:
+    python scripts/convert_phobert_model.py
+    python scripts/convert_phobert_model.py --model-path ./models/phobert_finetuned --remove-pt
+
+model.pt only holds a state dict, so loading it builds vinai/phobert-base first
+(Hub cache or network) and then reads the weights a second time. This writes
+the same weights as encoder/ (transformers config + model.safetensors) and
+heads.safetensors next to it (PhoBERTEventClassifier.save_pretrained), checks
+that the reloaded classifier gives the same logits on the benchmark_nlp sample
+commands, and prints the load time and RSS of both formats. Each load runs in
+its own process. Exits 1 if the logits differ.
+"""
+from __future__ import annotations
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core_nlp.process_memory import current_rss_mb  # noqa: E402
+from scripts.benchmark_nlp import SAMPLE_SENTENCES  # noqa: E402
+
+
+def load_report(model_path: str, legacy: bool) -> Dict[str, Any]:
+    """Load one format, time it and compute the sample logits (runs in the worker process)"""
+    import torch
+    from core_nlp.phobert_trainer import PhoBERTEventClassifier
+    from transformers import AutoModel, AutoTokenizer
+
+    rss_before = current_rss_mb()
+    t0 = time.perf_counter()
+    if legacy:
+        classifier = PhoBERTEventClassifier(AutoModel.from_pretrained("vinai/phobert-base"))
+        classifier.load_state_dict(torch.load(Path(model_path) / "model.pt", map_location='cpu'))
+        classifier.eval()
+    else:
+        classifier = PhoBERTEventClassifier.from_pretrained(model_path)
+    load_s = time.perf_counter() - t0
+    rss_loaded = current_rss_mb()
+
+    tokenizer = AutoTokenizer.from_pretrained(model_path)
+    inputs = tokenizer(SAMPLE_SENTENCES, return_tensors='pt', padding=True, truncation=True, max_length=256)
+    with torch.no_grad():
+        outputs = classifier(inputs['input_ids'], inputs['attention_mask'])
+    return {
+        'load_s': load_s,
+        'rss_before_mb': rss_before,
+        'rss_loaded_mb': rss_loaded,
+        'logits': {head: values.tolist() for head, values in outputs.items()},
+    }
+
+
+def spawn(model_path: str, worker: str) -> Dict[str, Any]:
+    """load_report in a fresh process; its report is the last stdout line"""
+    cmd = [sys.executable, os.path.abspath(__file__), '--model-path', model_path, '--worker', worker]
+    proc = subprocess.run(cmd, capture_output=True, text=True, encoding='utf-8')
+    if proc.returncode != 0:
+        raise SystemExit(f"❌ {worker} worker failed:\n{proc.stdout}\n{proc.stderr}")
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def max_diff(a: Dict[str, Any], b: Dict[str, Any]) -> float:
+    """Largest absolute difference between two logits reports"""
+    return max(abs(x - y) for head in a for row_a, row_b in zip(a[head], b[head]) for x, y in zip(row_a, row_b))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Convert model.pt to the self-contained PhoBERT format")
+    parser.add_argument('--model-path', default='./models/phobert_finetuned')
+    parser.add_argument('--remove-pt', action='store_true', help="Delete model.pt after a successful check")
+    parser.add_argument('--worker', choices=('legacy', 'self-contained'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(load_report(args.model_path, legacy=args.worker == 'legacy')))
+        return 0
+
+    import torch
+    from core_nlp.phobert_trainer import ENCODER_DIR, HEADS_FILE, PhoBERTEventClassifier
+    from transformers import AutoModel
+
+    model_path = Path(args.model_path)
+    model_pt = model_path / "model.pt"
+    if not model_pt.exists():
+        print(f"❌ No model.pt in {model_path}")
+        return 1
+
+    print(f"🔄 Converting {model_pt}...")
+    classifier = PhoBERTEventClassifier(AutoModel.from_pretrained("vinai/phobert-base"))
+    classifier.load_state_dict(torch.load(model_pt, map_location='cpu'))
+    classifier.save_pretrained(model_path)
+    config_file = model_path / "config.json"
+    config = json.loads(config_file.read_text(encoding='utf-8')) if config_file.exists() else {}
+    config.update({'encoder': ENCODER_DIR, 'heads': HEADS_FILE})
+    config_file.write_text(json.dumps(config, indent=2, ensure_ascii=False), encoding='utf-8')
+    del classifier
+    print(f"💾 Wrote {model_path / ENCODER_DIR} and {model_path / HEADS_FILE}")
+
+    legacy = spawn(args.model_path, 'legacy')
+    converted = spawn(args.model_path, 'self-contained')
+    diff = max_diff(legacy['logits'], converted['logits'])
+    print("📊 Cold start (fresh process):")
+    print(f"   load time  model.pt {legacy['load_s']:7.2f} s    self-contained {converted['load_s']:7.2f} s")
+    if legacy['rss_loaded_mb'] is not None:
+        print(f"   RSS        model.pt {legacy['rss_loaded_mb']:7.1f} MB   "
+              f"self-contained {converted['rss_loaded_mb']:7.1f} MB")
+    print(f"   max |logit diff| {diff:.2e}")
+    if diff > 1e-4:
+        print("❌ Converted model gives different logits, keeping model.pt")
+        return 1
+    if args.remove_pt:
+        model_pt.unlink()
+        print(f"🗑️ Removed {model_pt}")
+    print("✅ Converted, loads offline from", model_path)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,188 @@
+"""
+INT8 vs fp32 evaluation of the fine-tuned PhoBERT classifier
+
+Usage:
+    python scripts/evaluate_quantization.py
+    python scripts/evaluate_quantization.py --model-path ./models/phobert_finetuned \\
+        --test-file ./tests/extended_test_cases.json --limit 2000
+
+Loads PhoBERTEventExtractor with quantize=None and quantize='int8' (each in its
+own process, so the RSS figures don't mix), predicts the four classifier heads
+(has event / time / location / reminder) for every test case, and reports:
+    - accuracy per head against the test-case labels, and the int8 - fp32 delta
+    - how often int8 and fp32 predict the same
+    - forward-pass latency per sentence (mean / p50 / p95, batch of 1)
+    - RSS after loading, load time and weight size on disk
+
+Labels come from the test case the same way training builds them
+(phobert_trainer.EventExtractionDataset). Exits 1 if the overall accuracy
+drops by more than --max-drop points.
+"""
+from __future__ import annotations
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core_nlp.phobert_model import CLASSIFIER_HEADS, PhoBERTEventExtractor, QUANTIZED_FILE  # noqa: E402
+from core_nlp.process_memory import current_rss_mb  # noqa: E402
+
+
+def load_test_cases(test_file: str, limit: int) -> Tuple[List[str], List[List[int]]]:
+    """(texts, labels) with one 0/1 label per head, both test-case formats"""
+    with open(test_file, encoding='utf-8') as f:
+        cases = json.load(f)
+    texts, labels = [], []
+    for item in cases[:limit] if limit else cases:
+        if 'input' in item:
+            text = item['input']
+            expected = item.get('expected', {})
+        else:
+            text = item['text']
+            expected = item
+        texts.append(text)
+        labels.append([
+            1 if expected.get('event') else 0,
+            1 if expected.get('start_time') else 0,
+            1 if expected.get('location') else 0,
+            1 if (expected.get('reminder_minutes') or 0) > 0 else 0,
+        ])
+    return texts, labels
+
+
+def run_variant(model_path: str, quantize: str, texts: List[str]) -> Dict[str, Any]:
+    """Load one variant and predict every text (runs in the worker process)"""
+    import torch
+
+    quantize = None if quantize == 'fp32' else quantize
+    cached = (Path(model_path) / QUANTIZED_FILE).exists()
+    rss_before = current_rss_mb()
+    t0 = time.perf_counter()
+    extractor = PhoBERTEventExtractor(model_path=model_path, device='cpu', cache_size=0, quantize=quantize)
+    load_s = time.perf_counter() - t0
+    if extractor.classifier is None:
+        raise SystemExit(f"No fine-tuned classifier (encoder/ + heads.safetensors, or model.pt) in {model_path}")
+    rss_loaded = current_rss_mb()
+
+    def predict(text: str) -> List[int]:
+        inputs = extractor.tokenizer(text, return_tensors='pt', truncation=True, max_length=256)
+        with torch.no_grad():
+            outputs = extractor.classifier(inputs['input_ids'], inputs['attention_mask'])
+        return [int(torch.argmax(outputs[head], dim=1).item()) for head in CLASSIFIER_HEADS]
+
+    predict(texts[0])  # warm up
+    predictions, latencies = [], []
+    for text in texts:
+        t = time.perf_counter()
+        predictions.append(predict(text))
+        latencies.append((time.perf_counter() - t) * 1000)
+
+    latencies.sort()
+    return {
+        'predictions': predictions,
+        'load_s': load_s,
+        'cache_hit': bool(quantize) and cached,
+        'rss_before_mb': rss_before,
+        'rss_loaded_mb': rss_loaded,
+        'rss_end_mb': current_rss_mb(),
+        'latency_ms': {
+            'mean': statistics.fmean(latencies),
+            'p50': latencies[len(latencies) // 2],
+            'p95': latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+        },
+    }
+
+
+def spawn_variant(args: argparse.Namespace, quantize: str) -> Dict[str, Any]:
+    """run_variant in a fresh process; its report is the last stdout line"""
+    cmd = [sys.executable, os.path.abspath(__file__), '--worker', quantize,
+           '--model-path', args.model_path, '--test-file', args.test_file, '--limit', str(args.limit)]
+    proc = subprocess.run(cmd, capture_output=True, text=True, encoding='utf-8')
+    if proc.returncode != 0:
+        raise SystemExit(f"❌ {quantize} worker failed:\n{proc.stdout}\n{proc.stderr}")
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def accuracy(predictions: List[List[int]], labels: List[List[int]]) -> Dict[str, float]:
+    """Accuracy per head and overall (all heads together)"""
+    out = {}
+    for k, head in enumerate(CLASSIFIER_HEADS):
+        out[head] = sum(p[k] == l[k] for p, l in zip(predictions, labels)) / len(labels)
+    out['overall'] = statistics.fmean(out[head] for head in CLASSIFIER_HEADS)
+    return out
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Evaluate INT8 dynamic quantization of the PhoBERT classifier")
+    parser.add_argument('--model-path', default='./models/phobert_finetuned')
+    parser.add_argument('--test-file', default='./tests/extended_test_cases.json')
+    parser.add_argument('--limit', type=int, default=0, help="Use the first N test cases (0 = all)")
+    parser.add_argument('--max-drop', type=float, default=1.0, help="Allowed overall accuracy drop, in points")
+    parser.add_argument('--worker', choices=('fp32', 'int8'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if not Path(args.test_file).is_file():
+        print(f"❌ Test file not found: {args.test_file} (pass the labelled test cases with --test-file)")
+        return 1
+    texts, labels = load_test_cases(args.test_file, args.limit)
+    if not texts:
+        print(f"❌ No test cases in {args.test_file}")
+        return 1
+
+    if args.worker:
+        print(json.dumps(run_variant(args.model_path, args.worker, texts)))
+        return 0
+
+    reports = {quantize: spawn_variant(args, quantize) for quantize in ('fp32', 'int8')}
+    acc = {quantize: accuracy(report['predictions'], labels) for quantize, report in reports.items()}
+    agreement = sum(a == b for a, b in zip(reports['fp32']['predictions'], reports['int8']['predictions'])) / len(texts)
+
+    print(f"📊 {len(texts)} test cases from {args.test_file}")
+    print(f"   {'accuracy':<10} {'fp32':>8} {'int8':>8} {'delta':>8}")
+    for head in CLASSIFIER_HEADS + ('overall',):
+        delta = (acc['int8'][head] - acc['fp32'][head]) * 100
+        print(f"   {head:<10} {acc['fp32'][head]:8.2%} {acc['int8'][head]:8.2%} {delta:+7.2f}pt")
+    print(f"   int8 predicts the same 4 heads as fp32 on {agreement:.2%} of sentences")
+
+    fp32, int8 = reports['fp32'], reports['int8']
+    print("⏱️  Forward pass per sentence (batch of 1):")
+    for stat in ('mean', 'p50', 'p95'):
+        a, b = fp32['latency_ms'][stat], int8['latency_ms'][stat]
+        print(f"   {stat:<5} fp32 {a:8.1f} ms   int8 {b:8.1f} ms  (x{a / b:.2f})")
+
+    print("💾 Memory:")
+    if fp32['rss_loaded_mb'] is not None and int8['rss_loaded_mb'] is not None:
+        print(f"   RSS after load  fp32 {fp32['rss_loaded_mb']:8.1f} MB   int8 {int8['rss_loaded_mb']:8.1f} MB"
+              f"  (-{fp32['rss_loaded_mb'] - int8['rss_loaded_mb']:.1f} MB)")
+        print(f"   RSS at the end  fp32 {fp32['rss_end_mb']:8.1f} MB   int8 {int8['rss_end_mb']:8.1f} MB")
+    print(f"   load time       fp32 {fp32['load_s']:8.2f} s    int8 {int8['load_s']:8.2f} s"
+          f"  ({'quantized cache' if int8['cache_hit'] else 'quantized now, cached for next start'})")
+    from core_nlp.phobert_trainer import ENCODER_DIR, HEADS_FILE
+
+    model_path = Path(args.model_path)
+    weights = [model_path / ENCODER_DIR / 'model.safetensors', model_path / HEADS_FILE]
+    if not all(f.exists() for f in weights):
+        weights = [model_path / 'model.pt']
+    quantized = model_path / QUANTIZED_FILE
+    if all(f.exists() for f in weights) and quantized.exists():
+        fp32_mb = sum(f.stat().st_size for f in weights) / 2**20
+        print(f"   on disk         fp32 {fp32_mb:8.1f} MB   "
+              f"int8 {quantized.stat().st_size / 2**20:8.1f} MB")
+
+    drop = (acc['fp32']['overall'] - acc['int8']['overall']) * 100
+    if drop > args.max_drop:
+        print(f"❌ int8 loses {drop:.2f} points of accuracy (allowed {args.max_drop})")
+        return 1
+    print(f"✅ int8 accuracy within {args.max_drop} points of fp32")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,49 @@
+"""
+Export the fine-tuned PhoBERT classifier to ONNX
+
+Usage:
+    python scripts/export_onnx.py                                  # ./models/phobert_finetuned/model.onnx
+    python scripts/export_onnx.py --model-path ./models/phobert_finetuned --output model.onnx --opset 17
+
+Converts PhoBERTEventClassifier (encoder + event/time/location/reminder heads)
+with dynamic batch and sequence axes, then, if onnxruntime is installed, checks
+that the graph predicts the same four heads as torch on the benchmark_nlp
+sample commands. Exits 1 if they differ.
+"""
+from __future__ import annotations
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core_nlp.onnx_backend import ONNX_AVAILABLE, OnnxPhoBERTBackend, export_onnx  # noqa: E402
+from core_nlp.phobert_model import PhoBERTEventExtractor  # noqa: E402
+from scripts.benchmark_nlp import SAMPLE_SENTENCES  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Export the fine-tuned PhoBERT classifier to ONNX")
+    parser.add_argument('--model-path', default='./models/phobert_finetuned')
+    parser.add_argument('--output', default=None, help="Target file (default: <model-path>/model.onnx)")
+    parser.add_argument('--opset', type=int, default=14)
+    args = parser.parse_args()
+
+    output = export_onnx(args.model_path, args.output, opset=args.opset)
+    if not ONNX_AVAILABLE:
+        print("⚠️ onnxruntime not installed, skipping the prediction check")
+        return 0
+
+    torch_extractor = PhoBERTEventExtractor(model_path=args.model_path, device='cpu', cache_size=0)
+    backend = OnnxPhoBERTBackend(args.model_path, onnx_file=str(output))
+    expected = torch_extractor._predict_heads(SAMPLE_SENTENCES)
+    actual = backend.predict(SAMPLE_SENTENCES)
+    if actual != expected:
+        print(f"❌ ONNX predictions differ from torch on {args.model_path}")
+        return 1
+    print(f"✅ ONNX predicts the same heads as torch on {len(SAMPLE_SENTENCES)} sample commands")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
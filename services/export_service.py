@@ -1,9 +1,17 @@
 from __future__ import annotations
+import csv
 import json
-from typing import Any
+import os
+from typing import Any, Dict, Optional, Sequence
 from ics import Calendar, Event
 from datetime import datetime
 
+# app_settings key holding the token of the last delta export
+EXPORT_WATERMARK_KEY = 'export_changes_token'
+
+# Default CSV columns (same names as the events table, so export -> import round-trips)
+CSV_COLUMNS = ('id', 'event_name', 'start_time', 'end_time', 'location', 'reminder_minutes', 'status')
+
 
 def export_to_json(db_manager, filepath: str = 'schedule_export.json') -> None:
     all_events = db_manager.get_all_events()
@@ -11,19 +19,116 @@ def export_to_json(db_manager, filepath: str = 'schedule_export.json') -> None:
         json.dump(all_events, f, ensure_ascii=False, indent=2)
 
 
+def _event_uid(event_id: Any) -> str:
+    """Stable iCalendar UID so calendar clients update instead of duplicating."""
+    return f"event-{event_id}@personal-schedule-assistant"
+
+
+def _to_ics_event(ev: Dict[str, Any]) -> Event:
+    e = Event()
+    e.name = ev.get('event_name')
+    st = ev.get('start_time')
+    if st:
+        try:
+            e.begin = datetime.fromisoformat(st)
+        except Exception:
+            pass
+    e.location = ev.get('location') or None
+    return e
+
+
+def export_to_csv(db_manager, filepath: str = 'schedule_export.csv',
+                  columns: Optional[Sequence[str]] = None,
+                  column_map: Optional[Dict[str, str]] = None,
+                  encoding: str = 'utf-8-sig', delimiter: str = ',') -> int:
+    """
+    Export events to CSV, streaming rows from the database cursor.
+
+    Args:
+        db_manager: DatabaseManager
+        filepath: Output file
+        columns: Event columns to export (default: CSV_COLUMNS)
+        column_map: Optional {column: header} to rename headers
+        encoding: 'utf-8-sig' (default) writes a BOM so Excel detects UTF-8
+        delimiter: Field separator (';' for Excel in comma-decimal locales)
+
+    Returns:
+        Number of rows written
+    """
+    columns = list(columns or CSV_COLUMNS)
+    column_map = column_map or {}
+    count = 0
+    with open(filepath, 'w', encoding=encoding, newline='') as f:
+        writer = csv.writer(f, delimiter=delimiter)
+        writer.writerow([column_map.get(c, c) for c in columns])
+        rows = db_manager.iter_events(columns)
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    return count
+
+
 def export_to_ics(db_manager, filepath: str = 'schedule_export.ics') -> None:
     all_events = db_manager.get_all_events()
     cal = Calendar()
     for ev in all_events:
-        e = Event()
-        e.name = ev.get('event_name')
-        st = ev.get('start_time')
-        if st:
-            try:
-                e.begin = datetime.fromisoformat(st)
-            except Exception:
-                pass
-        e.location = ev.get('location') or None
-        cal.events.add(e)
+        cal.events.add(_to_ics_event(ev))
     with open(filepath, 'w', encoding='utf-8') as f:
         f.write(cal.serialize())
+
+
+def export_changes(db_manager, filepath: str = 'schedule_changes.json',
+                   since_token: Optional[str] = None, fmt: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Export only events changed (and ids deleted) since the last sync.
+
+    Args:
+        db_manager: DatabaseManager
+        filepath: Output file
+        since_token: Change token to export from. None = use the watermark stored
+            by the previous export_changes call; '' = full export
+        fmt: 'json', 'ndjson' or 'ics' (default: inferred from the file extension)
+
+    Returns:
+        Dict with 'token' (new watermark), 'events' and 'deleted' counts
+    """
+    if fmt is None:
+        ext = os.path.splitext(filepath)[1].lower()
+        fmt = {'.ndjson': 'ndjson', '.jsonl': 'ndjson', '.ics': 'ics'}.get(ext, 'json')
+    if fmt not in ('json', 'ndjson', 'ics'):
+        raise ValueError(f"Định dạng không hỗ trợ: {fmt}")
+
+    if since_token is None:
+        since_token = db_manager.get_setting(EXPORT_WATERMARK_KEY, '')
+    changes = db_manager.get_changes_since(since_token)
+
+    if fmt == 'json':
+        with open(filepath, 'w', encoding='utf-8') as f:
+            json.dump(changes, f, ensure_ascii=False, indent=2)
+    elif fmt == 'ndjson':
+        # One change per line: consumers can stream-apply without loading the file
+        with open(filepath, 'w', encoding='utf-8') as f:
+            for d in changes['deleted']:
+                f.write(json.dumps({'op': 'delete', **d}, ensure_ascii=False) + '\n')
+            for ev in changes['events']:
+                f.write(json.dumps({'op': 'upsert', 'event': ev}, ensure_ascii=False) + '\n')
+            f.write(json.dumps({'op': 'watermark', 'token': changes['token']}) + '\n')
+    else:
+        cal = Calendar()
+        for ev in changes['events']:
+            e = _to_ics_event(ev)
+            e.uid = _event_uid(ev.get('id'))
+            cal.events.add(e)
+        for d in changes['deleted']:
+            # Deletes travel as cancelled events with the same UID
+            cal.events.add(Event(uid=_event_uid(d['id']), status='CANCELLED'))
+        with open(filepath, 'w', encoding='utf-8') as f:
+            f.write(cal.serialize())
+
+    # Only advance the watermark once the file has been written
+    db_manager.set_setting(EXPORT_WATERMARK_KEY, changes['token'])
+    return {
+        'token': changes['token'],
+        'events': len(changes['events']),
+        'deleted': len(changes['deleted']),
+    }
@@ -1,6 +1,7 @@
 from __future__ import annotations
+import csv
 import json
-from typing import Iterable
+from typing import Any, Dict, Iterable, Iterator, Optional
 from datetime import datetime
 from ics import Calendar
 
@@ -104,3 +105,72 @@ def import_from_ics(db_manager, filepath: str) -> int:
             db_manager.add_event(to_insert)
             count += 1
     return count
+
+
+# Event fields understood by import_from_csv (headers written by export_to_csv)
+CSV_FIELDS = ('event_name', 'start_time', 'end_time', 'location', 'reminder_minutes', 'status')
+
+# Values of events.status (notification lifecycle); anything else imports as 'pending'
+EVENT_STATUSES = ('pending', 'reminded', 'notified')
+
+
+def _iter_csv_events(filepath: str, column_map: Dict[str, str], encoding: str,
+                     delimiter: str) -> Iterator[Dict[str, Any]]:
+    """Yield valid event dicts from a CSV file, one row at a time."""
+    with open(filepath, 'r', encoding=encoding, newline='') as f:
+        reader = csv.reader(f, delimiter=delimiter)
+        header = next(reader, None)
+        if header is None:
+            return
+        # Resolve header -> field once, then index rows positionally
+        index = {}
+        for i, name in enumerate(header):
+            field = column_map.get(name.strip(), name.strip())
+            if field in CSV_FIELDS and field not in index:
+                index[field] = i
+        if 'event_name' not in index or 'start_time' not in index:
+            raise ValueError("CSV không hợp lệ: cần cột event_name và start_time")
+
+        name_i, start_i = index['event_name'], index['start_time']
+        end_i = index.get('end_time')
+        loc_i = index.get('location')
+        rem_i = index.get('reminder_minutes')
+        status_i = index.get('status')
+        width = max(index.values()) + 1
+        for row in reader:
+            if len(row) < width:
+                row = row + [''] * (width - len(row))
+            name = row[name_i].strip()
+            start = row[start_i].strip()
+            if not name or not start:
+                continue
+            reminder = row[rem_i].strip() if rem_i is not None else ''
+            status = row[status_i].strip().lower() if status_i is not None else ''
+            yield {
+                'event_name': name,
+                'start_time': start,
+                'end_time': (row[end_i].strip() or None) if end_i is not None else None,
+                'location': (row[loc_i].strip() or None) if loc_i is not None else None,
+                'reminder_minutes': int(reminder) if reminder.isdigit() else 0,
+                'status': status if status in EVENT_STATUSES else 'pending',
+            }
+
+
+def import_from_csv(db_manager, filepath: str, column_map: Optional[Dict[str, str]] = None,
+                    encoding: str = 'utf-8-sig', delimiter: str = ',',
+                    skip_duplicates: bool = True) -> int:
+    """Import events from a CSV file through the bulk insert path.
+
+    Rows are streamed from the file into DatabaseManager.add_events_bulk (one
+    transaction), so large files never sit in memory.
+
+    Args:
+        column_map: Optional {csv header: event field}, e.g. {"Tên": "event_name"}
+        encoding: 'utf-8-sig' reads both plain UTF-8 and Excel's UTF-8 with BOM
+        delimiter: Field separator
+        skip_duplicates: Skip rows whose start time is already taken (as add_event)
+
+    Returns number of events imported.
+    """
+    events = _iter_csv_events(filepath, column_map or {}, encoding, delimiter)
+    return db_manager.add_events_bulk(events, skip_duplicates=skip_duplicates)
@@ -0,0 +1,206 @@
+"""
+Snapshot Service - columnar binary snapshot of the events table
+Stores events as NumPy arrays in an uncompressed .npz so analytics can load
+them with memory mapping instead of going through get_all_events() dicts.
+
+Layout (one array per column, row i = one event):
+    id            int64
+    start, end    int64   wall-clock seconds since 1970-01-01 (timezone offset
+                          dropped, like StatisticsService), NAT = missing
+    reminder      int32   reminder_minutes
+    name          int32   index into names      (interned string table)
+    location      int32   index into locations  (-1 = no location)
+    status        int8    index into statuses
+"""
+from __future__ import annotations
+import zipfile
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+SNAPSHOT_VERSION = 1
+NAT = -(2 ** 63)  # Missing/unparsable datetime (int64 min)
+_EPOCH = datetime(1970, 1, 1)
+_COLUMNS = ('id', 'start_time', 'end_time', 'event_name', 'location', 'reminder_minutes', 'status')
+
+
+def _require_numpy() -> None:
+    if not NUMPY_AVAILABLE:
+        raise ImportError("numpy is required for snapshots. Install: pip install numpy")
+
+
+def _to_epoch(iso: Optional[str]) -> int:
+    """ISO 8601 string -> wall-clock epoch seconds (NAT if missing/invalid)."""
+    if not iso:
+        return NAT
+    try:
+        dt = datetime.fromisoformat(iso[:19])
+    except ValueError:
+        return NAT
+    return (dt - _EPOCH) // timedelta(seconds=1)
+
+
+def _from_epoch(seconds: int) -> Optional[str]:
+    if seconds == NAT:
+        return None
+    return (_EPOCH + timedelta(seconds=int(seconds))).isoformat()
+
+
+class _Interner:
+    """Map strings to dense int codes (first-seen order)."""
+
+    def __init__(self):
+        self.codes: Dict[str, int] = {}
+
+    def __call__(self, value: str) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.codes)
+        return code
+
+    def table(self) -> 'np.ndarray':
+        return np.array(list(self.codes), dtype=str)
+
+
+def export_snapshot(db_manager, filepath: str = 'events_snapshot.npz') -> int:
+    """
+    Export the events table to a columnar .npz snapshot.
+
+    Args:
+        db_manager: DatabaseManager
+        filepath: Output file (stored uncompressed so it can be memory-mapped)
+
+    Returns:
+        Number of events written
+    """
+    _require_numpy()
+    ids, starts, ends, reminders, name_codes, loc_codes, status_codes = [], [], [], [], [], [], []
+    names, locations, statuses = _Interner(), _Interner(), _Interner()
+
+    for ev_id, start, end, name, location, reminder, status in db_manager.iter_events(_COLUMNS):
+        ids.append(ev_id)
+        starts.append(_to_epoch(start))
+        ends.append(_to_epoch(end))
+        reminders.append(reminder or 0)
+        name_codes.append(names(name or ''))
+        loc_codes.append(locations(location) if location else -1)
+        status_codes.append(statuses(status or 'pending'))
+
+    with open(filepath, 'wb') as f:  # file object: savez must not append '.npz'
+        np.savez(
+            f,
+            version=np.array([SNAPSHOT_VERSION], dtype=np.int32),
+            id=np.array(ids, dtype=np.int64),
+            start=np.array(starts, dtype=np.int64),
+            end=np.array(ends, dtype=np.int64),
+            reminder=np.array(reminders, dtype=np.int32),
+            name=np.array(name_codes, dtype=np.int32),
+            location=np.array(loc_codes, dtype=np.int32),
+            status=np.array(status_codes, dtype=np.int8),
+            names=names.table(),
+            locations=locations.table(),
+            statuses=statuses.table(),
+        )
+    return len(ids)
+
+
+def _mmap_npz(filepath: str) -> Dict[str, 'np.ndarray']:
+    """Memory-map every array of an uncompressed .npz (np.load ignores mmap_mode for .npz)."""
+    arrays = {}
+    with open(filepath, 'rb') as f, zipfile.ZipFile(f) as zf:
+        for info in zf.infolist():
+            name = info.filename[:-4] if info.filename.endswith('.npy') else info.filename
+            if info.compress_type != zipfile.ZIP_STORED:
+                arrays[name] = np.lib.format.read_array(zf.open(info))
+                continue
+            # Skip the local file header to reach the raw .npy bytes
+            f.seek(info.header_offset)
+            header = f.read(30)
+            name_len = int.from_bytes(header[26:28], 'little')
+            extra_len = int.from_bytes(header[28:30], 'little')
+            f.seek(info.header_offset + 30 + name_len + extra_len)
+            version = np.lib.format.read_magic(f)
+            if version == (1, 0):
+                shape, fortran, dtype = np.lib.format.read_array_header_1_0(f)
+            else:
+                shape, fortran, dtype = np.lib.format.read_array_header_2_0(f)
+            if int(np.prod(shape)) == 0:
+                arrays[name] = np.empty(shape, dtype=dtype)
+                continue
+            arrays[name] = np.memmap(filepath, dtype=dtype, mode='r', offset=f.tell(),
+                                     shape=shape, order='F' if fortran else 'C')
+    return arrays
+
+
+class EventSnapshot:
+    """Columnar view of the events table loaded from a snapshot file."""
+
+    def __init__(self, arrays: Dict[str, 'np.ndarray']):
+        version = int(arrays['version'][0])
+        if version != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported snapshot version: {version}")
+        self.id = arrays['id']
+        self.start = arrays['start']
+        self.end = arrays['end']
+        self.reminder = arrays['reminder']
+        self.name = arrays['name']
+        self.location = arrays['location']
+        self.status = arrays['status']
+        self.names = arrays['names']
+        self.locations = arrays['locations']
+        self.statuses = arrays['statuses']
+
+    def __len__(self) -> int:
+        return len(self.id)
+
+    def iter_events(self) -> Iterator[Dict[str, Any]]:
+        """Yield events as dicts (same keys as DatabaseManager rows)."""
+        names = self.names.tolist()
+        locations = self.locations.tolist()
+        statuses = self.statuses.tolist()
+        for i in range(len(self.id)):
+            loc = int(self.location[i])
+            yield {
+                'id': int(self.id[i]),
+                'event_name': names[self.name[i]],
+                'start_time': _from_epoch(self.start[i]),
+                'end_time': _from_epoch(self.end[i]),
+                'location': locations[loc] if loc >= 0 else None,
+                'reminder_minutes': int(self.reminder[i]),
+                'status': statuses[self.status[i]],
+            }
+
+    def get_all_events(self) -> List[Dict[str, Any]]:
+        """Compatibility with DatabaseManager.get_all_events()."""
+        return list(self.iter_events())
+
+
+def load_snapshot(filepath: str, mmap: bool = True) -> EventSnapshot:
+    """
+    Load a snapshot written by export_snapshot().
+
+    Args:
+        filepath: Snapshot file
+        mmap: Memory-map the arrays (load is O(1); pages are read on first use)
+    """
+    _require_numpy()
+    if mmap:
+        return EventSnapshot(_mmap_npz(filepath))
+    with np.load(filepath) as data:
+        return EventSnapshot({k: data[k] for k in data.files})
+
+
+def import_snapshot(db_manager, filepath: str, skip_duplicates: bool = True) -> int:
+    """Import events from a snapshot through the bulk insert path. Returns count inserted.
+
+    Times are restored at second resolution without timezone offsets.
+    """
+    snapshot = load_snapshot(filepath)
+    events = (ev for ev in snapshot.iter_events() if ev['event_name'] and ev['start_time'])
+    return db_manager.add_events_bulk(events, skip_duplicates=skip_duplicates)
+
@@ -35,12 +35,22 @@ try:
 except ImportError:
     REPORTLAB_AVAILABLE = False
 
+from services.snapshot_service import EventSnapshot, NAT, NUMPY_AVAILABLE
+if NUMPY_AVAILABLE:
+    import numpy as np
+
 
 class StatisticsService:
     """Service for calculating statistics and generating visualizations"""
     
     def __init__(self, db_manager):
+        """
+        Args:
+            db_manager: DatabaseManager, or an EventSnapshot (services.snapshot_service)
+                to compute the statistics with vectorized NumPy code
+        """
         self.db_manager = db_manager
+        self._snapshot = db_manager if isinstance(db_manager, EventSnapshot) else None
         
         # Vietnamese weekday names
         self.weekday_names = ['CN', 'T2', 'T3', 'T4', 'T5', 'T6', 'T7']
@@ -69,6 +79,8 @@ class StatisticsService:
     
     def get_overview_stats(self) -> Dict[str, Any]:
         """Get overview statistics"""
+        if self._snapshot is not None:
+            return self._snapshot_overview_stats()
         all_events = self.db_manager.get_all_events()
         total = len(all_events)
         
@@ -115,6 +127,8 @@ class StatisticsService:
     
     def get_time_stats(self) -> Dict[str, Any]:
         """Get time-based statistics"""
+        if self._snapshot is not None:
+            return self._snapshot_time_stats()
         all_events = self.db_manager.get_all_events()
         
         # By weekday (0=Monday, 6=Sunday)
@@ -148,6 +162,8 @@ class StatisticsService:
     
     def get_location_stats(self) -> Dict[str, Any]:
         """Get location statistics"""
+        if self._snapshot is not None:
+            return self._snapshot_location_stats()
         all_events = self.db_manager.get_all_events()
         
         location_counts = {}
@@ -168,23 +184,20 @@ class StatisticsService:
     
     def get_event_type_stats(self) -> Dict[str, Any]:
         """Classify and count events by type"""
-        all_events = self.db_manager.get_all_events()
-        
         type_counts = {k: 0 for k in self.event_types.keys()}
         type_counts['Khác'] = 0
         
-        for event in all_events:
-            event_name = (event.get('event_name') or '').lower()
-            classified = False
-            
-            for type_name, keywords in self.event_types.items():
-                if any(kw in event_name for kw in keywords):
-                    type_counts[type_name] += 1
-                    classified = True
-                    break
-            
-            if not classified:
-                type_counts['Khác'] += 1
+        if self._snapshot is not None:
+            # Classify each distinct name once, then weight by how often it occurs
+            snap = self._snapshot
+            name_counts = np.bincount(snap.name, minlength=len(snap.names))
+            for name, n in zip(snap.names.tolist(), name_counts.tolist()):
+                if n:
+                    type_counts[self._classify_event_type(name.lower())] += n
+        else:
+            for event in self.db_manager.get_all_events():
+                event_name = (event.get('event_name') or '').lower()
+                type_counts[self._classify_event_type(event_name)] += 1
         
         # Calculate percentages
         total = sum(type_counts.values())
@@ -199,12 +212,22 @@ class StatisticsService:
     
     def get_trend_stats(self) -> Dict[str, Any]:
         """Get trend analysis for last 30 days"""
-        all_events = self.db_manager.get_all_events()
         now = datetime.now()
         
         # Group by week for last 4 weeks
         weekly_counts = [0] * 4
         
+        if self._snapshot is not None:
+            start = self._valid_starts()
+            days_ago = np.floor_divide(self._epoch(now) - start, 86400)
+            weekly_counts = np.bincount(
+                (days_ago[(days_ago >= 0) & (days_ago < 28)] // 7).astype(np.int64),
+                minlength=4
+            ).tolist()
+            all_events = []
+        else:
+            all_events = self.db_manager.get_all_events()
+        
         for event in all_events:
             if event.get('start_time'):
                 try:
@@ -233,6 +256,13 @@ class StatisticsService:
             'growth_rate': growth_rate,
         }
     
+    def _classify_event_type(self, event_name: str) -> str:
+        """Return the first event type whose keywords occur in the (lowercased) name"""
+        for type_name, keywords in self.event_types.items():
+            if any(kw in event_name for kw in keywords):
+                return type_name
+        return 'Khác'
+    
     def _calculate_streak(self, events: List[Dict]) -> Dict[str, int]:
         """Calculate current and longest streak of days with events"""
         if not events:
@@ -248,6 +278,10 @@ class StatisticsService:
                 except:
                     pass
         
+        return self._streak_from_dates(dates)
+    
+    def _streak_from_dates(self, dates: set) -> Dict[str, int]:
+        """Current and longest run of consecutive dates"""
         if not dates:
             return {'current': 0, 'longest': 0}
         
@@ -279,6 +313,87 @@ class StatisticsService:
         
         return {'current': current_streak, 'longest': longest_streak}
     
+    # ==================== SNAPSHOT (NumPy) STATISTICS ====================
+    # Same results as the dict-based code above, computed on EventSnapshot columns.
+    # Epochs are wall-clock seconds, so day/hour math needs no timezone handling.
+    
+    @staticmethod
+    def _epoch(dt: datetime) -> float:
+        """datetime -> wall-clock epoch seconds (float keeps sub-second precision)"""
+        return (dt - datetime(1970, 1, 1)).total_seconds()
+    
+    def _valid_starts(self) -> 'np.ndarray':
+        start = np.asarray(self._snapshot.start)
+        return start[start != NAT]
+    
+    def _snapshot_overview_stats(self) -> Dict[str, Any]:
+        snap = self._snapshot
+        total = len(snap)
+        start = self._valid_starts()
+        
+        now = datetime.now()
+        week_start = now - timedelta(days=now.weekday())  # Monday
+        month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        thirty_days_ago = now - timedelta(days=30)
+        
+        with_reminder = int(np.count_nonzero(np.asarray(snap.reminder) > 0))
+        with_location = int(np.count_nonzero(np.asarray(snap.location) >= 0))
+        recent = int(np.count_nonzero(start >= self._epoch(thirty_days_ago)))
+        
+        days = np.unique(start // 86400)
+        epoch_day = datetime(1970, 1, 1).date()
+        streak = self._streak_from_dates({epoch_day + timedelta(days=int(d)) for d in days})
+        
+        return {
+            'total_events': total,
+            'week_events': int(np.count_nonzero(start >= self._epoch(week_start))),
+            'month_events': int(np.count_nonzero(start >= self._epoch(month_start))),
+            'with_reminder': with_reminder,
+            'with_location': with_location,
+            'reminder_percentage': (with_reminder / total * 100) if total > 0 else 0,
+            'location_percentage': (with_location / total * 100) if total > 0 else 0,
+            'current_streak': streak['current'],
+            'longest_streak': streak['longest'],
+            'avg_events_per_day': recent / 30.0 if recent else 0,
+        }
+    
+    def _snapshot_time_stats(self) -> Dict[str, Any]:
+        start = self._valid_starts()
+        # 1970-01-01 was a Thursday (weekday() == 3)
+        weekday_counts = np.bincount((start // 86400 + 3) % 7, minlength=7).tolist()
+        hour_counts = np.bincount((start % 86400) // 3600, minlength=24).tolist()
+        
+        peak_hour = hour_counts.index(max(hour_counts)) if max(hour_counts) > 0 else None
+        peak_day = weekday_counts.index(max(weekday_counts)) if max(weekday_counts) > 0 else None
+        
+        return {
+            'by_weekday': weekday_counts,
+            'by_hour': hour_counts,
+            'peak_hour': peak_hour,
+            'peak_day': peak_day,
+            'peak_hour_count': max(hour_counts),
+            'peak_day_count': max(weekday_counts),
+        }
+    
+    def _snapshot_location_stats(self) -> Dict[str, Any]:
+        snap = self._snapshot
+        location = np.asarray(snap.location)
+        code_counts = np.bincount(location[location >= 0], minlength=len(snap.locations))
+        
+        # Distinct raw strings may collapse to one location after strip()
+        location_counts = {}
+        for loc, n in zip(snap.locations.tolist(), code_counts.tolist()):
+            loc = loc.strip()
+            if n and loc:
+                location_counts[loc] = location_counts.get(loc, 0) + n
+        
+        sorted_locations = sorted(location_counts.items(), key=lambda x: x[1], reverse=True)
+        return {
+            'top_locations': sorted_locations[:10],  # Top 10
+            'total_unique_locations': len(location_counts),
+            'total_with_location': sum(location_counts.values()),
+        }
+    
     # ==================== CHART GENERATION ====================
     
     def create_weekday_chart(self, stats: Dict) -> Optional[Any]: